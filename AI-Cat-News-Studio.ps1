@@ -6,6 +6,7 @@
 #   .\AI-Cat-News-Studio.ps1 3        # Browse content
 #   .\AI-Cat-News-Studio.ps1 -clean   # Clean old content
 #   .\AI-Cat-News-Studio.ps1 4 -clean # Generate video then clean
+#   .\AI-Cat-News-Studio.ps1 -worker  # Start the warm worker (later runs skip startup costs)
 
 param(
     [Parameter(Position=0)]
@@ -14,6 +15,12 @@ param(
     [Parameter()]
     [switch]$Clean = $false,
     
+    [Parameter()]
+    [switch]$Worker = $false,
+    
+    [Parameter()]
+    [switch]$StopWorker = $false,
+    
     [Parameter()]
     [switch]$Help = $false
 )
@@ -30,9 +37,12 @@ if ($Help) {
     Write-Host "  2     🎤 Generate Voice-Over (From Latest Script)" -ForegroundColor White
     Write-Host "  3     📁 Browse Content Structure (View All Content)" -ForegroundColor Blue
     Write-Host "  4     🎥 Generate Video with MiniMax Hailuo (Working!)" -ForegroundColor Green
+    Write-Host "  5     🚀 Run Full Episode Pipeline (Script + Voice + Segments, overlapped)" -ForegroundColor Magenta
     Write-Host ""
     Write-Host "Flags:" -ForegroundColor Cyan
     Write-Host "  -clean    🧹 Clean old content files after operation" -ForegroundColor Yellow
+    Write-Host "  -worker   ⚡ Start the warm worker in the background (options then run in milliseconds)" -ForegroundColor Yellow
+    Write-Host "  -stopworker  Stop the warm worker" -ForegroundColor Yellow
     Write-Host "  -help     ❓ Show this help message" -ForegroundColor Magenta
     Write-Host ""
     Write-Host "Examples:" -ForegroundColor Cyan
@@ -138,6 +148,31 @@ if (Test-Path ".venv") {
 
 Write-Host ""
 
+# Start or stop the warm worker (keeps clients, caches and imports loaded between runs)
+if ($StopWorker) {
+    & $pythonCmd -m utils.worker stop
+    Write-Host "🛑 Warm worker stopped" -ForegroundColor Yellow
+    exit 0
+}
+if ($Worker) {
+    & $pythonCmd -m utils.worker ping 2>$null | Out-Null
+    if ($LASTEXITCODE -ne 0) {
+        Start-Process $pythonCmd -ArgumentList "-m", "utils.worker", "serve" -WindowStyle Hidden
+        Write-Host "⚡ Warm worker starting in the background" -ForegroundColor Green
+    } else {
+        Write-Host "⚡ Warm worker already running" -ForegroundColor Green
+    }
+    if ($Option -eq $null -or $Option -eq "") {
+        exit 0
+    }
+}
+
+# Runs a studio script on the warm worker when one is running, otherwise in a fresh Python
+function Invoke-StudioScript {
+    param([string]$Script)
+    & $pythonCmd -m utils.worker run $Script
+}
+
 # Handle clean-only operation
 if ($Clean -and $Option -eq "") {
     Invoke-ContentClean
@@ -152,33 +187,38 @@ if ($Option -eq $null -or $Option -eq "") {
     Write-Host "2. 🎤 Generate Voice-Over (From Latest Script)" -ForegroundColor White
     Write-Host "3. 📁 Browse Content Structure (View All Content)" -ForegroundColor Blue
     Write-Host "4. 🎥 Generate Video with MiniMax Hailuo (Working!)" -ForegroundColor Green
+    Write-Host "5. 🚀 Run Full Episode Pipeline (Script + Voice + Segments, overlapped)" -ForegroundColor Magenta
     Write-Host ""
     Write-Host "💡 Tip: Use parameters for automation! Example: .\AI-Cat-News-Studio.ps1 4" -ForegroundColor Yellow
     Write-Host ""
 
-    $Option = Read-Host "Enter your choice (1-4)"
+    $Option = Read-Host "Enter your choice (1-5)"
 }
 
 # Execute the chosen option
 switch ($Option) {
     "1" {
         Write-Host "📰 Generating Cat News Script..." -ForegroundColor Yellow
-        & $pythonCmd scripts\quick_cat_test.py
+        Invoke-StudioScript quick_cat_test
     }
     "2" {
         Write-Host "🎤 Generating Voice-Over..." -ForegroundColor Yellow
-        & $pythonCmd scripts\test_voice.py
+        Invoke-StudioScript test_voice
     }
     "3" {
         Write-Host "📁 Browsing Content Structure..." -ForegroundColor Blue
-        & $pythonCmd scripts\content_browser.py
+        Invoke-StudioScript content_browser
     }
     "4" {
         Write-Host "🎥 Generating Video with MiniMax Hailuo..." -ForegroundColor Green
-        & $pythonCmd scripts\create_hailuo_video.py
+        Invoke-StudioScript create_hailuo_video
+    }
+    "5" {
+        Write-Host "🚀 Running Full Episode Pipeline..." -ForegroundColor Magenta
+        Invoke-StudioScript run_episode_pipeline
     }
     default {
-        Write-Host "❌ Invalid choice '$Option'. Valid options: 1, 2, 3, 4" -ForegroundColor Red
+        Write-Host "❌ Invalid choice '$Option'. Valid options: 1, 2, 3, 4, 5" -ForegroundColor Red
         Write-Host "💡 Use -help for usage information" -ForegroundColor Yellow
         exit 1
     }
@@ -1,7 +1,8 @@
-from crewai import Agent
+# CrewAI is imported inside each factory: it is heavy and most scripts never run a crew
 
 def create_content_strategist():
     """Content strategist agent for generating content ideas."""
+    from crewai import Agent
     return Agent(
         role='Content Strategist',
         goal='Generate engaging content ideas for YouTube Shorts and Instagram Reels',
@@ -14,6 +15,7 @@ def create_content_strategist():
 
 def create_script_writer():
     """Script writer agent for writing video scripts."""
+    from crewai import Agent
     return Agent(
         role='Script Writer',
         goal='Write compelling scripts for short-form video content',
@@ -26,6 +28,7 @@ def create_script_writer():
 
 def create_visual_creator():
     """Visual creator agent for creating videos."""
+    from crewai import Agent
     return Agent(
         role='Visual Creator',
         goal='Create engaging visuals and videos from scripts',
@@ -38,6 +41,7 @@ def create_visual_creator():
 
 def create_social_media_manager():
     """Social media manager agent for uploading content."""
+    from crewai import Agent
     return Agent(
         role='Social Media Manager',
         goal='Optimize and publish content across social media platforms',
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+catnews - AI Cat News Network command line
+
+    python catnews.py ingest  [--feed NAME]... [--url URL]...
+    python catnews.py script  [--topic T] [--short] [--from-feeds]
+    python catnews.py dedup   [--backfill] [--check TEXT]
+    python catnews.py rank    [--top K]
+    python catnews.py voice   [--script PATH] [--target SECONDS]
+    python catnews.py render  [--provider hailuo|veo3]
+    python catnews.py thumbs  [SCRIPTS...] [--latest N] [--variant vertical|landscape]... [--workers N]
+    python catnews.py upload  queue [--latest N] [--package PATH]... | run | status | retry  [--platform P]...
+    python catnews.py browse
+    python catnews.py batch   [TOPICS...] [--from-feeds [--top K]] [--run-id ID] [--workers N] [--mode crew|direct] [--pipeline]
+    python catnews.py gc      [--keep N] [--dry-run]
+    python catnews.py bench   workflow-modes|crew-overhead|uploads|pipeline [ARGS...]
+    python catnews.py worker  serve|ping|stop
+    python catnews.py trace   report [--last N] [--name PREFIX] [--path FILE]
+    python catnews.py cassette record|replay|info CASSETTE [ARGS...]
+    python catnews.py profile summarize [--session S] [--stage PREFIX] [--top N] [--output PREFIX]
+    python catnews.py costs   report [--days N]
+
+Any subcommand takes --profile STAGES first (e.g. `catnews --profile content,video.poll batch ...`)
+to profile those stages into content/cache/profiles.
+
+Each subcommand imports only what it needs, so quick commands like browse
+don't pay for provider SDKs or CrewAI.
+"""
+import os
+import sys
+import argparse
+from typing import List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+def _load_env():
+    """Load .env for subcommands that talk to providers"""
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+def _trace_run():
+    """Batch, pipeline and benchmark runs record spans unless CATNEWS_TRACE says otherwise"""
+    os.environ.setdefault("CATNEWS_TRACE", "1")
+
+def cmd_script(args) -> int:
+    _load_env()
+    if args.short:
+        from scripts.create_short_script import create_short_script
+        create_short_script(args.topic)
+    else:
+        from scripts.quick_cat_test import create_cat_news_script
+        if create_cat_news_script(args.topic, from_feeds=args.from_feeds) is None:
+            return 1
+    return 0
+
+def cmd_ingest(args) -> int:
+    from config.settings import get_setting
+    from tools.news_ingestion import NewsIngestor
+
+    # --url alone fetches just those URLs; feed state is keyed by the URL itself
+    feeds = [] if args.url and not args.feed else get_setting('NEWS_FEEDS', [])
+    feeds = [feed for feed in feeds if not args.feed or feed["name"] in args.feed]
+    feeds += [{"name": url, "url": url} for url in args.url or []]
+    if not feeds:
+        print("❌ No matching feeds configured")
+        return 1
+
+    report = NewsIngestor(feeds).ingest()
+    icons = {"ok": "✅", "not_modified": "💤", "error": "❌"}
+    for name, result in sorted(report["feeds"].items()):
+        detail = result["error"] if result["status"] == "error" else \
+            f"{result['new']} new, {result['merged']} merged of {result['items']} items"
+        if result["status"] == "not_modified":
+            detail = "not modified"
+        print(f"   {icons[result['status']]} {name}: {detail}")
+    print(f"📰 Saved {len(report['saved'])} new news items, merged {len(report['merged'])} near-duplicates")
+    return 1 if all(result["status"] == "error" for result in report["feeds"].values()) else 0
+
+def cmd_dedup(args) -> int:
+    from utils.content_manager import content_manager
+    from utils.dedup_index import get_dedup_index
+
+    index = get_dedup_index()
+    if args.backfill:
+        added = index.backfill(content_manager)
+        print(f"📥 Indexed {added['news']} news items and {added['script']} scripts")
+    if args.check:
+        duplicate = index.find_duplicate(args.check)
+        if duplicate:
+            print(f"🔁 Duplicate of {duplicate['kind']} {duplicate['ref']} ({duplicate['similarity']:.0%}): {duplicate['text']}")
+        else:
+            print("🆕 No near-duplicate indexed")
+    stats = index.stats()
+    print(f"🗂️  Dedup index: {stats.get('news', 0)} news items, {stats.get('script', 0)} scripts")
+    return 0
+
+def cmd_rank(args) -> int:
+    from utils.content_manager import content_manager
+    from tools.news_ranker import rank_pending_news
+
+    ranked = rank_pending_news(content_manager, args.top)
+    if not ranked:
+        print("📭 No pending ingested news (run: python catnews.py ingest)")
+        return 1
+    print(f"{'Score':>6} {'Fit':>5} {'Novel':>5} {'Fresh':>5}  Topic")
+    for item in ranked:
+        ranking = item["ranking"]
+        print(f"{ranking['score']:>6.2f} {ranking['category_fit']:>5.2f} {ranking['novelty']:>5.2f} "
+              f"{ranking['recency']:>5.2f}  {item['topic']}  [{ranking['category']}]")
+    return 0
+
+def cmd_voice(args) -> int:
+    _load_env()
+    from scripts.test_voice import generate_voice_over
+    return 0 if generate_voice_over(args.script, args.target) else 1
+
+def cmd_render(args) -> int:
+    _load_env()
+    if args.provider == "veo3":
+        from scripts.create_veo3_video import create_veo3_cat_news
+        return 0 if create_veo3_cat_news() else 1
+    from scripts.create_hailuo_video import generate_hunyuan_video
+    return 0 if generate_hunyuan_video() else 1
+
+def cmd_thumbs(args) -> int:
+    from utils.content_manager import content_manager
+    from tools.thumbnail_renderer import thumbnail_renderer
+
+    scripts = args.scripts or [f["filepath"] for f in content_manager.get_latest_files("scripts", limit=args.latest)]
+    if not scripts:
+        print("❌ No scripts found")
+        return 1
+    if len(scripts) == 1:
+        paths = thumbnail_renderer.render_for_script(scripts[0], args.variant)
+    else:
+        paths = thumbnail_renderer.render_batch(scripts, args.variant, args.workers)
+    for path in paths:
+        print(f"   🖼️  {path}")
+    print(f"✅ {len(paths)} thumbnails for {len(scripts)} scripts")
+    return 0
+
+def cmd_upload(args) -> int:
+    from config.settings import get_setting
+    from utils.upload_queue import UploadQueue
+
+    settings = get_setting('UPLOADS', {})
+    queue = UploadQueue(settings.get('db_path', 'content/cache/upload_queue.sqlite'))
+    if args.action == "queue":
+        import json
+        from utils.content_manager import content_manager
+        from tools.uploader import enqueue_packages
+        if args.package:
+            packages = []
+            for path in args.package:
+                with open(path, 'r', encoding='utf-8') as f:
+                    packages.append(json.load(f))
+        else:
+            packages = content_manager.get_content_packages(limit=args.latest, with_video=True)
+        if not packages:
+            print("❌ No packaged videos found (direct-mode batches and --package files with a local video)")
+            return 1
+        ids = enqueue_packages(packages, args.platform, queue)
+        print(f"📥 {len(packages)} packages queued ({len(ids)} uploads)")
+    elif args.action == "run":
+        from tools.uploader import ResumableUploader
+        uploader = ResumableUploader(queue, settings)
+
+        def progress(upload, offset):
+            if offset >= upload["size"]:
+                print(f"   ✅ {upload['platform']}: {upload['package_id']}")
+
+        try:
+            report = uploader.run(args.platform, args.workers, progress)
+        except KeyboardInterrupt:
+            # In-flight chunks finished; everything else stays queued and resumes next run
+            print("\n⏸️  Uploads stopped; run again to resume")
+            return 1
+        results = list(report["results"].values())
+        print(f"📤 {results.count('complete')} complete, {results.count('failed')} failed")
+        for platform, count in report["deferred"].items():
+            print(f"   ⏳ {platform}: {count} waiting for daily quota")
+    elif args.action == "retry":
+        print(f"🔁 {queue.retry_failed(args.platform)} failed uploads requeued")
+    for platform, counts in queue.summary().items():
+        print(f"   {platform}: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    for upload in queue.uploads(status="failed"):
+        print(f"   ❌ #{upload['id']} {upload['platform']} {upload['package_id']}: {upload['error']}")
+    queue.close()
+    return 0
+
+def cmd_browse(args) -> int:
+    from scripts.content_browser import browse
+    browse()
+    return 0
+
+def cmd_batch(args) -> int:
+    _load_env()
+    _trace_run()
+    news_items = {}
+    if args.from_feeds:
+        from utils.content_manager import content_manager
+        from tools.news_ranker import rank_pending_news
+        # Keep each topic's news item so it is marked scripted instead of picked again next batch
+        news_items = {item["topic"]: item for item in rank_pending_news(content_manager, args.top)}
+        args.topics = args.topics + list(news_items)
+        print(f"📰 {len(news_items)} topics from ranked feed stories")
+    if args.pipeline:
+        from scripts.run_episode_pipeline import latest_news_topics, run_pipeline
+        return 0 if run_pipeline(args.topics or latest_news_topics(1), force=args.force, news_items=news_items) else 1
+
+    from workflows.content_workflow import ContentCreationWorkflow, DirectContentWorkflow
+    workflow = DirectContentWorkflow() if args.mode == "direct" else ContentCreationWorkflow()
+    results = workflow.daily_content_batch(
+        args.topics or None,
+        videos_per_topic=args.videos,
+        max_workers=args.workers,
+        run_id=args.run_id,
+        news_items=news_items
+    )
+    print(f"✅ Batch finished: {len(results)} videos")
+    return 0
+
+def cmd_gc(args) -> int:
+    from config.settings import get_setting
+    from utils.content_manager import content_manager
+    from utils.tts_cache import TTSCache
+
+    removed = content_manager.cleanup(keep_latest=args.keep, dry_run=args.dry_run)
+    verb = "Would remove" if args.dry_run else "Removed"
+    for path in removed:
+        print(f"   🗑️  {path}")
+    print(f"🧹 {verb} {len(removed)} files (kept latest {args.keep} per content type)")
+
+    cache_settings = get_setting('TTS_CACHE', {})
+    cache = TTSCache(cache_settings.get('directory', 'content/cache/tts'),
+                     cache_settings.get('max_bytes', 200 * 1024 * 1024))
+    stats = cache.stats() if args.dry_run else cache.trim()
+    print(f"🎤 TTS cache: {stats['entries']} clips, {stats['total_bytes'] / (1024 * 1024):.1f} MB "
+          f"of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+    return 0
+
+def cmd_bench(args) -> int:
+    _load_env()
+    _trace_run()
+    if args.benchmark == "crew-overhead":
+        from scripts.benchmark_crew_overhead import main as benchmark
+    elif args.benchmark == "uploads":
+        from scripts.benchmark_uploads import main as benchmark
+    elif args.benchmark == "pipeline":
+        from scripts.benchmark_pipeline import main as benchmark
+    else:
+        from scripts.benchmark_workflow_modes import main as benchmark
+    return benchmark(args.args)
+
+def cmd_worker(args) -> int:
+    from utils.worker import main as worker
+    return worker([args.action])
+
+def cmd_trace(args) -> int:
+    from utils.tracing import main as trace
+    argv = [args.action, "--last", str(args.last)]
+    if args.name:
+        argv += ["--name", args.name]
+    if args.path:
+        argv += ["--path", args.path]
+    return trace(argv)
+
+def cmd_cassette(args) -> int:
+    from scripts.cassette_proxy import main as cassette
+    return cassette([args.action, args.cassette] + args.args)
+
+def cmd_profile(args) -> int:
+    from utils.profiling import main as profile
+    argv = [args.action, "--top", str(args.top), "--sort", args.sort]
+    for flag in ("session", "dir", "stage", "output"):
+        if getattr(args, flag):
+            argv += [f"--{flag}", getattr(args, flag)]
+    return profile(argv)
+
+def cmd_costs(args) -> int:
+    from utils.cost_ledger import main as costs
+    return costs([args.action, "--days", str(args.days)])
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="catnews", description="AI Cat News Network")
+    parser.add_argument("--profile", metavar="STAGES",
+                        help="Profile these stages (comma-separated: script.parse, content.save, thumbnail.render, "
+                             "video.poll, or all)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Fetch news feeds and save new stories")
+    ingest.add_argument("--feed", action="append", help="Only this configured feed (repeatable)")
+    ingest.add_argument("--url", action="append", help="Extra feed URL to fetch (repeatable)")
+    ingest.set_defaults(func=cmd_ingest)
+
+    script = commands.add_parser("script", help="Write a cat news script from a real news topic")
+    script.add_argument("--topic", help="News topic (default: a random curated story)")
+    script.add_argument("--short", action="store_true", help="Ultra-short 6-second script")
+    script.add_argument("--from-feeds", action="store_true", help="Use the oldest pending ingested story")
+    script.set_defaults(func=cmd_script)
+
+    dedup = commands.add_parser("dedup", help="Near-duplicate story index")
+    dedup.add_argument("--backfill", action="store_true", help="Index existing news items and scripts")
+    dedup.add_argument("--check", metavar="TEXT", help="Show the indexed story TEXT duplicates, if any")
+    dedup.set_defaults(func=cmd_dedup)
+
+    rank = commands.add_parser("rank", help="Rank pending ingested stories for scripting")
+    rank.add_argument("--top", type=int, help="How many to show (default NEWS_RANKING top_k)")
+    rank.set_defaults(func=cmd_rank)
+
+    voice = commands.add_parser("voice", help="Generate a voice-over (default: latest script)")
+    voice.add_argument("--script", help="Script file to voice")
+    voice.add_argument("--target", type=float, default=22, help="Target duration in seconds")
+    voice.set_defaults(func=cmd_voice)
+
+    render = commands.add_parser("render", help="Generate a video from the latest script and audio")
+    render.add_argument("--provider", choices=["hailuo", "veo3"], default="hailuo")
+    render.set_defaults(func=cmd_render)
+
+    thumbs = commands.add_parser("thumbs", help="Render headline thumbnails for scripts")
+    thumbs.add_argument("scripts", nargs="*", help="Script files (default: the latest --latest scripts)")
+    thumbs.add_argument("--latest", type=int, default=1, help="How many of the latest scripts, without SCRIPTS")
+    thumbs.add_argument("--variant", action="append", choices=["vertical", "landscape"],
+                        help="Only this variant (repeatable; default all in THUMBNAILS)")
+    thumbs.add_argument("--workers", type=int, help="Render processes (default THUMBNAILS max_workers)")
+    thumbs.set_defaults(func=cmd_thumbs)
+
+    upload = commands.add_parser("upload", help="Resumable upload queue for packaged videos")
+    upload.add_argument("action", choices=["queue", "run", "status", "retry"])
+    upload.add_argument("--platform", action="append", help="Only this platform (repeatable; default all in UPLOADS)")
+    upload.add_argument("--latest", type=int, default=1, help="With queue: how many of the latest packages")
+    upload.add_argument("--package", action="append", help="With queue: package JSON file (repeatable)")
+    upload.add_argument("--workers", type=int, help="With run: uploads in flight (default UPLOADS max_workers)")
+    upload.set_defaults(func=cmd_upload)
+
+    browse = commands.add_parser("browse", help="Browse the content structure")
+    browse.set_defaults(func=cmd_browse)
+
+    batch = commands.add_parser("batch", help="Create content for many topics")
+    batch.add_argument("topics", nargs="*", help="Topics (may be omitted when resuming a run)")
+    batch.add_argument("--from-feeds", action="store_true", help="Add the top-ranked pending ingested stories")
+    batch.add_argument("--top", type=int, help="With --from-feeds: how many stories (default NEWS_RANKING top_k)")
+    batch.add_argument("--run-id", help="Checkpoint the run; rerun with the same ID to resume")
+    batch.add_argument("--workers", type=int, default=1, help="Topics processed concurrently")
+    batch.add_argument("--videos", type=int, default=1, help="Videos per topic")
+    batch.add_argument("--mode", choices=["crew", "direct"], default="direct")
+    batch.add_argument("--pipeline", action="store_true", help="Run the overlapped episode pipeline instead")
+    batch.add_argument("--force", action="store_true", help="With --pipeline: rebuild every stage")
+    batch.set_defaults(func=cmd_batch)
+
+    gc = commands.add_parser("gc", help="Remove old content and trim caches")
+    gc.add_argument("--keep", type=int, default=3, help="Files to keep per content type")
+    gc.add_argument("--dry-run", action="store_true", help="Only list what would be removed")
+    gc.set_defaults(func=cmd_gc)
+
+    bench = commands.add_parser("bench", help="Run a benchmark")
+    bench.add_argument("benchmark", choices=["workflow-modes", "crew-overhead", "uploads", "pipeline"])
+    bench.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the benchmark")
+    bench.set_defaults(func=cmd_bench)
+
+    worker = commands.add_parser("worker", help="Control the warm worker")
+    worker.add_argument("action", choices=["serve", "ping", "stop"])
+    worker.set_defaults(func=cmd_worker)
+
+    trace = commands.add_parser("trace", help="Pipeline timing spans")
+    trace.add_argument("action", choices=["report"])
+    trace.add_argument("--last", type=int, default=5, help="Episodes to show critical paths for")
+    trace.add_argument("--name", help="Only spans whose name starts with this")
+    trace.add_argument("--path", help="Trace file (default TRACING path)")
+    trace.set_defaults(func=cmd_trace)
+
+    cassette = commands.add_parser("cassette", help="Record or replay provider API calls through a local proxy")
+    cassette.add_argument("action", choices=["record", "replay", "info"])
+    cassette.add_argument("cassette", help="Cassette file, e.g. content/cache/cassettes/run.cassette")
+    cassette.add_argument("args", nargs=argparse.REMAINDER, help="Arguments passed to the proxy")
+    cassette.set_defaults(func=cmd_cassette)
+
+    profile = commands.add_parser("profile", help="Merge and summarize stage profiles")
+    profile.add_argument("action", choices=["summarize"])
+    profile.add_argument("--session", help="Session directory name (default: the latest)")
+    profile.add_argument("--dir", help="Profiles directory (default PROFILING directory)")
+    profile.add_argument("--stage", help="Only stages whose name starts with this")
+    profile.add_argument("--top", type=int, default=15, help="Functions to show per stage")
+    profile.add_argument("--sort", choices=["cumulative", "own"], default="cumulative")
+    profile.add_argument("--output", help="Also write merged profiles to OUTPUT.<stage>.prof / .collapsed")
+    profile.set_defaults(func=cmd_profile)
+
+    costs = commands.add_parser("costs", help="Provider cost ledger and today's budget headroom")
+    costs.add_argument("action", choices=["report"])
+    costs.add_argument("--days", type=int, default=7, help="Days to show, today included")
+    costs.set_defaults(func=cmd_costs)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        # Before the subcommand imports anything: stages are wrapped when their module loads
+        os.environ["CATNEWS_PROFILE"] = args.profile
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
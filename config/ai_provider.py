@@ -1,7 +1,10 @@
 import os
+import json
+import threading
 from typing import Optional, Dict, Any
 from groq import Groq
 from dotenv import load_dotenv
+from utils import cost_ledger, tracing
 
 # Load environment variables
 load_dotenv()
@@ -16,13 +19,16 @@ class AIProviderManager:
         self.provider = 'groq'
         self.model = os.getenv('AI_MODEL', 'llama3-70b-8192')
         self.client = self._initialize_client()
+        self._usage_lock = threading.Lock()
+        self.reset_usage()
     
     def _initialize_client(self):
         """Initialize the Groq AI client."""
         api_key = os.getenv('GROQ_API_KEY')
         if not api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
-        return Groq(api_key=api_key)
+        # GROQ_BASE_URL points the client elsewhere, e.g. at scripts/provider_fixture_server.py
+        return Groq(api_key=api_key, base_url=os.getenv('GROQ_BASE_URL') or None)
     
     def generate_content(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
         """
@@ -35,19 +41,86 @@ class AIProviderManager:
             
         Returns:
             Generated content as string
+            
+        Raises:
+            BudgetExceeded: today's Groq budget can't cover the call (nothing was sent)
+        """
+        with tracing.span("llm.generate", provider=self.provider, model=self.model, max_tokens=max_tokens) as span:
+            try:
+                with cost_ledger.track(self.provider, "chat", prompt_tokens=len(prompt) // 4,
+                                       completion_tokens=max_tokens) as call:
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                    call.complete(**self._record_usage(response, span))
+                return response.choices[0].message.content
+                
+            except cost_ledger.BudgetExceeded:
+                # Not an API failure: callers must not mistake it for generated text
+                raise
+            except Exception as e:
+                span.fail(e)
+                print(f"Error generating content with Groq: {str(e)}")
+                return "Error: Could not generate content. Please check your Groq API configuration."
+    
+    def generate_json(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.4) -> Optional[Dict[str, Any]]:
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content
+        Generate a JSON object using Groq's JSON mode.
+        
+        The prompt must ask for JSON (Groq rejects JSON mode otherwise).
+        
+        Returns:
+            The parsed object, or None if the call failed or didn't return a JSON object
             
-        except Exception as e:
-            print(f"Error generating content with Groq: {str(e)}")
-            return "Error: Could not generate content. Please check your Groq API configuration."
+        Raises:
+            BudgetExceeded: today's Groq budget can't cover the call (nothing was sent)
+        """
+        with tracing.span("llm.generate_json", provider=self.provider, model=self.model, max_tokens=max_tokens) as span:
+            try:
+                with cost_ledger.track(self.provider, "chat_json", prompt_tokens=len(prompt) // 4,
+                                       completion_tokens=max_tokens) as call:
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        response_format={"type": "json_object"}
+                    )
+                    call.complete(**self._record_usage(response, span))
+                result = json.loads(response.choices[0].message.content)
+                return result if isinstance(result, dict) else None
+                
+            except cost_ledger.BudgetExceeded:
+                raise
+            except Exception as e:
+                span.fail(e)
+                print(f"Error generating JSON with Groq: {str(e)}")
+                return None
+    
+    def _record_usage(self, response, span=None) -> Dict[str, int]:
+        """Add a response's token counts to the running totals (and to the call's trace span); returns them."""
+        usage = getattr(response, 'usage', None)
+        counts = {key: getattr(usage, key, 0) or 0 for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')}
+        with self._usage_lock:
+            self.usage['requests'] += 1
+            for key, count in counts.items():
+                self.usage[key] += count
+        if span is not None:
+            span.set(**counts)
+        return {key: counts[key] for key in ('prompt_tokens', 'completion_tokens')}
+    
+    def get_usage(self) -> Dict[str, int]:
+        """Get token usage since the last reset (requests, prompt/completion/total tokens)."""
+        with self._usage_lock:
+            return dict(self.usage)
+    
+    def reset_usage(self):
+        """Reset the token usage counters."""
+        with self._usage_lock:
+            self.usage = {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
     
     def get_provider_info(self) -> Dict[str, Any]:
         """Get information about the current provider."""
@@ -109,3 +182,36 @@ def generate_hashtags(content_description: str) -> str:
     """
     
     return ai_provider.generate_content(prompt, max_tokens=200, temperature=0.5)
+
+def write_cat_news_script(topic: str) -> str:
+    """Write a short cat news script about a real news story."""
+    prompt = f"""
+You are a professional cat news anchor reporting REAL human news but from a feline perspective. 
+
+Create a hilarious 20-second cat news script about this REAL news story: {topic}
+
+Requirements:
+- Report the actual human news accurately
+- Add cat commentary, reactions, and puns throughout
+- Show cats are either jealous, confused, or dismissive of human activities
+- Include typical cat behaviors and attitudes
+
+Format:
+**INTRO** (3-4 seconds)
+(Serious news music. Professional cat anchor at desk)
+"Good evening, I'm [Cat Name] with breaking human news..."
+
+**MAIN** (12-14 seconds)  
+Report the actual story but with cat reactions like:
+- "While we cats have been [doing superior cat thing], humans are apparently..."
+- Include cat puns and superior attitude
+- Show bewilderment at human behavior
+
+**OUTRO** (3-4 seconds)
+Cat signs off with typical dismissive cat behavior
+"And that's why cats remain superior. Now excuse me while I [cat activity]."
+
+Keep it under 100 words total. Make it viral-worthy with cat humor!
+"""
+    
+    return ai_provider.generate_content(prompt, max_tokens=300, temperature=0.8)
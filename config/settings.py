@@ -1,4 +1,5 @@
 # Cat News Video Creator Configuration
+import os
 
 # MAIN PROJECT CONCEPT
 PROJECT_CONCEPT = {
@@ -67,14 +68,16 @@ PLATFORM_SETTINGS = {
         "max_duration": 60,
         "optimal_duration": 30,
         "hashtag_limit": 10,
-        "title_max_length": 100
+        "title_max_length": 100,
+        "caption_max_length": 5000
     },
     "instagram_reels": {
         "aspect_ratio": "9:16", 
         "max_duration": 90,
         "optimal_duration": 30,
         "hashtag_limit": 30,
-        "title_max_length": 150
+        "title_max_length": 150,
+        "caption_max_length": 2200
     }
 }
 
@@ -113,22 +116,180 @@ TRENDING_HASHTAGS = [
     "#PetContent"
 ]
 
+# Local hashtag generation (see tools/hashtag_engine.py)
+HASHTAG_ENGINE = {
+    "table_path": "content/cache/hashtag_cooccurrence.json",  # Tag co-occurrence counts from past posts
+    "max_keyword_tags": 4,       # Tags made from script keywords
+    "llm_enrichment": False      # Also ask the LLM for suggestions (one extra Groq call per video)
+}
+
 # VIDEO PROVIDERS CONFIGURATION
 VIDEO_PROVIDERS = {
     "google_veo3": {
         "name": "Google Veo 3",
         "api_key_env": "GOOGLE_API_KEY",
+        "base_url": os.getenv("GOOGLE_API_BASE_URL"),   # None: the SDK's default endpoint
         "free_tier": True,
         "enabled": True
     },
     "minimax": {
         "name": "MiniMax",
         "api_key_env": "MINIMAX_API_KEY", 
+        "base_url": os.getenv("MINIMAX_BASE_URL", "https://api.minimax.chat"),
+        "poll_seconds": float(os.getenv("MINIMAX_POLL_SECONDS", "10")),   # Wait between task status checks
         "free_tier": False,
         "enabled": True
     }
 }
 
+# VOICE GENERATION (ElevenLabs)
+ELEVENLABS_VOICE_ID = os.getenv('ELEVENLABS_VOICE_ID', '2ajXGJNYBR0iNHpS4VZb')
+ELEVENLABS_MODEL_ID = "eleven_monolingual_v1"
+
+TTS_CACHE = {
+    "directory": "content/cache/tts",
+    "max_bytes": 200 * 1024 * 1024,  # Oldest-used clips are evicted past this budget
+    "enabled": True
+}
+
+TTS_PARALLEL = {
+    "max_concurrency": 3,      # Concurrent ElevenLabs requests (plan limit)
+    "min_sentence_chars": 12   # Shorter fragments are merged into a neighbouring sentence
+}
+
+# EPISODE PIPELINE (worker pools per external resource)
+PIPELINE_SETTINGS = {
+    "pools": {
+        "io": 2,       # ContentManager reads/writes
+        "llm": 2,      # Groq script generation
+        "tts": 2,      # ElevenLabs voice-overs (each also fans out per sentence)
+        "render": 4    # Video segment renders
+    },
+    "queue_size": 8,
+    "max_inflight_episodes": 4
+}
+
+# NEWS FEEDS (RSS/Atom sources for the ingestion stage)
+NEWS_FEEDS = [
+    {"name": "bbc_world", "url": "https://feeds.bbci.co.uk/news/world/rss.xml", "enabled": True},
+    {"name": "bbc_science", "url": "https://feeds.bbci.co.uk/news/science_and_environment/rss.xml", "enabled": True},
+    {"name": "npr_news", "url": "https://feeds.npr.org/1001/rss.xml", "enabled": True},
+    {"name": "guardian_science", "url": "https://www.theguardian.com/science/rss", "enabled": True}
+]
+
+NEWS_INGESTION = {
+    "max_workers": 4,                              # Feeds fetched concurrently
+    "timeout": 15,                                 # Seconds per request
+    "max_items_per_feed": 25,                      # Newest items taken from each feed per run
+    "state_path": "content/cache/feed_state.json", # ETag / Last-Modified and seen item IDs per feed
+    "dedup": True                                  # Merge near-duplicate stories (see DEDUP_INDEX)
+}
+
+# Near-duplicate story index (MinHash/LSH over headlines and summaries)
+DEDUP_INDEX = {
+    "db_path": "content/cache/dedup_index.sqlite",
+    "num_perm": 128,    # Signature length; changing it (or bands) needs a fresh index
+    "bands": 32,        # LSH bands of num_perm / bands rows each
+    "threshold": 0.5    # Estimated Jaccard similarity at which two stories are the same story
+}
+
+# NEWS RANKING (which candidate stories are worth scripting)
+NEWS_RANKING = {
+    "top_k": 24,                 # Candidates passed on to LLM scripting per run
+    "recent_scripts": 200,       # Scripts compared against for novelty
+    "half_life_hours": 12,       # Recency score halves every this many hours
+    "weights": {"category": 0.5, "novelty": 0.3, "recency": 0.2},
+    # Extra words describing each of NEWS_CATEGORIES, since the names alone are short
+    "category_keywords": {
+        "Technology and AI developments": ["ai", "robot", "software", "chip", "app", "tech", "startup", "algorithm", "smartphone"],
+        "Environmental and climate news": ["climate", "emissions", "wildlife", "forest", "ocean", "pollution", "trees", "solar", "heatwave"],
+        "Social media platform changes": ["twitter", "instagram", "tiktok", "facebook", "youtube", "influencer", "viral", "platform", "followers"],
+        "Economic market updates": ["stocks", "inflation", "prices", "economy", "bank", "rates", "shares", "trade", "jobs"],
+        "Space exploration discoveries": ["nasa", "moon", "mars", "rocket", "telescope", "planet", "exoplanet", "astronaut", "orbit"],
+        "Health and wellness trends": ["health", "study", "sleep", "diet", "exercise", "hospital", "vaccine", "doctors", "wellbeing"],
+        "Entertainment industry news": ["film", "movie", "music", "festival", "celebrity", "tv", "album", "concert", "award"],
+        "Political developments (light humor)": ["election", "government", "minister", "parliament", "vote", "president", "policy", "mayor"],
+        "Scientific breakthroughs": ["scientists", "researchers", "discover", "species", "fossil", "physics", "experiment", "lab"],
+        "Consumer product launches": ["launch", "product", "gadget", "release", "brand", "device", "store", "unveils"]
+    }
+}
+
+# THUMBNAILS (headline overlays rendered on the studio background)
+THUMBNAILS = {
+    "background": "thumbs/cat.jpeg",
+    # First font that exists is used; Pillow's bundled font otherwise
+    "fonts": [
+        "C:/Windows/Fonts/arialbd.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/Library/Fonts/Arial Bold.ttf"
+    ],
+    "variants": {"vertical": [1080, 1920], "landscape": [1280, 720]},  # 9:16 Shorts/Reels, 16:9 YouTube
+    "badge": "CAT NEWS",    # Corner badge text ("" for none)
+    "max_lines": 4,         # Headline lines before the font shrinks further
+    "quality": 85,          # JPEG quality
+    "max_workers": 4        # Render processes for batches
+}
+
+# UPLOADS (resumable chunked uploads of packaged videos)
+# Endpoints speak the resumable-session protocol (POST to open a session, PUT byte
+# ranges to it); by default they point at scripts/upload_fixture_server.py
+UPLOADS = {
+    "db_path": "content/cache/upload_queue.sqlite",  # Queue and per-upload progress (survives restarts)
+    "chunk_size": 8 * 1024 * 1024,  # Bytes per PUT; keep a multiple of 256 KB
+    "max_workers": 4,               # Uploads in flight across all platforms
+    "chunk_retries": 5,             # Consecutive failures of one chunk before the upload is marked failed
+    "backoff_seconds": 1.0,         # First retry delay, doubled per retry (capped at 30 s)
+    "timeout": 60,                  # Seconds per request
+    "platforms": {
+        "youtube_shorts": {
+            "endpoint": os.getenv("YOUTUBE_UPLOAD_URL", "http://127.0.0.1:8798/upload/youtube_shorts"),
+            "max_concurrent": 2,    # Uploads in flight to this platform
+            "daily_quota": 6        # Completed uploads per rolling 24 hours
+        },
+        "instagram_reels": {
+            "endpoint": os.getenv("INSTAGRAM_UPLOAD_URL", "http://127.0.0.1:8798/upload/instagram_reels"),
+            "max_concurrent": 2,
+            "daily_quota": 25
+        }
+    }
+}
+
+# TRACING (timing spans around external calls, content I/O and pipeline stages)
+TRACING = {
+    "enabled": False,                               # Batch/pipeline/bench runs trace anyway; CATNEWS_TRACE=0/1 overrides
+    "path": "content/cache/traces/spans.jsonl",     # One JSON span per line; report with `catnews trace report`
+    "max_bytes": 20 * 1024 * 1024,                  # Rotate after this size...
+    "backup_count": 5                               # ...keeping this many older files
+}
+
+# PROFILING (on-demand profiles of chosen stages; off unless stages are listed)
+PROFILING = {
+    "stages": [],                           # e.g. ["script.parse", "content.save", "thumbnail.render", "video.poll"],
+                                            # or ["all"]; CATNEWS_PROFILE=content,video.poll overrides for one run
+    "engine": "cprofile",                   # "cprofile" (.prof) or "sample" (collapsed stacks); CATNEWS_PROFILE_ENGINE
+    "sample_interval_ms": 5,                # Sampling engine: time between stack samples
+    "directory": "content/cache/profiles"   # <session>/<trace>/<stage>.<pid>-<n>.prof; `catnews profile summarize`
+}
+
+# COST LEDGER (estimated and actual cost of every provider call, and the daily budgets they are checked against)
+COST_LEDGER = {
+    "enabled": True,                                    # CATNEWS_COSTS=0 turns it off for one run
+    "db_path": "content/cache/cost_ledger.sqlite",     # `catnews costs report`
+    "prices": {                                         # USD list prices (estimates; check your plan)
+        "groq": {"per_1k_prompt_tokens": 0.00059, "per_1k_completion_tokens": 0.00079},
+        "elevenlabs": {"per_1k_characters": 0.30},
+        "minimax": {"per_video_second": 0.017},         # ~$0.10 per 6-second Hailuo clip
+        "veo3": {"per_video_second": 0.0}               # Free tier
+    },
+    "budgets": {
+        "daily_usd": 20.0,                              # All providers together, per calendar day (None: no limit)
+        "providers": {"minimax": 12.0, "elevenlabs": 6.0, "groq": 2.0}   # Per provider per day
+    },
+    "video_routing": ["minimax", "veo3"],               # Preferred first; a render goes to the first with headroom
+    "wait_seconds": 600,                                # How long a call over budget waits for in-flight calls to settle
+    "reservation_ttl_seconds": 3600                     # Unsettled reservations (crashed runs) stop counting after this
+}
+
 # HELPER FUNCTIONS
 def get_setting(key, default=None):
     """Get a setting value from the configuration."""
@@ -140,6 +301,22 @@ def get_setting(key, default=None):
         'CONTENT_TYPES': CONTENT_TYPES,
         'PLATFORM_SETTINGS': PLATFORM_SETTINGS,
         'TRENDING_HASHTAGS': TRENDING_HASHTAGS,
-        'VIDEO_PROVIDERS': VIDEO_PROVIDERS
+        'HASHTAG_ENGINE': HASHTAG_ENGINE,
+        'VIDEO_PROVIDERS': VIDEO_PROVIDERS,
+        'TTS_CACHE': TTS_CACHE,
+        'TTS_PARALLEL': TTS_PARALLEL,
+        'PIPELINE_SETTINGS': PIPELINE_SETTINGS,
+        'NEWS_FEEDS': NEWS_FEEDS,
+        'NEWS_INGESTION': NEWS_INGESTION,
+        'DEDUP_INDEX': DEDUP_INDEX,
+        'NEWS_RANKING': NEWS_RANKING,
+        'THUMBNAILS': THUMBNAILS,
+        'UPLOADS': UPLOADS,
+        'TRACING': TRACING,
+        'PROFILING': PROFILING,
+        'COST_LEDGER': COST_LEDGER
     }
-    return settings_dict.get(key, default)
+    if key in settings_dict:
+        return settings_dict[key]
+    # API keys and other secrets live in the environment (.env)
+    return os.getenv(key, default)
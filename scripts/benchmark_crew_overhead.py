@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Crew Overhead Benchmark for AI Cat News Network
+Measures import-time startup cost and per-call crew construction cost, fresh vs pooled
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import subprocess
+from typing import List, Optional
+from dotenv import load_dotenv
+
+# Add the parent directory to sys.path so we can import workflows
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start, "crewai_loaded": "crewai" in sys.modules}}))
+"""
+
+def measure_import(module: str, runs: int) -> dict:
+    """Import a module in fresh interpreters and report the best time"""
+    samples = []
+    crewai_loaded = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        samples.append(result["seconds"])
+        crewai_loaded = result["crewai_loaded"]
+    return {"module": module, "best_seconds": min(samples), "crewai_loaded": crewai_loaded}
+
+def measure_calls(shape: str, calls: int, kickoff: bool) -> dict:
+    """Time per-call overhead of rebuilding a crew every call against checking one out of the pool"""
+    from workflows.content_workflow import crew_pool
+    from workflows.crew_pool import CrewPool
+
+    inputs = {"content_idea": "Cats react to a new smart litter box", "topic": "Technology", "count": 1}
+    factory = crew_pool._factories[shape]
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        crew = factory()
+        if kickoff:
+            crew.kickoff(inputs=inputs)
+    fresh = (time.perf_counter() - start) / calls
+
+    pool = CrewPool()
+    pool.register(shape, factory)
+    start = time.perf_counter()
+    for _ in range(calls):
+        with pool.checkout(shape) as crew:
+            if kickoff:
+                crew.kickoff(inputs=inputs)
+    pooled = (time.perf_counter() - start) / calls
+
+    return {"shape": shape, "calls": calls, "kickoff": kickoff,
+            "fresh_seconds_per_call": fresh, "pooled_seconds_per_call": pooled,
+            "pool_stats": pool.stats()[shape]}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CrewAI startup and per-call overhead")
+    parser.add_argument("--shape", default="video_from_idea",
+                        choices=["content_ideas", "video_from_idea", "quick_script"])
+    parser.add_argument("--calls", type=int, default=20, help="Calls per variant")
+    parser.add_argument("--import-runs", type=int, default=3, help="Fresh interpreters per import measurement")
+    parser.add_argument("--kickoff", action="store_true", help="Also run the crews (makes LLM calls)")
+    args = parser.parse_args(argv)
+
+    print("🐱 AI Cat News Network - Crew Overhead Benchmark")
+    print("=" * 50)
+
+    print("\n🚀 Startup (fresh interpreter, best of runs)")
+    startup = [measure_import(module, args.import_runs)
+               for module in ("workflows.content_workflow", "crewai")]
+    for result in startup:
+        loaded = "yes" if result["crewai_loaded"] else "no"
+        print(f"   import {result['module']:<28} {result['best_seconds'] * 1000:>8.1f} ms  (crewai loaded: {loaded})")
+
+    print(f"\n🔁 Per-call overhead: {args.shape} x {args.calls}{' with kickoff' if args.kickoff else ''}")
+    calls = measure_calls(args.shape, args.calls, args.kickoff)
+    print(f"   fresh crew per call  {calls['fresh_seconds_per_call'] * 1000:>8.2f} ms")
+    print(f"   pooled crew          {calls['pooled_seconds_per_call'] * 1000:>8.2f} ms")
+    print(f"   crews built by pool  {calls['pool_stats']['built']}")
+    return 0
+
+if __name__ == "__main__":
+    load_dotenv()
+    sys.exit(main())
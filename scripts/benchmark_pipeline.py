@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark for AI Cat News Network
+Runs whole episodes offline against the provider fixture server (simulated Groq,
+ElevenLabs, MiniMax and Google latency, jitter and failures) and compares episodes
+per hour, time per episode, peak RSS and API calls per episode with a stored baseline
+
+    python scripts/benchmark_pipeline.py [--episodes 8] [--mode pipeline|direct] [--provider hailuo|veo3]
+                                         [--profile realistic] [--time-scale 0.02] [--save-baseline]
+                                         [--record CASSETTE | --replay CASSETTE]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Add the parent directory to sys.path so we can import scripts, tools and workflows
+sys.path.append(PROJECT_ROOT)
+
+from scripts import cassette_proxy
+from scripts.provider_fixture_server import PROFILES, make_server, provider_env
+from utils.cassette import Cassette
+
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "scripts", "benchmark_baseline.json")
+
+TOPICS = [
+    "City council votes to extend library opening hours",
+    "Scientists map the deepest ocean trench in record detail",
+    "Regional airport opens a new solar-powered terminal",
+    "Marathon runners brave record heat in the capital",
+    "Museum unveils a rediscovered Renaissance painting",
+    "Farmers trial drones to monitor crop health",
+    "High-speed rail link approved after decade of debate",
+    "Local bakery wins national sourdough championship",
+    "Space agency delays lunar lander test by two weeks",
+    "Coastal town launches a plastic-free summer campaign",
+]
+
+# Metric: which direction is a regression
+LOWER_IS_BETTER = {"seconds_per_episode": True, "p95_seconds_per_episode": True, "episodes_per_hour": False,
+                   "peak_rss_mb": True, "api_calls_per_episode": True}
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process (None where the resource module is unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_episodes(topics: List[str], mode: str, provider: str) -> Dict[str, Any]:
+    """Child side: produce one episode per topic with the real clients and report timings"""
+    from config.ai_provider import ai_provider
+    from tools.ai_video_generator import MiniMaxVideoGenerator
+    from utils.cost_ledger import CostLedger, get_cost_ledger
+
+    if provider == "veo3":
+        from tools.unified_video_generator import UnifiedVideoGenerator
+        video_generator = UnifiedVideoGenerator("veo3")
+    else:
+        video_generator = MiniMaxVideoGenerator()
+
+    episodes = []
+    start = time.time()
+    if mode == "pipeline":
+        from workflows.episode_pipeline import EpisodePipeline
+        pipeline = EpisodePipeline(video_generator=video_generator)
+        for summary in pipeline.run_batch(topics):
+            segments = summary["results"].get("package", {}).get("segments_status")
+            episodes.append({"topic": summary["run_id"], "seconds": summary["elapsed_seconds"],
+                             "status": summary["status"] if segments != "partial" else "partial",
+                             "errors": summary["errors"]})
+    else:
+        from workflows.content_workflow import DirectContentWorkflow
+        workflow = DirectContentWorkflow(video_generator=video_generator)
+        for topic in topics:
+            episode_start = time.time()
+            try:
+                package = workflow.create_video_from_idea(topic)
+                video = package.get("video_generation") or {}
+                status, errors = ("success" if video.get("status") in ("success", "completed") else "partial"), {}
+            except Exception as e:
+                status, errors = "error", {"episode": str(e)}
+            episodes.append({"topic": topic, "seconds": time.time() - episode_start, "status": status,
+                             "errors": errors})
+
+    ledger = get_cost_ledger()
+    return {"elapsed_seconds": time.time() - start, "episodes": episodes, "peak_rss_mb": peak_rss_mb(),
+            "usage": ai_provider.get_usage(), "costs": ledger.totals() if isinstance(ledger, CostLedger) else {}}
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, round(fraction * (len(values) - 1)))] if values else 0.0
+
+def summarize(child: Dict[str, Any], api_stats: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    episodes = child["episodes"]
+    count = len(episodes) or 1
+    seconds = [episode["seconds"] for episode in episodes]
+    calls = {provider: stats["requests"] / count for provider, stats in api_stats.items() if stats["requests"]}
+    return {
+        "episodes": len(episodes),
+        "succeeded": sum(1 for episode in episodes if episode["status"] == "success"),
+        "elapsed_seconds": child["elapsed_seconds"],
+        "episodes_per_hour": len(episodes) / child["elapsed_seconds"] * 3600 if child["elapsed_seconds"] else 0.0,
+        "seconds_per_episode": _percentile(seconds, 0.5),
+        "p95_seconds_per_episode": _percentile(seconds, 0.95),
+        "peak_rss_mb": child["peak_rss_mb"],
+        "api_calls_per_episode": sum(calls.values()),
+        "api_calls_by_provider": calls,
+        "injected_failures": {provider: stats["failures"] for provider, stats in api_stats.items() if stats["failures"]},
+        "tokens_per_episode": child["usage"].get("total_tokens", 0) / count,
+        # At COST_LEDGER prices: what the same episodes would cost against the real providers
+        "usd_per_episode": sum(entry["actual_usd"] for entry in child.get("costs", {}).values()) / count
+    }
+
+def median_metrics(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each numeric metric across runs (per-provider breakdowns included)"""
+    merged = {}
+    for name, value in runs[0].items():
+        if isinstance(value, dict):
+            keys = set().union(*(run[name] for run in runs))
+            merged[name] = median_metrics([{key: run[name].get(key, 0) for key in sorted(keys)} for run in runs])
+        elif isinstance(value, (int, float)):
+            merged[name] = _percentile([run[name] for run in runs], 0.5)
+        else:
+            merged[name] = value
+    return merged
+
+def _serve(server) -> str:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return "http://%s:%d" % server.server_address[:2]
+
+def run_once(args, argv: Optional[List[str]], seed: int) -> Optional[Dict[str, Any]]:
+    """
+    Run the episodes in a child process against a fresh fixture server.
+
+    With --record a recording cassette proxy sits in front of the fixture server;
+    with --replay the cassette proxy alone answers every call.
+    """
+    servers = []
+    poll_seconds = 10 * args.time_scale
+    if args.replay:
+        cassette = Cassette.load(args.replay)
+        poll_seconds = cassette.meta.get("poll_seconds", 10) * args.time_scale
+        servers.append(cassette_proxy.make_server(cassette, "replay", time_scale=args.time_scale))
+        stats = servers[0].proxy
+    else:
+        servers.append(make_server(profile=args.profile, time_scale=args.time_scale, seed=seed))
+        stats = servers[0].providers
+        if args.record:
+            cassette = Cassette(meta={"version": 1, "recorded": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                      "profile": args.profile, "time_scale": args.time_scale, "seed": seed,
+                                      "poll_seconds": poll_seconds, "mode": args.mode, "provider": args.provider,
+                                      "episodes": args.episodes})
+            servers.append(cassette_proxy.make_server(cassette, "record", upstream=_serve(servers[0])))
+    base_url = _serve(servers[-1])
+    env = dict(os.environ, **provider_env(base_url),
+               GROQ_API_KEY="fixture", ELEVENLABS_API_KEY="fixture", MINIMAX_API_KEY="fixture",
+               GOOGLE_API_KEY="fixture", MINIMAX_POLL_SECONDS=str(poll_seconds),
+               PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            # A fresh process in an empty working directory: cold caches, nothing reused, its own peak RSS
+            child_output = os.path.join(workdir, "result.json")
+            child_args = sys.argv[1:] if argv is None else argv
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", child_output] + child_args,
+                cwd=workdir, env=env, capture_output=not args.verbose, text=True
+            )
+            if completed.returncode != 0 or not os.path.exists(child_output):
+                print(f"❌ Episode run failed (exit {completed.returncode})")
+                print((completed.stderr or "")[-2000:])
+                return None
+            with open(child_output, 'r', encoding='utf-8') as f:
+                child = json.load(f)
+        if args.record:
+            cassette.save(args.record)
+        run = {"metrics": summarize(child, stats.snapshot()), "episodes": child["episodes"]}
+        if args.replay:
+            run["replay_matches"] = dict(stats.player.stats)
+        return run
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+def baseline_key(args) -> str:
+    source = f"cassette:{os.path.basename(args.replay)}" if args.replay else args.profile
+    return f"{args.mode}/{args.provider}/{source}/x{args.time_scale:g}/{args.episodes}"
+
+def compare(metrics: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Metrics worse than the baseline by more than tolerance (a fraction)"""
+    regressions = []
+    for name, lower_is_better in LOWER_IS_BETTER.items():
+        current, previous = metrics.get(name), baseline.get(name)
+        if current is None or not previous:
+            continue
+        change = (current - previous) / previous
+        if (change > tolerance) if lower_is_better else (change < -tolerance):
+            regressions.append(f"{name}: {previous:.2f} -> {current:.2f} ({change:+.0%})")
+    return regressions
+
+def print_report(metrics: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    print(f"\n{'Metric':<26} {'Current':>10} {'Baseline':>10}")
+    print("-" * 48)
+    for name in ("episodes_per_hour", "seconds_per_episode", "p95_seconds_per_episode", "peak_rss_mb",
+                 "api_calls_per_episode", "tokens_per_episode", "usd_per_episode"):
+        current = metrics.get(name)
+        previous = (baseline or {}).get(name)
+        print(f"{name:<26} {'n/a' if current is None else f'{current:.2f}':>10} "
+              f"{'-' if previous is None else f'{previous:.2f}':>10}")
+    print("\n📞 API calls per episode: " + ", ".join(
+        f"{provider} {calls:.1f}" for provider, calls in metrics["api_calls_by_provider"].items()))
+    if any(metrics["injected_failures"].values()):
+        print("💥 Injected failures: " + ", ".join(
+            f"{provider} {count:g}" for provider, count in metrics["injected_failures"].items() if count))
+
+def load_baselines() -> Dict[str, Any]:
+    try:
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark whole episodes against simulated providers")
+    parser.add_argument("--episodes", type=int, default=8)
+    parser.add_argument("--mode", choices=["pipeline", "direct"], default="pipeline",
+                        help="Overlapped episode pipeline or one-at-a-time direct workflow")
+    parser.add_argument("--provider", choices=["hailuo", "veo3"], default="hailuo", help="Video provider")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic",
+                        help="Simulated latency, jitter and failure rates")
+    parser.add_argument("--time-scale", type=float,
+                        help="Multiply simulated latencies (and the MiniMax poll interval) by this "
+                             "(default 0.02; with --replay, recorded latencies, default 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs to take the median of")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show the episode run's own output")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument("--record", metavar="CASSETTE", help="Also record every provider call (one run)")
+    cassettes.add_argument("--replay", metavar="CASSETTE",
+                           help="Answer provider calls from a cassette instead of the simulated providers")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.time_scale is None:
+        args.time_scale = 1.0 if args.replay else 0.02
+    if args.record:
+        # One recording per cassette
+        args.repeat = 1
+
+    topics = [f"{TOPICS[i % len(TOPICS)]} (story {i + 1})" for i in range(args.episodes)]
+    if args.child:
+        result = run_episodes(topics, args.mode, args.provider)
+        with open(args.child, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    print("🐱 AI Cat News Network - Pipeline Benchmark")
+    print("=" * 50)
+    print(f"\n🎬 {args.episodes} episodes x {args.repeat} runs, {args.mode} mode, {args.provider} video, "
+          f"{f'{args.replay} replayed' if args.replay else repr(args.profile) + ' providers'} "
+          f"at x{args.time_scale:g} latency...")
+    runs = []
+    for repeat in range(args.repeat):
+        run = run_once(args, argv, seed=args.seed + repeat)
+        if run is None:
+            return 1
+        runs.append(run)
+        metrics = run["metrics"]
+        print(f"   Run {repeat + 1}: {metrics['succeeded']}/{metrics['episodes']} complete "
+              f"in {metrics['elapsed_seconds']:.1f}s"
+              + (" (replayed: {exact} exact, {route} by route, {missed} missed)".format(**run["replay_matches"])
+                 if args.replay else ""))
+        for episode in run["episodes"]:
+            if episode["status"] != "success":
+                errors = "; ".join(f"{stage}: {error}" for stage, error in episode["errors"].items())
+                print(f"   ⚠️  {episode['topic']}: {episode['status']} {errors[:160]}")
+    metrics = median_metrics([run["metrics"] for run in runs])
+
+    key = baseline_key(args)
+    baselines = load_baselines()
+    baseline = (baselines.get(key) or {}).get("metrics")
+    print_report(metrics, baseline)
+
+    regressions = compare(metrics, baseline, args.tolerance) if baseline else []
+    if args.save_baseline:
+        baselines[key] = {"recorded": time.strftime("%Y-%m-%d"), "metrics": metrics}
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\n📌 Baseline saved for {key}")
+    elif baseline is None:
+        print(f"\nℹ️  No baseline for {key}; record one with --save-baseline")
+    elif regressions:
+        print(f"\n🐢 Regressions beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+    else:
+        print(f"\n✅ Within {args.tolerance:.0%} of the baseline")
+
+    from utils.content_manager import content_manager
+    output = args.output or os.path.join(content_manager.base_path, "cache", "benchmarks",
+                                         f"pipeline_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({"params": {k: v for k, v in vars(args).items() if k != "child"}, "metrics": metrics,
+                   "runs": runs, "regressions": regressions}, f, indent=2)
+    print(f"📄 Results saved: {output}")
+    return 1 if regressions and not args.save_baseline else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Upload Benchmark for AI Cat News Network
+Measures chunked upload throughput and restart/resume cost against the local
+upload fixture server (no live platforms involved)
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+from typing import List, Optional
+
+# Add the parent directory to sys.path so we can import tools and utils
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.upload_fixture_server import make_server
+from tools.uploader import ResumableUploader, enqueue_packages
+from utils.content_manager import ContentManager, content_manager
+from utils.upload_queue import UploadQueue
+
+PLATFORMS = ["youtube_shorts", "instagram_reels"]
+
+def make_video(path: str, size_mb: int) -> str:
+    """Write size_mb of random bytes (incompressible, like real video) and return its SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            block = os.urandom(1024 * 1024)
+            digest.update(block)
+            f.write(block)
+    return digest.hexdigest()
+
+def upload_settings(base_url: str, db_path: str, chunk_mb: int, workers: int) -> dict:
+    return {
+        "db_path": db_path,
+        "chunk_size": chunk_mb * 1024 * 1024,
+        "max_workers": workers,
+        "chunk_retries": 5,
+        "backoff_seconds": 0.05,
+        "timeout": 60,
+        "platforms": {name: {"endpoint": f"{base_url}/upload/{name}", "max_concurrent": workers,
+                             "daily_quota": None} for name in PLATFORMS}
+    }
+
+def bench_throughput(server, cm: ContentManager, videos: list, settings: dict) -> dict:
+    """Upload every video to every platform in one run"""
+    queue = UploadQueue(settings["db_path"])
+    enqueue_packages([video["package"] for video in videos], PLATFORMS, queue)
+    before = server.platform.stats["bytes_received"]
+    start = time.time()
+    report = ResumableUploader(queue, settings).run()
+    elapsed = time.time() - start
+    queue.close()
+
+    sent = server.platform.stats["bytes_received"] - before
+    return {
+        "uploads": len(report["results"]),
+        "complete": sum(1 for status in report["results"].values() if status == "complete"),
+        "megabytes": sent / (1024 * 1024),
+        "elapsed_seconds": elapsed,
+        "mb_per_second": sent / (1024 * 1024) / elapsed if elapsed else 0.0
+    }
+
+def bench_resume(server, video: dict, settings: dict, stop_fraction: float) -> dict:
+    """Stop an upload part-way, reopen the queue as a fresh process would, and finish it"""
+    settings = dict(settings, db_path=settings["db_path"].replace(".sqlite", "_resume.sqlite"))
+    queue = UploadQueue(settings["db_path"])
+    enqueue_packages([dict(video["package"], package_id=video["package"]["package_id"] + "_resume")],
+                     PLATFORMS[:1], queue)
+    before = server.platform.stats["bytes_received"]
+
+    uploader = ResumableUploader(queue, settings)
+
+    def stop_part_way(upload, offset):
+        if offset >= upload["size"] * stop_fraction:
+            uploader.stop()
+
+    uploader.run(progress=stop_part_way)
+    queue.close()
+    interrupted_at = server.platform.stats["bytes_received"] - before
+
+    # New queue and uploader on the same database: nothing carried over in memory
+    queue = UploadQueue(settings["db_path"])
+    start = time.time()
+    report = ResumableUploader(queue, settings).run()
+    elapsed = time.time() - start
+    queue.close()
+
+    sent = server.platform.stats["bytes_received"] - before
+    return {
+        "complete": list(report["results"].values()) == ["complete"],
+        "size_mb": video["size"] / (1024 * 1024),
+        "interrupted_at_mb": interrupted_at / (1024 * 1024),
+        "resent_mb": (sent - video["size"]) / (1024 * 1024),
+        "resume_seconds": elapsed
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark resumable uploads against the fixture server")
+    parser.add_argument("--videos", type=int, default=2, help="Videos uploaded to each platform")
+    parser.add_argument("--size-mb", type=int, default=128, help="Size of each video")
+    parser.add_argument("--chunk-mb", type=int, default=8, help="Chunk size")
+    parser.add_argument("--workers", type=int, default=4, help="Uploads in flight")
+    parser.add_argument("--fail-every", type=int, default=0, help="Fixture server fails every Nth chunk")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    print("🐱 AI Cat News Network - Upload Benchmark")
+    print("=" * 50)
+
+    server = make_server(fail_every=args.fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = "http://%s:%d" % server.server_address[:2]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cm = ContentManager(os.path.join(workdir, "content"))
+        print(f"\n🎬 Writing {args.videos} x {args.size_mb} MB test videos...")
+        videos = []
+        for i in range(args.videos):
+            path = os.path.join(cm.video_path, f"bench_{i}.mp4")
+            sha256 = make_video(path, args.size_mb)
+            package = cm.create_content_package("", "", path)
+            videos.append({"package": package, "sha256": sha256, "size": os.path.getsize(path)})
+
+        settings = upload_settings(base_url, os.path.join(workdir, "uploads.sqlite"), args.chunk_mb, args.workers)
+
+        print(f"📤 Uploading to {', '.join(PLATFORMS)} ({args.chunk_mb} MB chunks, {args.workers} workers)...")
+        throughput = bench_throughput(server, cm, videos, settings)
+        print(f"   {throughput['complete']}/{throughput['uploads']} complete, "
+              f"{throughput['megabytes']:.0f} MB in {throughput['elapsed_seconds']:.1f}s "
+              f"= {throughput['mb_per_second']:.0f} MB/s")
+
+        print("\n⏸️  Stopping an upload half-way and resuming from the queue database...")
+        resume = bench_resume(server, videos[0], settings, 0.5)
+        print(f"   stopped after {resume['interrupted_at_mb']:.0f} of {resume['size_mb']:.0f} MB, "
+              f"resumed in {resume['resume_seconds']:.1f}s, re-sent {resume['resent_mb']:.1f} MB")
+
+    # Every completed upload must match its source byte for byte
+    expected = {video["package"]["package_id"]: video["sha256"] for video in videos}
+    expected.update({f"{key}_resume": value for key, value in expected.items()})
+    mismatches = [upload for upload in server.platform.completed
+                  if upload["sha256"] != expected.get(upload["package_id"])]
+    server.shutdown()
+    server.server_close()
+    print(f"\n🔒 Integrity: {len(server.platform.completed) - len(mismatches)}/{len(server.platform.completed)} "
+          f"uploads match their source")
+
+    results = {"params": vars(args), "throughput": throughput, "resume": resume,
+               "injected_failures": server.platform.stats["injected_failures"],
+               "integrity_errors": len(mismatches)}
+    output = args.output or os.path.join(content_manager.base_path, "cache", "benchmarks",
+                                         f"uploads_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Results saved: {output}")
+    return 0 if not mismatches and resume["complete"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
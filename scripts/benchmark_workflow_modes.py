@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Workflow Mode Benchmark for AI Cat News Network
+Compares tokens and wall-clock time of the CrewAI workflow against the direct fast path
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import List, Optional
+from dotenv import load_dotenv
+
+# Add the parent directory to sys.path so we can import workflows and config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.ai_provider import ai_provider
+from utils.content_manager import content_manager
+from workflows.content_workflow import ContentCreationWorkflow, DirectContentWorkflow
+
+def crew_token_usage(output) -> dict:
+    """Token usage reported by a CrewAI kickoff result"""
+    usage = getattr(output, "token_usage", None)
+    return {
+        "requests": getattr(usage, "successful_requests", 0) or 0,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0
+    }
+
+def add_usage(total: dict, usage: dict):
+    for key, value in usage.items():
+        total[key] = total.get(key, 0) + value
+
+def benchmark_mode(mode: str, topics: list, render_video: bool) -> dict:
+    """Run ideation plus one video per topic and measure tokens and wall-clock time"""
+    if mode == "crew":
+        workflow = ContentCreationWorkflow()
+    else:
+        workflow = DirectContentWorkflow(render_video=render_video)
+
+    usage = {}
+    ai_provider.reset_usage()
+    errors = []
+    start = time.time()
+
+    for topic in topics:
+        try:
+            ideas = workflow.generate_content_ideas(topic, 1)
+            video = workflow.create_video_from_idea(f"Video 1 about {topic}")
+            if mode == "crew":
+                add_usage(usage, crew_token_usage(ideas))
+                add_usage(usage, crew_token_usage(video))
+        except Exception as e:
+            errors.append(f"{topic}: {e}")
+
+    elapsed = time.time() - start
+    # Direct calls (and any tool calls made by agents) go through the shared provider
+    add_usage(usage, ai_provider.get_usage())
+
+    return {
+        "mode": mode,
+        "topics": len(topics),
+        "elapsed_seconds": elapsed,
+        "seconds_per_topic": elapsed / len(topics) if topics else 0.0,
+        "usage": usage,
+        "errors": errors
+    }
+
+def print_report(results: list):
+    print(f"\n{'Mode':<8} {'Time (s)':>9} {'s/topic':>8} {'Requests':>9} {'Tokens':>8} {'Errors':>7}")
+    print("-" * 54)
+    for result in results:
+        usage = result["usage"]
+        print(f"{result['mode']:<8} {result['elapsed_seconds']:>9.1f} {result['seconds_per_topic']:>8.1f} "
+              f"{usage.get('requests', 0):>9} {usage.get('total_tokens', 0):>8} {len(result['errors']):>7}")
+        for error in result["errors"]:
+            print(f"   ❌ {error}")
+
+    by_mode = {result["mode"]: result for result in results}
+    if "crew" in by_mode and "direct" in by_mode:
+        crew, direct = by_mode["crew"], by_mode["direct"]
+        if direct["elapsed_seconds"]:
+            print(f"\n⚡ Direct is {crew['elapsed_seconds'] / direct['elapsed_seconds']:.1f}x faster")
+        saved = crew["usage"].get("total_tokens", 0) - direct["usage"].get("total_tokens", 0)
+        print(f"🪙 Tokens saved: {saved}")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the CrewAI workflow against the direct fast path")
+    parser.add_argument("topics", nargs="*", default=["Technology and AI developments"], help="Topics to run")
+    parser.add_argument("--modes", nargs="+", choices=["crew", "direct"], default=["crew", "direct"])
+    parser.add_argument("--no-render", action="store_true", help="Skip video generation in direct mode")
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    print("🐱 AI Cat News Network - Workflow Mode Benchmark")
+    print("=" * 50)
+
+    results = []
+    for mode in args.modes:
+        print(f"\n⏱️  Running {mode} mode on {len(args.topics)} topic(s)...")
+        results.append(benchmark_mode(mode, args.topics, render_video=not args.no_render))
+
+    print_report(results)
+
+    output = args.output or os.path.join(content_manager.base_path, "cache", "benchmarks",
+                                         f"workflow_modes_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results saved: {output}")
+    return 0
+
+if __name__ == "__main__":
+    load_dotenv()
+    sys.exit(main())
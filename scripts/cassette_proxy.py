@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cassette Proxy for AI Cat News Network
+Records the provider calls the app makes (Groq, ElevenLabs, MiniMax, Google) into a
+cassette file, or replays a cassette at recorded or accelerated timing, so runs can
+be repeated exactly, offline and without API costs.
+
+    python scripts/cassette_proxy.py record CASSETTE [--port 8796] [--upstream URL]
+    python scripts/cassette_proxy.py replay CASSETTE [--port 8796] [--time-scale 0] [--strict]
+    python scripts/cassette_proxy.py info CASSETTE
+
+Point the app at the proxy with the printed GROQ_BASE_URL, ELEVENLABS_BASE_URL,
+MINIMAX_BASE_URL and GOOGLE_API_BASE_URL. Recording forwards each call to the
+provider's real API (or to --upstream, e.g. the provider fixture server); API keys
+are passed through but never written to the cassette.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import requests
+
+# Add the parent directory to sys.path so we can import scripts and utils
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.provider_fixture_server import provider_env
+from utils.cassette import Cassette, CassettePlayer, provider_for
+
+UPSTREAMS = {
+    "groq": "https://api.groq.com",
+    "elevenlabs": "https://api.elevenlabs.io",
+    "minimax": "https://api.minimax.chat",
+    "google": "https://generativelanguage.googleapis.com"
+}
+
+# Hop-by-hop and recomputed headers, never forwarded
+_SKIPPED_HEADERS = {"host", "content-length", "connection", "keep-alive", "transfer-encoding", "accept-encoding",
+                    "content-encoding", "proxy-connection", "upgrade"}
+
+class CassetteProxy:
+    """Record or replay state shared by the proxy's handler threads"""
+
+    def __init__(self, cassette: Cassette, mode: str, upstream: Optional[str] = None, time_scale: float = 1.0,
+                 strict: bool = False):
+        self.cassette = cassette
+        self.mode = mode
+        self.upstream = upstream
+        self.time_scale = time_scale
+        self.player = CassettePlayer(cassette, strict) if mode == "replay" else None
+        # One keep-alive pool for every forwarded call
+        self.session = requests.Session() if mode == "record" else None
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def count(self, provider: str, status: int):
+        with self.lock:
+            entry = self.stats.setdefault(provider, {"requests": 0, "failures": 0})
+            entry["requests"] += 1
+            entry["failures"] += status >= 400
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Requests and error responses per provider (same shape as the fixture server's stats)"""
+        with self.lock:
+            return {provider: dict(counts) for provider, counts in self.stats.items()}
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _handle(self):
+        proxy = self.server.proxy
+        path, _, query = self.path.partition("?")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if path == "/stats" and self.command == "GET":
+            stats = dict(proxy.snapshot(), replay=proxy.player.stats if proxy.player else None)
+            return self._reply(200, {"Content-Type": "application/json"}, json.dumps(stats).encode("utf-8"))
+
+        if proxy.mode == "replay":
+            interaction = proxy.player.match(self.command, path, query, body)
+            if interaction is None:
+                proxy.count(provider_for(path), 404)
+                return self._reply(404, {"Content-Type": "application/json"},
+                                   json.dumps({"error": "no recorded interaction for this request"}).encode("utf-8"))
+            if proxy.time_scale:
+                time.sleep(interaction["elapsed_ms"] / 1000 * proxy.time_scale)
+            proxy.count(interaction["provider"], interaction["status"])
+            return self._reply(interaction["status"], interaction["headers"],
+                               proxy.cassette.body(interaction["response"]))
+
+        upstream = proxy.upstream or UPSTREAMS.get(provider_for(path))
+        if upstream is None:
+            return self._reply(502, {"Content-Type": "application/json"},
+                               json.dumps({"error": f"no upstream for {path}"}).encode("utf-8"))
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in _SKIPPED_HEADERS}
+        start = time.time()
+        try:
+            response = proxy.session.request(self.command, upstream.rstrip("/") + self.path, headers=headers,
+                                             data=body, timeout=300, allow_redirects=False)
+        except requests.RequestException as e:
+            return self._reply(502, {"Content-Type": "application/json"},
+                               json.dumps({"error": f"upstream unreachable: {e}"}).encode("utf-8"))
+        elapsed_ms = (time.time() - start) * 1000
+        proxy.cassette.record(self.command, path, query, body, response.status_code, dict(response.headers),
+                              response.content, elapsed_ms)
+        proxy.count(provider_for(path), response.status_code)
+        self._reply(response.status_code,
+                    {name: value for name, value in response.headers.items()
+                     if name.lower() not in _SKIPPED_HEADERS | {"server", "date"}},
+                    response.content)
+
+    def _reply(self, status: int, headers: Dict[str, str], data: bytes):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(cassette: Cassette, mode: str, host: str = "127.0.0.1", port: int = 0,
+                upstream: Optional[str] = None, time_scale: float = 1.0, strict: bool = False) -> ThreadingHTTPServer:
+    """Build a record or replay proxy (port 0 picks a free port; see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), _ProxyHandler)
+    server.daemon_threads = True
+    server.proxy = CassetteProxy(cassette, mode, upstream, time_scale, strict)
+    return server
+
+def print_info(path: str, cassette: Cassette):
+    print(f"📼 {path} ({os.path.getsize(path) / 1024:.0f} KB, recorded {cassette.meta.get('recorded')})")
+    print(f"\n{'Provider':<12} {'Calls':>6} {'Errors':>7} {'Response KB':>12} {'Recorded s':>11}")
+    print("-" * 52)
+    for provider, entry in sorted(cassette.summary().items()):
+        print(f"{provider:<12} {entry['interactions']:>6} {entry['errors']:>7} "
+              f"{entry['response_bytes'] / 1024:>12.0f} {entry['elapsed_ms'] / 1000:>11.1f}")
+    print(f"\n🧩 {len(cassette.blobs)} unique bodies for {len(cassette.interactions)} interactions")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record or replay provider API calls")
+    parser.add_argument("action", choices=["record", "replay", "info"])
+    parser.add_argument("cassette", help="Cassette file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8796)
+    parser.add_argument("--upstream", help="With record: forward every call here instead of the real APIs")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="With replay: multiply recorded latencies by this (0 = no delay)")
+    parser.add_argument("--strict", action="store_true",
+                        help="With replay: only serve exact matches (404 for anything else)")
+    args = parser.parse_args(argv)
+
+    if args.action == "info":
+        print_info(args.cassette, Cassette.load(args.cassette))
+        return 0
+
+    cassette = Cassette.load(args.cassette) if args.action == "replay" else Cassette()
+    server = make_server(cassette, args.action, args.host, args.port, args.upstream, args.time_scale, args.strict)
+    host, port = server.server_address[:2]
+    print("🐱 AI Cat News Network - Cassette Proxy")
+    print("=" * 50)
+    if args.action == "record":
+        print(f"🔴 Recording to {args.cassette} (upstream: {args.upstream or 'live provider APIs'})")
+    else:
+        print(f"▶️  Replaying {len(cassette.interactions)} interactions from {args.cassette} "
+              f"(x{args.time_scale:g} recorded latency{', strict' if args.strict else ''})")
+    print("🔌 Point the app at it with:")
+    for name, value in provider_env(f"http://{host}:{port}").items():
+        print(f"   {name}={value}")
+    # Stopped by Ctrl+C or SIGTERM alike, so a recording is always saved
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Cassette proxy stopped")
+    finally:
+        server.server_close()
+        if args.action == "record":
+            cassette.save(args.cassette)
+            print(f"💾 Saved {len(cassette.interactions)} interactions to {args.cassette}")
+        else:
+            print(f"📊 Matches: {server.proxy.player.stats}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
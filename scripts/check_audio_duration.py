@@ -5,7 +5,6 @@ Checks audio duration and adjusts video generation accordingly
 """
 import os
 import sys
-from mutagen.mp3 import MP3
 
 # Add the parent directory to sys.path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,19 +25,16 @@ def check_audio_duration():
     audio_path = latest_audio[0]["filepath"]
     print(f"📄 Audio file: {os.path.basename(audio_path)}")
     
-    try:
-        # Get audio duration using mutagen
-        audio = MP3(audio_path)
-        duration = audio.info.length
-        
-        print(f"⏱️  Duration: {duration:.1f} seconds")
-        print(f"📊 Size: {os.path.getsize(audio_path) / 1024:.1f} KB")
-        
-        return duration, audio_path
-        
-    except Exception as e:
-        print(f"❌ Error reading audio: {e}")
+    # Duration comes from metadata; files saved before probing are probed once and cached
+    duration = content_manager.get_audio_duration(audio_path)
+    if duration is None:
+        print("❌ Error reading audio: no MPEG audio frames found")
         return None
+    
+    print(f"⏱️  Duration: {duration:.1f} seconds")
+    print(f"📊 Size: {os.path.getsize(audio_path) / 1024:.1f} KB")
+    
+    return duration, audio_path
 
 def suggest_adjustments(duration):
     """Suggest adjustments based on audio duration"""
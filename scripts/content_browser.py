@@ -25,7 +25,7 @@ def show_content_overview():
     print("🐱 AI Cat News Network - Content Browser")
     print("=" * 50)
     
-    content_types = ["newsitems", "scripts", "audio", "video", "ideas"]
+    content_types = ["newsitems", "scripts", "audio", "video", "thumbnails", "ideas"]
     
     for content_type in content_types:
         icon_map = {
@@ -33,6 +33,7 @@ def show_content_overview():
             "scripts": "📝", 
             "audio": "🎤",
             "video": "🎬",
+            "thumbnails": "🖼️",
             "ideas": "💡"
         }
         
@@ -52,7 +53,7 @@ def show_content_overview():
                 print(f"       {modified.strftime('%Y-%m-%d %H:%M:%S')}")
                 
                 # Show file size for media files
-                if content_type in ["audio", "video"]:
+                if content_type in ["audio", "video", "thumbnails"]:
                     try:
                         size_kb = os.path.getsize(file_info["filepath"]) / 1024
                         print(f"       {size_kb:.1f} KB")
@@ -92,7 +93,8 @@ def show_latest_pipeline():
     if not latest_video and latest_audio:
         print("💡 Ready for video generation!")
 
-if __name__ == "__main__":
+def browse():
+    """Show the content overview, the latest pipeline and the directory layout"""
     show_content_overview()
     show_latest_pipeline()
     
@@ -103,3 +105,6 @@ if __name__ == "__main__":
     print(f"   ├── scripts/      # Generated cat news scripts")
     print(f"   ├── audio/        # Voice-over files")
     print(f"   └── video/        # Final video productions")
+
+if __name__ == "__main__":
+    browse()
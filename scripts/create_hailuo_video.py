@@ -11,11 +11,13 @@ import time
 import subprocess
 import shutil
 from pathlib import Path
+from dotenv import load_dotenv
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from config.settings import get_setting
 from utils.content_manager import ContentManager
 
 def setup_wan2gp_environment():
@@ -68,27 +70,17 @@ def generate_hunyuan_video():
         print(f"❌ Error reading script: {e}")
         return False
     
-    # Get audio duration (if possible)
-    try:
-        import librosa
-        audio_duration = librosa.get_duration(path=audio_path)
+    # Get audio duration from metadata (probed from MP3 headers at save time)
+    audio_duration = content_manager.get_audio_duration(audio_path)
+    if audio_duration is not None:
         print(f"🎵 Audio duration: {audio_duration:.1f} seconds")
-    except:
+    else:
         audio_duration = 6.0  # Default duration
         print("⚠️  Could not detect audio duration, using 6s default")
     
-    # Load configuration
-    config_path = project_root / ".env"
-    config_duration = 6
-    config_resolution = "720p"
-    
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            for line in f:
-                if line.startswith('VIDEO_DURATION='):
-                    config_duration = int(line.split('=')[1].strip())
-                elif line.startswith('VIDEO_RESOLUTION='):
-                    config_resolution = line.split('=')[1].strip()
+    # Load configuration (VIDEO_DURATION / VIDEO_RESOLUTION from .env)
+    config_duration = int(get_setting('VIDEO_DURATION', 6))
+    config_resolution = get_setting('VIDEO_RESOLUTION', "720p")
     
     print(f"🎛️  Configuration Settings:")
     print(f"    Duration: {config_duration}s (from .env)")
@@ -190,6 +182,7 @@ Duration: {config_duration} seconds. Style: Professional television broadcast qu
         return False
 
 if __name__ == "__main__":
+    load_dotenv()
     success = generate_hunyuan_video()
     if success:
         print("\n🎉 HunyuanVideo local provider setup completed!")
@@ -5,14 +5,15 @@ Creates ultra-short voice-over optimized for 6-second videos
 """
 import os
 import sys
-import time
 from dotenv import load_dotenv
-from elevenlabs import VoiceSettings, generate, set_api_key
+from elevenlabs import VoiceSettings
 
 # Add the parent directory to sys.path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.content_manager import content_manager
+from tools.voice_generator import voice_generator
+from utils.duration_estimator import duration_estimator
 
 load_dotenv()
 
@@ -47,36 +48,21 @@ def generate_short_voice():
     
     # Read and optimize script for voice
     try:
-        with open(script_path, 'r', encoding='utf-8') as f:
-            full_script = f.read()
-        
-        # Extract only the spoken dialogue (remove stage directions)
-        lines = full_script.split('\n')
-        spoken_text = ""
-        
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines, stage directions, and metadata
-            if (line and 
-                not line.startswith('*') and 
-                not line.startswith('**') and 
-                not line.startswith('---') and 
-                not line.startswith('VOICE') and
-                not line.startswith('VIDEO') and
-                not line.startswith('CAT') and
-                not line.startswith('#')):
-                # Remove quotes if present
-                line = line.strip('"').strip("'")
-                if line:
-                    spoken_text += line + " "
-        
-        spoken_text = spoken_text.strip()
+        # Extract only the spoken dialogue from the parsed script (no stage directions or footer)
+        spoken_text = content_manager.load_parsed_script(script_path)["spoken_text"]
         print(f"📝 Extracted spoken text: \"{spoken_text}\"")
-        print(f"📊 Character count: {len(spoken_text)} (optimized for 5-6 seconds)")
         
-        if len(spoken_text) > 150:
-            print("⚠️  Text might be too long for 6-second video. Trimming...")
-            spoken_text = spoken_text[:150] + "..."
+        # Predict the spoken length before paying for synthesis and trim to fit 6 seconds
+        duration_estimator.calibrate_from_metadata(content_manager)
+        model_id = "eleven_multilingual_v2"
+        estimated = duration_estimator.estimate(spoken_text, voice_id, model_id)
+        print(f"📊 Character count: {len(spoken_text)} (estimated {estimated:.1f}s)")
+        
+        if estimated > 6:
+            print("⚠️  Text is predicted to run past 6 seconds. Trimming...")
+            spoken_text = duration_estimator.fit_to_duration(spoken_text, 6, voice_id, model_id)
+            print(f"✂️  Trimmed to {len(spoken_text)} chars "
+                  f"(estimated {duration_estimator.estimate(spoken_text, voice_id, model_id):.1f}s)")
         
     except Exception as e:
         print(f"❌ Failed to read script: {e}")
@@ -86,10 +72,6 @@ def generate_short_voice():
     try:
         print("🔄 Generating ultra-short voice-over...")
         
-        # Initialize ElevenLabs client
-        from elevenlabs import generate, set_api_key
-        set_api_key(elevenlabs_api_key)
-        
         # Voice settings optimized for quick delivery
         voice_settings = VoiceSettings(
             stability=0.7,
@@ -98,58 +80,44 @@ def generate_short_voice():
             use_speaker_boost=True
         )
         
-        # Generate audio
-        audio = generate(
-            text=spoken_text,
-            voice=voice_id,
-            voice_settings=voice_settings,
-            model="eleven_multilingual_v2"
-        )
-        
-        # Save audio
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        script_base = os.path.splitext(os.path.basename(script_path))[0]
-        audio_filename = f"audio_{script_base}_{timestamp}.mp3"
-        audio_path = f"content/audio/{audio_filename}"
+        # Stock lines like the sign-off repeat across runs - serve them from the TTS cache
+        if voice_generator.is_cached(spoken_text, voice_id, model_id, voice_settings):
+            print("♻️  Served from TTS cache (no ElevenLabs characters used)")
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+        audio = voice_generator.synthesize_to_bytes(
+            spoken_text,
+            voice_id=voice_id,
+            model_id=model_id,
+            voice_settings=voice_settings
+        )
         
-        # Save audio file
-        with open(audio_path, 'wb') as f:
-            f.write(audio)
+        # Save audio and metadata through the content manager
+        audio_path = content_manager.save_audio(
+            audio_data=audio,
+            script_filepath=script_path,
+            voice_settings={
+                "voice_id": voice_id,
+                "model_id": model_id,
+                "stability": 0.7,
+                "similarity_boost": 0.8,
+                "style": 0.3,
+                "text_length": len(spoken_text),
+                "spoken_text": spoken_text,
+                "target_duration": "5-6 seconds",
+                "optimized_for": "6-second video"
+            },
+            spoken_text=spoken_text
+        )
+        audio_filename = os.path.basename(audio_path)
         
         # Get file size
-        file_size = os.path.getsize(audio_path)
-        file_size_kb = file_size / 1024
+        file_size_kb = len(audio) / 1024
         
         print(f"✅ Ultra-short voice-over created: {audio_filename}")
         print(f"📊 Audio size: {file_size_kb:.1f} KB")
         print(f"📁 Saved in: content/audio/")
         print(f"🎯 Optimized for: 6-second video generation")
-        
-        # Save metadata
-        metadata = {
-            "timestamp": timestamp,
-            "script_path": script_path,
-            "audio_path": audio_path,
-            "spoken_text": spoken_text,
-            "character_count": len(spoken_text),
-            "target_duration": "5-6 seconds",
-            "optimized_for": "6-second video",
-            "voice_settings": {
-                "stability": 0.7,
-                "similarity_boost": 0.8,
-                "style": 0.3
-            }
-        }
-        
-        metadata_path = f"content/audio/{script_base}_{timestamp}_metadata.json"
-        import json
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-        
-        print(f"📄 Metadata saved: {os.path.basename(metadata_path)}")
+        print(f"📄 Metadata saved: {os.path.basename(content_manager.get_metadata_path(audio_path))}")
         print(f"🎬 Ready for 6-second video generation!")
         
         return True
@@ -5,27 +5,24 @@ Generate professional videos using Google's Veo 2 API via Vertex AI
 """
 
 import os
+import sys
 import time
 import json
 import requests
 from pathlib import Path
 from datetime import datetime
 import subprocess
+from dotenv import dotenv_values
+
+# Add the parent directory to sys.path so we can import utils
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.content_manager import content_manager
+from utils.script_parser import story_summary
 
 def load_env_config():
     """Load configuration from .env file"""
-    config = {}
-    env_path = Path(".env")
-    
-    if env_path.exists():
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    config[key.strip()] = value.strip()
-    
-    return config
+    return dict(dotenv_values(Path(".env")))
 
 def get_access_token():
     """Get Google Cloud access token using gcloud CLI"""
@@ -184,16 +181,16 @@ def create_veo3_cat_news():
     script_path = get_latest_script()
     if not script_path:
         print("❌ No script found. Creating default content...")
-        script_content = "Breaking Cat News: Local tabby discovers ultimate napping spot"
+        news_story = "Breaking Cat News: Local tabby discovers ultimate napping spot"
     else:
-        with open(script_path, 'r', encoding='utf-8') as f:
-            script_content = f.read()
+        # Use the parsed script so the prompt gets the story, not headers and stage directions
+        news_story = story_summary(content_manager.load_parsed_script(str(script_path)), max_chars=200)
         print(f"📝 Using script: {script_path.name}")
     
     # Create professional cat news prompt for Veo 3.0
     video_prompt = f"""Professional orange tabby cat news anchor wearing a navy blue business suit and red tie, sitting at a modern television news desk in a high-tech broadcast studio. The cat has intelligent amber eyes, perfectly groomed fur, and an authoritative yet friendly expression. Behind the cat are multiple large HD screens displaying "CAT NEWS NETWORK" in bold letters with breaking news graphics. The studio has warm, professional lighting with subtle blue and red accent colors. Modern broadcast equipment and cameras are visible in the background. The cat occasionally gestures with paws while delivering the news. Cinematic quality, broadcast television production value, professional news anchor presentation.
 
-News Story: {script_content[:200]}"""
+News Story: {news_story}"""
     
     print(f"🎯 Generated professional prompt for Veo 3.0")
     print(f"📺 Theme: Professional cat news broadcast")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Feed Fixture Server for AI Cat News Network
+Serves local RSS and Atom feeds with ETag / Last-Modified validators so news
+ingestion can be exercised without touching real publishers.
+
+    python scripts/feed_fixture_server.py --port 8799
+    GET /rss.xml  /atom.xml   feeds (304 when the validators match)
+    GET /publish             adds a new story to both feeds
+    GET /stats               request counts per status
+"""
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+SEED_STORIES = [
+    "Scientists discover new exoplanet in habitable zone",
+    "City opens its first fully solar-powered library",
+    "Researchers train robots to sort recycling by touch",
+]
+
+class FixtureFeeds:
+    """In-memory story list rendered as RSS and Atom"""
+
+    def __init__(self, stories: Optional[List[str]] = None):
+        self.lock = threading.Lock()
+        self.stories = []
+        self.stats = {"200": 0, "304": 0}
+        for title in stories or SEED_STORIES:
+            self.publish(title)
+
+    def publish(self, title: str):
+        with self.lock:
+            self.stories.insert(0, {"id": f"fixture-{len(self.stories) + 1}", "title": title,
+                                    "summary": f"Fixture story: {title}", "published": time.time()})
+            self.modified = self.stories[0]["published"]
+
+    def render(self, kind: str) -> bytes:
+        with self.lock:
+            stories = list(self.stories)
+        if kind == "atom":
+            entries = "".join(
+                f"<entry><id>{s['id']}</id><title>{escape(s['title'])}</title>"
+                f"<link rel=\"alternate\" href=\"http://fixture.local/{s['id']}\"/>"
+                f"<summary>{escape(s['summary'])}</summary>"
+                f"<updated>{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(s['published']))}</updated></entry>"
+                for s in stories)
+            return (f"<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+                    f"<feed xmlns=\"http://www.w3.org/2005/Atom\"><title>Fixture Atom</title>{entries}</feed>").encode("utf-8")
+        items = "".join(
+            f"<item><guid>{s['id']}</guid><title>{escape(s['title'])}</title>"
+            f"<link>http://fixture.local/{s['id']}</link><description>{escape(s['summary'])}</description>"
+            f"<pubDate>{formatdate(s['published'], usegmt=True)}</pubDate></item>"
+            for s in stories)
+        return (f"<?xml version=\"1.0\" encoding=\"utf-8\"?>"
+                f"<rss version=\"2.0\"><channel><title>Fixture RSS</title>{items}</channel></rss>").encode("utf-8")
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        feeds = self.server.feeds
+        if self.path == "/publish":
+            feeds.publish(f"Breaking fixture story #{len(feeds.stories) + 1}")
+            return self._reply(200, b"published\n", "text/plain")
+        if self.path == "/stats":
+            return self._reply(200, json.dumps(feeds.stats).encode("utf-8"), "application/json")
+        if self.path not in ("/rss.xml", "/atom.xml"):
+            return self._reply(404, b"not found\n", "text/plain")
+
+        body = feeds.render("atom" if self.path == "/atom.xml" else "rss")
+        etag = f"\"{hashlib.sha1(body).hexdigest()[:16]}\""
+        last_modified = formatdate(int(feeds.modified), usegmt=True)
+
+        if self._not_modified(etag, feeds.modified):
+            feeds.stats["304"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return
+        feeds.stats["200"] += 1
+        self._reply(200, body, "application/xml", {"ETag": etag, "Last-Modified": last_modified})
+
+    def _not_modified(self, etag: str, modified: float) -> bool:
+        # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _reply(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host: str = "127.0.0.1", port: int = 0, stories: Optional[List[str]] = None) -> ThreadingHTTPServer:
+    """Build a fixture server (port 0 picks a free port; see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), _FixtureHandler)
+    server.feeds = FixtureFeeds(stories)
+    return server
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve local RSS/Atom fixture feeds")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    host, port = server.server_address[:2]
+    print("🐱 AI Cat News Network - Feed Fixture Server")
+    print("=" * 50)
+    print(f"📡 RSS:  http://{host}:{port}/rss.xml")
+    print(f"📡 Atom: http://{host}:{port}/atom.xml")
+    print(f"➕ New story: http://{host}:{port}/publish")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fixture server stopped")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Provider Fixture Server for AI Cat News Network
+Local stand-ins for the Groq, ElevenLabs, MiniMax and Google (Gemini/Veo) APIs with
+configurable latency, jitter and failure rates, so the whole pipeline can be run
+and benchmarked offline through the real SDK clients.
+
+    python scripts/provider_fixture_server.py --port 8797 [--profile realistic] [--time-scale 0.1]
+    POST /openai/v1/chat/completions                 Groq chat completions (text or JSON mode)
+    POST /v1/text-to-speech/<voice_id>               ElevenLabs TTS (MP3 frames sized to the text)
+    POST /v1/video_generation                        MiniMax task submission
+    GET  /v1/video_generation[/status]/<task_id>     MiniMax task status
+    GET  /files/<task_id>.mp4                        A finished render's video file
+    POST /v1beta/models/<model>:generateContent      Gemini / Veo 3 generation
+    GET  /stats                                      requests, injected failures and tokens per provider
+
+Point the app at it with the environment printed on startup (GROQ_BASE_URL,
+ELEVENLABS_BASE_URL, MINIMAX_BASE_URL, GOOGLE_API_BASE_URL).
+"""
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Per provider: latency_ms (median), jitter_ms (standard deviation), failure_rate and the
+# statuses failures are answered with. MiniMax "render_ms" is how long a task stays processing.
+PROFILES = {
+    "instant": {
+        "groq": {"latency_ms": 0, "jitter_ms": 0, "failure_rate": 0.0},
+        "elevenlabs": {"latency_ms": 0, "jitter_ms": 0, "failure_rate": 0.0},
+        "minimax": {"latency_ms": 0, "jitter_ms": 0, "failure_rate": 0.0, "render_ms": 0, "render_jitter_ms": 0},
+        "google": {"latency_ms": 0, "jitter_ms": 0, "failure_rate": 0.0}
+    },
+    "realistic": {
+        "groq": {"latency_ms": 700, "jitter_ms": 250, "failure_rate": 0.02, "failure_statuses": [429, 503]},
+        "elevenlabs": {"latency_ms": 450, "jitter_ms": 150, "failure_rate": 0.02, "failure_statuses": [429, 500]},
+        "minimax": {"latency_ms": 300, "jitter_ms": 100, "failure_rate": 0.01, "failure_statuses": [500],
+                    "render_ms": 45000, "render_jitter_ms": 15000},
+        "google": {"latency_ms": 3000, "jitter_ms": 1000, "failure_rate": 0.02, "failure_statuses": [429, 503]}
+    },
+    "flaky": {
+        "groq": {"latency_ms": 900, "jitter_ms": 600, "failure_rate": 0.15, "failure_statuses": [429, 500, 503]},
+        "elevenlabs": {"latency_ms": 600, "jitter_ms": 400, "failure_rate": 0.15, "failure_statuses": [429, 500]},
+        "minimax": {"latency_ms": 500, "jitter_ms": 300, "failure_rate": 0.1, "failure_statuses": [500, 502],
+                    "render_ms": 60000, "render_jitter_ms": 30000},
+        "google": {"latency_ms": 4000, "jitter_ms": 2000, "failure_rate": 0.15, "failure_statuses": [429, 503]}
+    }
+}
+
+PROVIDERS = ("groq", "elevenlabs", "minimax", "google")
+
+# One MPEG-1 Layer III frame (128 kbps, 44.1 kHz, 26 ms) of silence
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + b"\x00" * 413
+MP3_FRAME_SECONDS = 1152 / 44100
+SPOKEN_CHARS_PER_SECOND = 15
+
+_TOPIC_PATTERNS = [re.compile(r"news story: (.+)"), re.compile(r"content idea:\s*\n\s*(.+)"),
+                   re.compile(r"Story: (.+)"), re.compile(r"ideas .*? about (.+?)\.")]
+
+CAT_NAMES = ["Whiskers", "Mittens", "Sir Pounce", "Duchess Fluff", "Captain Purr"]
+CAT_ACTIVITIES = ["nap in a sunbeam", "knock a pen off the desk", "inspect an empty box", "demand second breakfast"]
+
+def _topic(prompt: str) -> str:
+    for pattern in _TOPIC_PATTERNS:
+        match = pattern.search(prompt)
+        if match:
+            return match.group(1).strip().strip('"')[:120]
+    return "an unusual day in the human world"
+
+def fake_script(prompt: str, rng: random.Random) -> str:
+    """A cat news script in the format write_cat_news_script asks for, varied per call"""
+    topic = _topic(prompt)
+    name = rng.choice(CAT_NAMES)
+    nonce = rng.randrange(10000)
+    return f"""**INTRO** (3-4 seconds)
+(Serious news music. Professional cat anchor at desk)
+"Good evening, I'm {name} with breaking human news, bulletin {nonce}."
+
+**MAIN** (12-14 seconds)
+[VISUAL: Newsroom screen showing {topic}]
+"Today's story: {topic}. While we cats have been napping, humans are apparently very busy."
+"Experts say the humans will need at least {rng.randint(2, 9)} meetings to discuss it."
+[VISUAL: Cat anchor raises one eyebrow]
+"Frankly, a cardboard box would have solved this by lunchtime."
+
+**OUTRO** (3-4 seconds)
+"And that's why cats remain superior. Now excuse me while I {rng.choice(CAT_ACTIVITIES)}."
+"""
+
+def fake_publishing(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    """A publishing-package response for every platform named in the prompt"""
+    topic = _topic(prompt)
+    platforms = re.findall(r'^- "(\w+)":', prompt, re.M) or ["youtube_shorts", "instagram_reels"]
+    words = [word for word in re.findall(r"[A-Za-z]{4,}", topic)][:4]
+    tags = [f"#{word.capitalize()}" for word in words] + ["#CatNews", "#BreakingMews", "#CatsOfInstagram"]
+    return {"platforms": {
+        platform: {
+            "title": f"Cat anchor reacts: {topic}"[:90],
+            "caption": f"The newsroom cats weigh in on {topic}. Would your cat approve? 🐾",
+            "hashtags": tags + [f"#Story{rng.randrange(1000)}"]
+        } for platform in platforms
+    }}
+
+class FixtureProviders:
+    """Shared state: per-provider profiles, a seeded RNG and request counters"""
+
+    def __init__(self, profile: Optional[Dict[str, Dict[str, Any]]] = None, time_scale: float = 1.0, seed: int = 0):
+        self.lock = threading.Lock()
+        self.profile = profile or PROFILES["instant"]
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.stats = {provider: {"requests": 0, "failures": 0, "tokens": 0, "characters": 0, "renders": 0}
+                      for provider in PROVIDERS}
+
+    def _draw(self, mean_ms: float, jitter_ms: float) -> float:
+        """Seconds for one latency sample: normal around the mean, never negative, then time-scaled"""
+        with self.lock:
+            sample = self.rng.gauss(mean_ms, jitter_ms) if jitter_ms else mean_ms
+        return max(0.0, sample) / 1000 * self.time_scale
+
+    def call(self, provider: str) -> Optional[int]:
+        """Count a request, sleep its simulated latency and return a failure status to answer with, if any"""
+        config = self.profile.get(provider, {})
+        time.sleep(self._draw(config.get("latency_ms", 0), config.get("jitter_ms", 0)))
+        with self.lock:
+            self.stats[provider]["requests"] += 1
+            if self.rng.random() < config.get("failure_rate", 0.0):
+                self.stats[provider]["failures"] += 1
+                return self.rng.choice(config.get("failure_statuses") or [503])
+        return None
+
+    def count(self, provider: str, **amounts):
+        with self.lock:
+            for key, value in amounts.items():
+                self.stats[provider][key] += value
+
+    def rng_for(self, text: str) -> random.Random:
+        """A per-request RNG, so responses vary between calls but replay with the same seed"""
+        with self.lock:
+            salt = self.rng.random()
+        return random.Random(f"{salt}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}")
+
+    def submit_render(self) -> str:
+        config = self.profile.get("minimax", {})
+        task_id = uuid.uuid4().hex
+        ready_at = time.time() + self._draw(config.get("render_ms", 0), config.get("render_jitter_ms", 0))
+        with self.lock:
+            self.tasks[task_id] = {"ready_at": ready_at}
+            self.stats["minimax"]["renders"] += 1
+        return task_id
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {provider: dict(counts) for provider, counts in self.stats.items()}
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        providers = self.server.providers
+        path = self.path.split("?")[0]
+        if path == "/stats":
+            return self._reply(200, providers.snapshot())
+        match = re.fullmatch(r"/files/(\w+)\.mp4", path)
+        if match:
+            # A finished render's file (a stand-in, not a playable MP4)
+            video = b"\x00\x00\x00\x18ftypmp42" + match.group(1).encode("ascii") * 64
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(len(video)))
+            self.end_headers()
+            self.wfile.write(video)
+            return
+        match = re.fullmatch(r"/v1/video_generation/(?:status/)?(\w+)", path)
+        if match:
+            failure = providers.call("minimax")
+            if failure:
+                return self._reply(failure, {"error": "injected failure"})
+            task = providers.tasks.get(match.group(1))
+            if task is None:
+                return self._reply(404, {"error": "unknown task"})
+            if time.time() < task["ready_at"]:
+                return self._reply(200, {"task_id": match.group(1), "status": "processing"})
+            host = "http://%s:%d" % self.server.server_address[:2]
+            return self._reply(200, {"task_id": match.group(1), "status": "completed", "duration": 6,
+                                     "video_url": f"{host}/files/{match.group(1)}.mp4"})
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        providers = self.server.providers
+        path = self.path.split("?")[0]
+        body = self._read_json()
+
+        if path == "/openai/v1/chat/completions":
+            return self._chat_completion(body)
+        if path.startswith("/v1/text-to-speech/"):
+            return self._text_to_speech(body)
+        if path == "/v1/video_generation":
+            failure = providers.call("minimax")
+            if failure:
+                return self._reply(failure, {"error": "injected failure"})
+            return self._reply(200, {"task_id": providers.submit_render(), "base_resp": {"status_code": 0}})
+        if path.startswith("/v1beta/models/") and path.endswith(":generateContent"):
+            return self._generate_content(body)
+        self._reply(404, {"error": "not found"})
+
+    def _chat_completion(self, body: dict):
+        providers = self.server.providers
+        failure = providers.call("groq")
+        if failure:
+            return self._reply(failure, {"error": {"message": "injected failure", "type": "fixture"}},
+                               {"Retry-After": "0"} if failure == 429 else None)
+        prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+        rng = providers.rng_for(prompt)
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps(fake_publishing(prompt, rng))
+        else:
+            content = fake_script(prompt, rng)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+        providers.count("groq", tokens=prompt_tokens + completion_tokens)
+        self._reply(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fixture"),
+            "choices": [{"index": 0, "finish_reason": "stop", "logprobs": None,
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens}
+        })
+
+    def _text_to_speech(self, body: dict):
+        providers = self.server.providers
+        failure = providers.call("elevenlabs")
+        if failure:
+            return self._reply(failure, {"detail": {"status": "injected_failure"}})
+        text = str(body.get("text", ""))
+        providers.count("elevenlabs", characters=len(text))
+        frames = max(1, round(len(text) / SPOKEN_CHARS_PER_SECOND / MP3_FRAME_SECONDS))
+        audio = MP3_FRAME * frames
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(audio)))
+        self.end_headers()
+        self.wfile.write(audio)
+
+    def _generate_content(self, body: dict):
+        providers = self.server.providers
+        failure = providers.call("google")
+        if failure:
+            return self._reply(failure, {"error": {"code": failure, "message": "injected failure",
+                                                   "status": "UNAVAILABLE"}})
+        prompt = " ".join(part.get("text", "") for content in body.get("contents", [])
+                          for part in content.get("parts", []))
+        text = f"Generated a vertical cat news video for: {prompt.strip()[:200]}"
+        providers.count("google", tokens=(len(prompt) + len(text)) // 4)
+        self._reply(200, {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                            "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4,
+                              "totalTokenCount": (len(prompt) + len(text)) // 4}
+        })
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _reply(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host: str = "127.0.0.1", port: int = 0, profile: str = "instant", time_scale: float = 1.0,
+                seed: int = 0) -> ThreadingHTTPServer:
+    """Build a fixture server (port 0 picks a free port; see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), _FixtureHandler)
+    server.daemon_threads = True
+    server.providers = FixtureProviders(PROFILES[profile], time_scale, seed)
+    return server
+
+def provider_env(base_url: str) -> Dict[str, str]:
+    """Environment that points every provider client at a fixture server"""
+    return {
+        "GROQ_BASE_URL": base_url,
+        "ELEVENLABS_BASE_URL": base_url,
+        "MINIMAX_BASE_URL": base_url,
+        "GOOGLE_API_BASE_URL": base_url
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve local stand-ins for the AI provider APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8797)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply every simulated latency by this")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.profile, args.time_scale, args.seed)
+    host, port = server.server_address[:2]
+    print("🐱 AI Cat News Network - Provider Fixture Server")
+    print("=" * 50)
+    print(f"🎛️  Profile: {args.profile} (time scale {args.time_scale})")
+    print("🔌 Point the app at it with:")
+    for name, value in provider_env(f"http://{host}:{port}").items():
+        print(f"   {name}={value}")
+    print(f"📊 Stats: http://{host}:{port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fixture server stopped")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
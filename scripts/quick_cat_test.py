@@ -1,24 +1,26 @@
 #!/usr/bin/env python3
+"""
+Cat News Script Generator for AI Cat News Network
+Picks a real news story and writes a cat news script about it
+"""
 import os
 import sys
+import random
+from typing import Optional
 from dotenv import load_dotenv
 
 # Add the parent directory to sys.path so we can import config and utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.ai_provider import ai_provider
+from config.ai_provider import write_cat_news_script
 from utils.content_manager import content_manager
-
-load_dotenv()
-
-# Quick test
-print("🐱 Quick Cat News Test - Organized Content Structure")
-print("Creating trending cat news video...")
+from utils.cost_ledger import BudgetExceeded
+from utils.dedup_index import get_dedup_index, fresh_topics, story_text
+from tools.news_ranker import rank_pending_news
 
 # Real news topics that cats would report on
-real_news_topics = [
+REAL_NEWS_TOPICS = [
     "Dozens of corgis compete for racing and costume titles in Lithuania",
-    "Dozens of corgis compete for racing and costume titles in Lithuania",  # Adding twice for higher chance
     "Scientists discover new species of deep-sea fish with glowing fins",
     "Town's annual pumpkin festival breaks attendance records with 50,000 visitors",
     "Researchers develop AI that can predict weather patterns 30 days in advance",
@@ -30,68 +32,87 @@ real_news_topics = [
     "Hotel offers guests chance to sleep in transparent pods under northern lights"
 ]
 
-import random
-topic = random.choice(real_news_topics)
-print(f"📰 Real News Topic: {topic}")
-
-# Save the news item
-news_item_path = content_manager.save_news_item(
-    topic=topic,
-    source="real_news_curated",
-    metadata={"selected_from": len(real_news_topics), "script_type": "cat_news"}
-)
-print(f"📄 News item saved: {os.path.basename(news_item_path)}")
-
-# Generate script
-script_prompt = f"""
-You are a professional cat news anchor reporting REAL human news but from a feline perspective. 
-
-Create a hilarious 20-second cat news script about this REAL news story: {topic}
-
-Requirements:
-- Report the actual human news accurately
-- Add cat commentary, reactions, and puns throughout
-- Show cats are either jealous, confused, or dismissive of human activities
-- Include typical cat behaviors and attitudes
-
-Format:
-**INTRO** (3-4 seconds)
-(Serious news music. Professional cat anchor at desk)
-"Good evening, I'm [Cat Name] with breaking human news..."
-
-**MAIN** (12-14 seconds)  
-Report the actual story but with cat reactions like:
-- "While we cats have been [doing superior cat thing], humans are apparently..."
-- Include cat puns and superior attitude
-- Show bewilderment at human behavior
-
-**OUTRO** (3-4 seconds)
-Cat signs off with typical dismissive cat behavior
-"And that's why cats remain superior. Now excuse me while I [cat activity]."
-
-Keep it under 100 words total. Make it viral-worthy with cat humor!
-"""
-
-script = ai_provider.generate_content(script_prompt, max_tokens=300, temperature=0.8)
-print(f"📝 Script generated:")
-print("-" * 40)
-print(script)
-print("-" * 40)
-
-# Save script using content manager
-script_path = content_manager.save_script(
-    content=f"Topic: {topic}\n\n{script}",
-    script_type="cat_news_real"
-)
-print(f"✅ Script saved: {os.path.basename(script_path)}")
-
-# Extract news item ID from the path for linking
-news_item_id = os.path.basename(news_item_path).replace('.json', '')
-print(f"🔗 Linked to news item: {news_item_id}")
-
-print("🎬 Ready for voice generation!")
-print(f"📁 Files organized in content/ structure:")
-print(f"   📰 News: content/newsitems/")
-print(f"   📝 Scripts: content/scripts/")
-print(f"   🎤 Audio: content/audio/ (ready for voice generation)")
-print(f"   🎬 Video: content/video/ (ready for video generation)")
+def create_cat_news_script(topic: Optional[str] = None, from_feeds: bool = False) -> Optional[str]:
+    """
+    Pick (or take) a real news topic, write the cat news script and save both; returns the script path.
+
+    With from_feeds, the best-ranked pending story saved by feed ingestion is used
+    (falling back to the curated list when none is pending). Stories that are
+    near-duplicates of one we already scripted are skipped. Returns None when
+    the script could not be generated (or today's Groq budget is spent); the
+    news item then stays pending.
+    """
+    print("🐱 Quick Cat News Test - Organized Content Structure")
+    print("Creating trending cat news video...")
+    
+    dedup_index = get_dedup_index()
+    feed_item = None
+    if from_feeds and not topic:
+        for news_item in rank_pending_news(content_manager):
+            text = story_text(news_item["topic"], news_item.get("metadata", {}).get("summary", ""))
+            duplicate = dedup_index.find_duplicate(text, kinds=("script",))
+            if duplicate is None:
+                feed_item = news_item
+                break
+            content_manager.set_news_item_status(news_item["filepath"], "duplicate", duplicate_of=duplicate["ref"])
+            print(f"⏭️  Already covered: {news_item['topic']}")
+    
+    if feed_item:
+        news_item_path = feed_item["filepath"]
+        topic = feed_item["topic"]
+        summary = feed_item.get("metadata", {}).get("summary", "")
+        print(f"📰 Real News Topic: {topic} ({feed_item['source']})")
+        print(f"📄 Using ingested news item: {os.path.basename(news_item_path)}")
+    else:
+        topic = topic or random.choice(fresh_topics(REAL_NEWS_TOPICS, dedup_index))
+        summary = ""
+        print(f"📰 Real News Topic: {topic}")
+        
+        # Save the news item
+        news_item_path = content_manager.save_news_item(
+            topic=topic,
+            source="real_news_curated",
+            metadata={"selected_from": len(REAL_NEWS_TOPICS), "script_type": "cat_news"}
+        )
+        print(f"📄 News item saved: {os.path.basename(news_item_path)}")
+    
+    # Extract news item ID from the path for linking
+    news_item_id = os.path.basename(news_item_path).replace('.json', '')
+    
+    # Generate script
+    try:
+        script = write_cat_news_script(topic)
+    except BudgetExceeded as e:
+        print(f"💸 {e}")
+        return None
+    if script.startswith("Error:"):
+        # Nothing is saved, so the story is neither marked scripted nor counted as covered
+        print(f"❌ {script}")
+        return None
+    print(f"📝 Script generated:")
+    print("-" * 40)
+    print(script)
+    print("-" * 40)
+    
+    # Save script using content manager
+    script_path = content_manager.save_script(
+        content=f"Topic: {topic}\n\n{script}",
+        news_item_id=news_item_id,
+        script_type="cat_news_real"
+    )
+    content_manager.set_news_item_status(news_item_path, "scripted", script=os.path.basename(script_path))
+    dedup_index.add(story_text(topic, summary), "script", script_path)
+    print(f"✅ Script saved: {os.path.basename(script_path)}")
+    print(f"🔗 Linked to news item: {news_item_id}")
+    
+    print("🎬 Ready for voice generation!")
+    print(f"📁 Files organized in content/ structure:")
+    print(f"   📰 News: content/newsitems/")
+    print(f"   📝 Scripts: content/scripts/")
+    print(f"   🎤 Audio: content/audio/ (ready for voice generation)")
+    print(f"   🎬 Video: content/video/ (ready for video generation)")
+    return script_path
+
+if __name__ == "__main__":
+    load_dotenv()
+    create_cat_news_script()
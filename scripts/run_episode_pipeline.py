@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Episode Pipeline Runner for AI Cat News Network
+Runs news → script → voice → segment renders → package as one overlapping pipeline
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+# Add the parent directory to sys.path so we can import workflows and utils
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.content_manager import content_manager
+from workflows.episode_pipeline import EpisodePipeline
+
+def latest_news_topics(limit: int) -> list:
+    """Fall back to the topics of the most recent saved news items"""
+    topics = []
+    for item in content_manager.get_latest_files("newsitems", limit=limit):
+        try:
+            with open(item["filepath"], 'r', encoding='utf-8') as f:
+                topics.append(json.load(f)["topic"])
+        except (OSError, ValueError, KeyError):
+            continue
+    return topics
+
+def run_pipeline(topics: list, force: bool = False, news_items: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+    """Run the episode pipeline for each topic and print per-episode timings (news_items: see run_batch)"""
+    print("🐱 AI Cat News Network - Episode Pipeline")
+    print("=" * 50)
+
+    if not topics:
+        print("❌ No topics given and no saved news items found")
+        return False
+
+    pipeline = EpisodePipeline()
+    all_ok = True
+
+    for summary in pipeline.run_batch(topics, force=force, news_items=news_items):
+        icon = "✅" if summary["status"] == "success" else "❌"
+        print(f"\n{icon} {summary['run_id']} ({summary['elapsed_seconds']:.1f}s)")
+        print(f"   ⛓️  Critical path: {' → '.join(summary['critical_path'])}")
+        for name, timing in summary["timings"].items():
+            print(f"   ⏱️  {name}: {timing['duration']:.1f}s")
+        for name, error in summary["errors"].items():
+            print(f"   ❌ {name}: {error}")
+        if summary["reused"]:
+            print(f"   ♻️  Reused: {', '.join(summary['reused'])}")
+        if summary["skipped"]:
+            print(f"   ⏭️  Skipped: {', '.join(summary['skipped'])}")
+        if "package" in summary["results"]:
+            print(f"   📦 Package: {summary['results']['package']['package_id']}")
+        all_ok = all_ok and summary["status"] == "success"
+
+    return all_ok
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the full episode pipeline")
+    parser.add_argument("topics", nargs="*", help="News topics (defaults to the latest saved news items)")
+    parser.add_argument("--latest", type=int, default=1, help="How many saved news items to use without topics")
+    parser.add_argument("--force", action="store_true", help="Rebuild every stage even if its inputs are unchanged")
+    args = parser.parse_args(argv)
+    # Pipeline runs record their spans (for `catnews trace report`) unless CATNEWS_TRACE=0
+    os.environ.setdefault("CATNEWS_TRACE", "1")
+
+    success = run_pipeline(args.topics or latest_news_topics(args.latest), force=args.force)
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    load_dotenv()
+    sys.exit(main())
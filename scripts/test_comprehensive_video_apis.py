@@ -4,9 +4,11 @@ Comprehensive Google Video API Test - AI Cat News Network
 Test multiple Google APIs for video generation capabilities
 """
 
+import os
 import requests
 import subprocess
 import json
+from dotenv import load_dotenv
 
 def test_video_apis():
     """Test various Google APIs for video generation"""
@@ -15,15 +17,8 @@ def test_video_apis():
     print("=" * 50)
     
     # Read API key
-    api_key = None
-    try:
-        with open('.env', 'r') as f:
-            for line in f:
-                if line.startswith('GOOGLE_API_KEY='):
-                    api_key = line.split('=', 1)[1].strip()
-                    break
-    except:
-        pass
+    load_dotenv()
+    api_key = os.getenv('GOOGLE_API_KEY')
     
     if not api_key:
         print("❌ No GOOGLE_API_KEY found")
@@ -4,9 +4,11 @@ Simple Google AI API Model Test - AI Cat News Network
 Test what video models are available through Google AI API
 """
 
+import os
 import requests
 import subprocess
 import json
+from dotenv import load_dotenv
 
 def test_google_ai_api():
     """Test Google AI API for available video models"""
@@ -15,20 +17,10 @@ def test_google_ai_api():
     print("=" * 50)
     
     # Read API key from .env
-    api_key = None
-    try:
-        with open('.env', 'r') as f:
-            for line in f:
-                if line.startswith('GOOGLE_API_KEY='):
-                    api_key = line.split('=', 1)[1].strip()
-                    break
-        
-        if not api_key:
-            print("❌ No GOOGLE_API_KEY found in .env")
-            return
-            
-    except Exception as e:
-        print(f"❌ Error reading .env: {e}")
+    load_dotenv()
+    api_key = os.getenv('GOOGLE_API_KEY')
+    if not api_key:
+        print("❌ No GOOGLE_API_KEY found in .env")
         return
     
     print(f"✅ API Key found: {api_key[:20]}...")
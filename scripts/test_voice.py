@@ -5,125 +5,108 @@ Creates professional voice-overs using ElevenLabs API from organized content
 """
 import os
 import sys
+from typing import Optional
 from dotenv import load_dotenv
 
 # Add the parent directory to sys.path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.content_manager import content_manager
+from utils.duration_estimator import duration_estimator
 
-load_dotenv()
-
-print("🎤 ElevenLabs Voice Generation - Professional Cat News")
-print("=" * 50)
-print(f"🔑 API Key loaded: {'✅' if os.getenv('ELEVENLABS_API_KEY') else '❌'}")
-
-try:
-    from elevenlabs import ElevenLabs
-    
-    # Initialize ElevenLabs client
-    client = ElevenLabs(api_key=os.getenv('ELEVENLABS_API_KEY'))
-    
-    # Get the latest script from our organized structure
-    latest_scripts = content_manager.get_latest_files("scripts", limit=1)
-    if not latest_scripts:
-        print("❌ No scripts found in content/scripts/")
-        print("💡 Run the cat news script generator first (Option 1)")
-        exit(1)
-    
-    script_filepath = latest_scripts[0]["filepath"]
-    print(f"📄 Using latest script: {os.path.basename(script_filepath)}")
-    
-    # Read the script content
-    with open(script_filepath, "r", encoding='utf-8') as f:
-        content = f.read()
-    
-    print(f"📄 Script content loaded ({len(content)} chars)")
-    
-    # Extract just the dialogue (remove stage directions and formatting)
-    lines = content.split('\n')
-    script_lines = []
-    for line in lines:
-        line = line.strip()
-        # Skip empty lines, topic line, and stage directions in parentheses
-        if line and not line.startswith('Topic:') and not line.startswith('**') and not line.startswith('('):
-            # Remove quotes if present
-            line = line.strip('"')
-            script_lines.append(line)
-    
-    # Join and create optimal version for social media (20+ seconds)
-    full_script_text = ' '.join(script_lines)
-    
-    # Create a 20+ second version (target ~300-400 characters for 20-25 seconds)
-    sentences = full_script_text.split('. ')
-    script_parts = []
-    char_count = 0
-    
-    for sentence in sentences:
-        script_parts.append(sentence)
-        char_count += len(sentence) + 2  # +2 for '. '
+def generate_voice_over(script_filepath: Optional[str] = None, target_seconds: float = 22) -> Optional[str]:
+    """Voice a script (default: the latest one) fitted to target_seconds; returns the audio path"""
+    print("🎤 ElevenLabs Voice Generation - Professional Cat News")
+    print("=" * 50)
+    print(f"🔑 API Key loaded: {'✅' if os.getenv('ELEVENLABS_API_KEY') else '❌'}")
+    
+    try:
+        from tools.voice_generator import voice_generator
         
-        # Continue until we reach minimum 20 seconds worth (~300 chars)
-        if char_count >= 300:
-            break
-    
-    script_text = '. '.join(script_parts)
-    if not script_text.endswith('.'):
-        script_text += '.'
-    
-    # If still too short, use the full script
-    if len(script_text) < 250:
-        script_text = full_script_text
-    
-    print(f"📝 Full script ({len(full_script_text)} chars): {full_script_text[:100]}...")
-    print(f"🎯 Optimized script ({len(script_text)} chars): {script_text[:150]}...")
-    print(f"⏱️  Target duration: ~{len(script_text) * 0.12:.0f} seconds (20+ second minimum)")
-    
-    if not script_text.strip():
-        print("❌ No dialogue text extracted from script")
-        exit(1)
-    
-    print("🔄 Generating voice-over...")
-    
-    # Generate voice using Veo 3 API
-    audio_generator = client.text_to_speech.convert(
-        text=script_text,
-        voice_id="pNInz6obpgDQGcFmaJgB",  # Adam voice
-        model_id="eleven_monolingual_v1"
-    )
-    
-    # Convert generator to bytes
-    audio_bytes = b''.join(audio_generator)
-    
-    # Save audio using content manager
-    voice_settings = {
-        "voice_id": "pNInz6obpgDQGcFmaJgB",
-        "model_id": "eleven_monolingual_v1",
-        "text_length": len(script_text)
-    }
-    
-    audio_filepath = content_manager.save_audio(
-        audio_data=audio_bytes,
-        script_filepath=script_filepath,
-        voice_settings=voice_settings
-    )
-    
-    # Check file size
-    size_kb = len(audio_bytes) / 1024
-    print(f"✅ Voice-over created: {os.path.basename(audio_filepath)}")
-    print(f"📊 Audio size: {size_kb:.1f} KB")
-    print(f"📁 Saved in: content/audio/")
-    print("🎬 Ready for video generation!")
-    
-    # Show content organization
-    print(f"\n📋 Content Pipeline Status:")
-    print(f"   📰 News Items: {len(content_manager.get_latest_files('newsitems'))}")
-    print(f"   📝 Scripts: {len(content_manager.get_latest_files('scripts'))}")
-    print(f"   🎤 Audio Files: {len(content_manager.get_latest_files('audio'))}")
-    print(f"   🎬 Video Files: {len(content_manager.get_latest_files('video'))}")
+        # Default to the latest script from our organized structure
+        if script_filepath is None:
+            latest_scripts = content_manager.get_latest_files("scripts", limit=1)
+            if not latest_scripts:
+                print("❌ No scripts found in content/scripts/")
+                print("💡 Run the cat news script generator first (Option 1)")
+                return None
+            script_filepath = latest_scripts[0]["filepath"]
+        print(f"📄 Using script: {os.path.basename(script_filepath)}")
+        
+        # Read the structured parse saved alongside the script (dialogue without stage directions)
+        parsed_script = content_manager.load_parsed_script(script_filepath)
+        full_script_text = parsed_script["spoken_text"]
+        
+        print(f"📄 Script content loaded ({len(parsed_script['spoken_lines'])} spoken lines)")
+        
+        # Fit the script to the target duration before the single TTS call, using the
+        # estimator calibrated from previous voice-overs of this voice
+        duration_estimator.calibrate_from_metadata(content_manager)
+        script_text = duration_estimator.fit_to_duration(
+            full_script_text, target_seconds, "pNInz6obpgDQGcFmaJgB", "eleven_monolingual_v1"
+        )
+        estimated = duration_estimator.estimate(script_text, "pNInz6obpgDQGcFmaJgB", "eleven_monolingual_v1")
+        
+        print(f"📝 Full script ({len(full_script_text)} chars): {full_script_text[:100]}...")
+        print(f"🎯 Optimized script ({len(script_text)} chars): {script_text[:150]}...")
+        print(f"⏱️  Estimated duration: ~{estimated:.0f} seconds (target {target_seconds}s)")
+        
+        if not script_text.strip():
+            print("❌ No dialogue text extracted from script")
+            return None
+        
+        print("🔄 Generating voice-over...")
+        
+        # Generate voice (reruns of the same script are served from the TTS cache)
+        cached = voice_generator.is_cached(script_text, "pNInz6obpgDQGcFmaJgB", "eleven_monolingual_v1")
+        audio_bytes = voice_generator.synthesize_to_bytes(
+            script_text,
+            voice_id="pNInz6obpgDQGcFmaJgB",  # Adam voice
+            model_id="eleven_monolingual_v1"
+        )
+        if cached:
+            print("♻️  Served from TTS cache (no ElevenLabs characters used)")
+        
+        # Save audio using content manager
+        voice_settings = {
+            "voice_id": "pNInz6obpgDQGcFmaJgB",
+            "model_id": "eleven_monolingual_v1",
+            "text_length": len(script_text)
+        }
+        
+        audio_filepath = content_manager.save_audio(
+            audio_data=audio_bytes,
+            script_filepath=script_filepath,
+            voice_settings=voice_settings,
+            spoken_text=script_text
+        )
+        
+        # Check file size
+        size_kb = len(audio_bytes) / 1024
+        print(f"✅ Voice-over created: {os.path.basename(audio_filepath)}")
+        print(f"📊 Audio size: {size_kb:.1f} KB")
+        actual = content_manager.get_audio_duration(audio_filepath)
+        if actual is not None:
+            print(f"⏱️  Actual duration: {actual:.1f} seconds (estimated {estimated:.1f}s)")
+        print(f"📁 Saved in: content/audio/")
+        print("🎬 Ready for video generation!")
+        
+        # Show content organization
+        print(f"\n📋 Content Pipeline Status:")
+        print(f"   📰 News Items: {len(content_manager.get_latest_files('newsitems'))}")
+        print(f"   📝 Scripts: {len(content_manager.get_latest_files('scripts'))}")
+        print(f"   🎤 Audio Files: {len(content_manager.get_latest_files('audio'))}")
+        print(f"   🎬 Video Files: {len(content_manager.get_latest_files('video'))}")
+        return audio_filepath
+
+    except ImportError:
+        print("❌ ElevenLabs not installed")
+        print("💡 Install with: pip install elevenlabs")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    return None
 
-except ImportError:
-    print("❌ ElevenLabs not installed")
-    print("💡 Install with: pip install elevenlabs")
-except Exception as e:
-    print(f"❌ Error: {e}")
\ No newline at end of file
+if __name__ == "__main__":
+    load_dotenv()
+    if generate_voice_over() is None:
+        sys.exit(1)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Upload Fixture Server for AI Cat News Network
+Stand-in for the platforms' resumable upload endpoints, so uploads, retries and
+resume can be exercised and benchmarked without publishing anything.
+
+    python scripts/upload_fixture_server.py --port 8798 [--fail-every N]
+    POST /upload/<platform>       opens a session (Location: /sessions/<id>)
+    PUT  /sessions/<id>           Content-Range chunk (308 + Range until complete, then 201)
+    GET  /stats                   sessions, bytes received and completed uploads (with SHA-256)
+
+Uploaded bytes are hashed and discarded, so multi-gigabyte runs need no disk.
+"""
+import re
+import sys
+import json
+import uuid
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+_CONTENT_RANGE = re.compile(r"bytes (?:(\d+)-(\d+)|\*)/(\d+)")
+READ_SIZE = 1024 * 1024
+
+class FixturePlatform:
+    """In-memory upload sessions; fail_every N answers every Nth chunk with 503 (after reading it)"""
+
+    def __init__(self, fail_every: int = 0):
+        self.lock = threading.Lock()
+        self.fail_every = fail_every
+        self.sessions = {}
+        self.completed = []
+        self.stats = {"sessions": 0, "chunks": 0, "bytes_received": 0, "injected_failures": 0}
+
+    def open_session(self, platform: str, size: int, body: dict) -> str:
+        session_id = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[session_id] = {"platform": platform, "size": size, "received": 0,
+                                         "sha256": hashlib.sha256(), "package_id": body.get("package_id"),
+                                         "metadata": body.get("metadata", {}), "remote_id": None}
+            self.stats["sessions"] += 1
+        return session_id
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/stats":
+            platform = self.server.platform
+            with platform.lock:
+                stats = dict(platform.stats, completed=list(platform.completed))
+            return self._reply(200, stats)
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        body = self._read_json()
+        if len(parts) != 2 or parts[0] != "upload":
+            return self._reply(404, {"error": "not found"})
+        try:
+            size = int(self.headers.get("X-Upload-Content-Length", ""))
+        except ValueError:
+            return self._reply(400, {"error": "X-Upload-Content-Length required"})
+        session_id = self.server.platform.open_session(parts[1], size, body)
+        self._reply(200, {}, {"Location": f"/sessions/{session_id}"})
+
+    def do_PUT(self):
+        platform = self.server.platform
+        length = int(self.headers.get("Content-Length", 0))
+        parts = self.path.strip("/").split("/")
+        session = platform.sessions.get(parts[1]) if len(parts) == 2 and parts[0] == "sessions" else None
+        match = _CONTENT_RANGE.fullmatch(self.headers.get("Content-Range", ""))
+        if session is None or match is None:
+            self._drain(length)
+            return self._reply(404 if session is None else 400, {"error": "unknown session or bad Content-Range"})
+
+        start = match.group(1)
+        if start is not None:
+            with platform.lock:
+                platform.stats["chunks"] += 1
+                inject = platform.fail_every and platform.stats["chunks"] % platform.fail_every == 0
+            if inject or int(start) != session["received"]:
+                # A failed chunk, or one that doesn't continue where we are: keep nothing, report our offset
+                self._drain(length)
+                if inject:
+                    with platform.lock:
+                        platform.stats["injected_failures"] += 1
+                    return self._reply(503, {"error": "injected failure"})
+            else:
+                remaining = length
+                while remaining:
+                    data = self.rfile.read(min(READ_SIZE, remaining))
+                    if not data:
+                        break
+                    session["sha256"].update(data)
+                    session["received"] += len(data)
+                    remaining -= len(data)
+                with platform.lock:
+                    platform.stats["bytes_received"] += length - remaining
+        else:
+            self._drain(length)
+
+        if session["received"] >= session["size"]:
+            with platform.lock:
+                if session["remote_id"] is None:
+                    session["remote_id"] = f"{session['platform']}-{len(platform.completed) + 1}"
+                    platform.completed.append({"id": session["remote_id"], "platform": session["platform"],
+                                               "package_id": session["package_id"], "size": session["size"],
+                                               "sha256": session["sha256"].hexdigest(),
+                                               "title": session["metadata"].get("title")})
+            return self._reply(201, {"id": session["remote_id"]})
+        headers = {"Range": f"bytes=0-{session['received'] - 1}"} if session["received"] else {}
+        self._reply(308, {}, headers)
+
+    def _drain(self, length: int):
+        while length > 0:
+            length -= len(self.rfile.read(min(READ_SIZE, length)) or b"x" * length)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _reply(self, status: int, body: dict, headers: Optional[dict] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(host: str = "127.0.0.1", port: int = 0, fail_every: int = 0) -> ThreadingHTTPServer:
+    """Build a fixture server (port 0 picks a free port; see server.server_address)"""
+    server = ThreadingHTTPServer((host, port), _FixtureHandler)
+    server.daemon_threads = True
+    server.platform = FixturePlatform(fail_every)
+    return server
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve local resumable upload endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth chunk with 503")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.fail_every)
+    host, port = server.server_address[:2]
+    print("🐱 AI Cat News Network - Upload Fixture Server")
+    print("=" * 50)
+    print(f"📤 Uploads: http://{host}:{port}/upload/<platform>")
+    print(f"📊 Stats:   http://{host}:{port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Fixture server stopped")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,25 @@
-from crewai import Task
+# CrewAI is imported inside each factory: it is heavy and most scripts never run a crew
 
 def create_content_idea_task(agent):
     """Task for generating content ideas."""
+    from crewai import Task
     return Task(
         description="""
-        Generate 5 engaging content ideas for YouTube Shorts and Instagram Reels.
-        Focus on trending topics, educational content, or entertaining concepts.
-        Each idea should include:
+        Generate {count} engaging content ideas for YouTube Shorts and Instagram Reels about {topic}.
+        Focus on educational content or entertaining concepts around that topic.
+        Number the ideas 1., 2., ... and give each:
         - A catchy title
         - Brief description
         - Target audience
         - Estimated engagement potential
         """,
         agent=agent,
-        expected_output="A list of 5 content ideas with detailed descriptions"
+        expected_output="A numbered list of {count} content ideas about {topic} with detailed descriptions"
     )
 
 def create_script_writing_task(agent, content_idea):
     """Task for writing a script."""
+    from crewai import Task
     return Task(
         description=f"""
         Write a compelling 30-second script for the following content idea:
@@ -36,6 +38,7 @@ def create_script_writing_task(agent, content_idea):
 
 def create_video_creation_task(agent, script):
     """Task for creating a video."""
+    from crewai import Task
     return Task(
         description=f"""
         Create a short-form video based on this script:
@@ -54,6 +57,7 @@ def create_video_creation_task(agent, script):
 
 def create_publishing_task(agent, video_content):
     """Task for publishing content."""
+    from crewai import Task
     return Task(
         description=f"""
         Prepare and optimize the following content for publishing:
@@ -9,13 +9,16 @@ import time
 import requests
 from typing import Dict, Any, List, Optional
 from config.settings import get_setting
+from utils import cost_ledger, profiling, tracing
 
 class MiniMaxVideoGenerator:
     """MiniMax API integration for text-to-video generation (HailuoAI)"""
     
     def __init__(self):
         self.api_key = get_setting("MINIMAX_API_KEY")
-        self.base_url = "https://api.minimax.chat/v1/video_generation"
+        provider = get_setting("VIDEO_PROVIDERS", {}).get("minimax", {})
+        self.base_url = f"{provider.get('base_url', 'https://api.minimax.chat').rstrip('/')}/v1/video_generation"
+        self.poll_seconds = provider.get("poll_seconds", 10)
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -23,6 +26,12 @@ class MiniMaxVideoGenerator:
     
     def generate_video_from_prompt(self, prompt: str, duration: int = 5) -> Dict[str, Any]:
         """Generate video from text prompt using MiniMax API"""
+        with tracing.span("video.generate", provider="minimax", duration=duration) as span:
+            result = cost_ledger.charge_render("minimax", duration, lambda: self._generate(prompt, duration))
+            span.set(status=result.get("status"), mock=result.get("mock_video", False))
+            return result
+    
+    def _generate(self, prompt: str, duration: int) -> Dict[str, Any]:
         if not self.api_key:
             return {
                 "status": "error",
@@ -45,12 +54,14 @@ class MiniMaxVideoGenerator:
             print(f"🎬 Sending request to MiniMax API for: {prompt[:50]}...")
             
             # Start generation
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            with tracing.span("video.submit", provider="minimax") as span:
+                response = requests.post(
+                    self.base_url,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=30
+                )
+                span.set(http_status=response.status_code)
             
             if response.status_code == 200:
                 generation_data = response.json()
@@ -87,7 +98,15 @@ class MiniMaxVideoGenerator:
     
     def _wait_for_completion(self, task_id: str, max_wait: int = 300) -> Dict[str, Any]:
         """Wait for video generation to complete"""
+        with tracing.span("video.poll", provider="minimax", task_id=task_id) as span:
+            result = self._poll(task_id, max_wait, span)
+            span.set(status=result.get("status"))
+            return result
+    
+    @profiling.profiled("video.poll")
+    def _poll(self, task_id: str, max_wait: int, span) -> Dict[str, Any]:
         start_time = time.time()
+        polls = 0
         check_url = f"{self.base_url}/{task_id}"
         
         print(f"⏳ Waiting for video generation to complete...")
@@ -99,6 +118,8 @@ class MiniMaxVideoGenerator:
                     headers=self.headers,
                     timeout=15
                 )
+                polls += 1
+                span.set(polls=polls)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -124,7 +145,7 @@ class MiniMaxVideoGenerator:
                     elif status in ["pending", "processing"]:
                         # Still processing
                         print(f"🔄 Status: {status}, waiting...")
-                        time.sleep(10)
+                        time.sleep(self.poll_seconds)
                         continue
                     else:
                         print(f"⚠️ Unknown status: {status}")
@@ -213,38 +234,65 @@ class AIVideoCreator:
     
     def _create_video_segments(self, news_topic: str, script: str) -> List[Dict[str, Any]]:
         """Break down the script into visual segments for video generation"""
-        
-        segments = []
-        
-        # Segment 1: Professional Cat News Anchor (0-5s)
-        segments.append({
-            'description': 'Professional cat news anchor opening',
-            'prompt': f'Professional orange tabby cat news anchor wearing glasses and business suit, sitting at modern news desk with "Cat News Network" logo, studio lighting, serious expression, looking directly at camera, newsroom background, high quality, realistic',
-            'duration': 5
-        })
-        
-        # Segment 2: Story Visualization (5-15s)  
-        segments.append({
-            'description': 'Visual representation of the news story',
-            'prompt': f'Cinematic scene illustrating: {news_topic}, multiple cats in professional business environment, dramatic lighting, documentary style, high quality realistic footage, cats wearing business attire',
-            'duration': 10
-        })
-        
-        # Segment 3: Cat Reactions (15-20s)
-        segments.append({
-            'description': 'Cats reacting to breaking news',
-            'prompt': 'Multiple cats of different breeds (tabby, siamese, persian) looking surprised and engaged, sitting around modern conference table, business meeting atmosphere, professional lighting, realistic, high quality',
-            'duration': 5
-        })
-        
-        # Segment 4: News Anchor Sign-off (20-25s)
-        segments.append({
-            'description': 'Cat anchor professional conclusion',
-            'prompt': 'Orange tabby cat news anchor nodding confidently, slight professional smile, raising paw in farewell gesture, modern news studio background, authoritative and trustworthy expression, high quality realistic',
-            'duration': 5
-        })
-        
-        return segments
+        return build_video_segments(news_topic, script)
+
+def download_video(video_url: str, timeout: int = 120) -> bytes:
+    """Fetch a finished render; providers only return a URL, which expires"""
+    with tracing.span("video.download", url=video_url) as span:
+        response = requests.get(video_url, timeout=timeout)
+        response.raise_for_status()
+        span.set(bytes=len(response.content))
+        return response.content
+
+def build_video_segments(news_topic: str, script: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Break down a story into visual segments for video generation.
+    
+    Evergreen segments (anchor opening, reactions) do not depend on the story, so
+    pipelines can render them before the script exists. A segment with a 'section'
+    follows that section of the script (the sign-off follows the OUTRO).
+    """
+    
+    segments = []
+    
+    # Segment 1: Professional Cat News Anchor (0-5s)
+    segments.append({
+        'key': 'anchor_opening',
+        'evergreen': True,
+        'description': 'Professional cat news anchor opening',
+        'prompt': f'Professional orange tabby cat news anchor wearing glasses and business suit, sitting at modern news desk with "Cat News Network" logo, studio lighting, serious expression, looking directly at camera, newsroom background, high quality, realistic',
+        'duration': 5
+    })
+    
+    # Segment 2: Story Visualization (5-15s)  
+    segments.append({
+        'key': 'story',
+        'evergreen': False,
+        'description': 'Visual representation of the news story',
+        'prompt': f'Cinematic scene illustrating: {news_topic}, multiple cats in professional business environment, dramatic lighting, documentary style, high quality realistic footage, cats wearing business attire',
+        'duration': 10
+    })
+    
+    # Segment 3: Cat Reactions (15-20s)
+    segments.append({
+        'key': 'reactions',
+        'evergreen': True,
+        'description': 'Cats reacting to breaking news',
+        'prompt': 'Multiple cats of different breeds (tabby, siamese, persian) looking surprised and engaged, sitting around modern conference table, business meeting atmosphere, professional lighting, realistic, high quality',
+        'duration': 5
+    })
+    
+    # Segment 4: News Anchor Sign-off (20-25s)
+    segments.append({
+        'key': 'sign_off',
+        'evergreen': False,
+        'section': 'OUTRO',
+        'description': 'Cat anchor professional conclusion',
+        'prompt': 'Orange tabby cat news anchor nodding confidently, slight professional smile, raising paw in farewell gesture, modern news studio background, authoritative and trustworthy expression, high quality realistic',
+        'duration': 5
+    })
+    
+    return segments
 
 # Export for use in other modules
-__all__ = ['AIVideoCreator', 'MiniMaxVideoGenerator']
+__all__ = ['AIVideoCreator', 'MiniMaxVideoGenerator', 'build_video_segments', 'download_video']
@@ -4,10 +4,13 @@ import json
 from typing import List, Dict, Optional
 # MoviePy removed - inadequate for professional AI video generation
 # Use MiniMax, Google Veo, or other AI video APIs instead
-from elevenlabs import ElevenLabs
-from PIL import Image, ImageDraw, ImageFont
-from config.ai_provider import ai_provider, generate_content_ideas, write_script, generate_hashtags
+from config.ai_provider import ai_provider, generate_content_ideas, write_script
 from config.settings import ELEVENLABS_VOICE_ID
+from tools.hashtag_engine import hashtag_engine
+from tools.publishing_package import publishing_package_generator
+from tools.uploader import enqueue_packages
+from tools.voice_generator import voice_generator
+from utils.script_parser import parse_script
 
 class ContentGenerationTool:
     """Tool for generating content with AI - now with Groq for fast and free AI."""
@@ -125,26 +128,18 @@ class AIVideoCreationTool:
             # Clean script for voice synthesis (remove timing markers)
             clean_script = self._clean_script_for_voice(script)
             
-            # Initialize ElevenLabs client (API key from environment)
-            client = ElevenLabs()
-            
             # Use voice ID from settings
             voice_id = ELEVENLABS_VOICE_ID
             print(f"Using voice ID: {voice_id}")
             
-            # Generate voice using ElevenLabs text_to_speech method
-            audio = client.text_to_speech.convert(
+            # Generate voice sentence-parallel; unchanged sentences come from the TTS cache
+            return voice_generator.synthesize_to_file(
+                clean_script,
+                output_path,
                 voice_id=voice_id,
-                text=clean_script,
-                model_id="eleven_monolingual_v1"
+                model_id="eleven_monolingual_v1",
+                parallel=True
             )
-            
-            # Save audio file
-            with open(output_path, 'wb') as f:
-                for chunk in audio:
-                    f.write(chunk)
-            
-            return output_path
         except Exception as e:
             print(f"Error generating voice-over: {str(e)}")
             # Create a placeholder audio file to continue the process
@@ -157,20 +152,7 @@ class AIVideoCreationTool:
     
     def _clean_script_for_voice(self, script: str) -> str:
         """Clean script text for voice synthesis."""
-        lines = script.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            # Remove timing markers like [0-3s]
-            if line.strip() and not line.strip().startswith('[') and ':' in line:
-                # Extract text after the category (INTRO:, NEWS:, etc.)
-                if ':' in line:
-                    text = line.split(':', 1)[1].strip()
-                    clean_lines.append(text)
-            elif line.strip() and not line.strip().startswith('['):
-                clean_lines.append(line.strip())
-        
-        return ' '.join(clean_lines)
+        return parse_script(script)["spoken_text"]
     
     def _get_cat_visual_assets(self) -> List[Dict]:
         """Get cat images and video clips for the video."""
@@ -268,15 +250,24 @@ class VideoCreationTool:
 class SocialMediaTool:
     """Tool for social media integration."""
     
-    def generate_hashtags(self, content_description: str) -> str:
-        """Generate relevant hashtags for content using AI."""
-        return generate_hashtags(content_description)
+    def generate_hashtags(self, content_description: str, platform: str = "youtube_shorts",
+                          enrich: Optional[bool] = None) -> str:
+        """Generate relevant hashtags for a script or description (locally; enrich also asks the AI)."""
+        return ", ".join(hashtag_engine.generate(parse_script(content_description), platform, enrich=enrich))
+    
+    def create_publishing_package(self, script: str, force: bool = False) -> Dict:
+        """Titles, captions and hashtags for every platform from one AI call (cached per script)."""
+        return publishing_package_generator.generate(parse_script(script), force=force)
+    
+    def queue_upload(self, package: Dict, platforms: Optional[List[str]] = None) -> List[int]:
+        """Queue a content package's video for resumable upload (run it with `catnews upload run`)."""
+        return enqueue_packages([package], platforms)
     
     def create_caption(self, script: str) -> str:
         """Create social media caption from script."""
-        # Extract main message from script
-        lines = [line.strip() for line in script.split('\n') if line.strip()]
-        main_content = ' '.join(lines[:2])  # Use first two lines
+        # Extract main message from the spoken lines of the script
+        spoken_lines = parse_script(script)["spoken_lines"]
+        main_content = ' '.join(spoken_lines[:2])  # Use first two lines
         
         caption = f"{main_content}\n\n"
         caption += "What do you think? Let me know in the comments! 👇\n\n"
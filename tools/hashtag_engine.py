@@ -0,0 +1,214 @@
+"""
+Hashtag Engine for Cat News Network
+Builds publishing hashtags locally from the parsed script, the trending list and
+a co-occurrence table of our past posts; the LLM is only an optional enrichment
+"""
+
+import os
+import re
+import json
+import glob
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from config.settings import TRENDING_HASHTAGS, get_setting
+from utils.dedup_index import STOPWORDS
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9']+")
+_TAG = re.compile(r"#\w+")
+
+# Words that show up in every cat news script and say nothing about the story
+SCRIPT_STOPWORDS = STOPWORDS | frozenset("""
+whiskers cat cats humans human news evening good breaking meanwhile typical really just
+like about because would could should what when where which while there these those them
+they then your you our we i'm that's it's stay superior dozens hundreds thousands today""".split())
+
+def to_hashtag(words: Iterable[str]) -> str:
+    """["deep", "sea"] -> "#DeepSea\""""
+    return "#" + "".join(word[:1].upper() + word[1:] for word in words if word)
+
+def normalize_tag(tag: str) -> str:
+    """Case-insensitive identity of a hashtag ("#catnews" and "#CatNews" are the same tag)"""
+    return tag.lstrip("#").lower()
+
+def extract_keywords(parsed: Dict[str, Any], limit: int = 8) -> List[str]:
+    """
+    Most telling words of a parsed script: topic/title words count triple,
+    spoken words once; ties keep first-seen order.
+    """
+    counts = Counter()
+    order = {}
+    weighted = [(parsed.get("topic") or "", 3), (parsed.get("title") or "", 3), (parsed.get("spoken_text") or "", 1)]
+    for text, weight in weighted:
+        for word in _WORD.findall(text):
+            key = word.lower().strip("'")
+            if len(key) < 3 or key in SCRIPT_STOPWORDS or key.isdigit():
+                continue
+            counts[key] += weight
+            order.setdefault(key, len(order))
+    ranked = sorted(counts, key=lambda key: (-counts[key], order[key]))
+    return ranked[:limit]
+
+class HashtagEngine:
+    """
+    Local hashtag ranking.
+
+    Candidates are the script's own hashtags, keyword tags from the script,
+    TRENDING_HASHTAGS and tags that co-occurred with those in past posts. Each
+    gets a score, and the best ones up to the platform's hashtag_limit are kept.
+    """
+
+    def __init__(self, trending: Optional[List[str]] = None, table_path: Optional[str] = None,
+                 packages_dir: str = "content"):
+        settings = get_setting('HASHTAG_ENGINE', {})
+        self.trending = trending if trending is not None else TRENDING_HASHTAGS
+        self.table_path = table_path or settings.get('table_path', 'content/cache/hashtag_cooccurrence.json')
+        self.packages_dir = packages_dir
+        self.max_keyword_tags = settings.get('max_keyword_tags', 4)
+        self.llm_enrichment = settings.get('llm_enrichment', False)
+        self._lock = threading.Lock()
+        self._table = None
+
+    # Co-occurrence table: {"posts": N, "counts": {tag: n}, "pairs": {tag: {other: n}}, "display": {tag: "#Tag"}}
+
+    def _load_table(self) -> Dict[str, Any]:
+        if self._table is None:
+            table = None
+            if os.path.exists(self.table_path):
+                try:
+                    with open(self.table_path, 'r', encoding='utf-8') as f:
+                        table = json.load(f)
+                except (OSError, ValueError):
+                    table = None
+            self._table = table if table is not None else self._build_table()
+        return self._table
+
+    def _build_table(self) -> Dict[str, Any]:
+        """Count tags across the publishing hashtags of existing content packages"""
+        table = {"posts": 0, "counts": {}, "pairs": {}, "display": {}}
+        for package_file in glob.glob(os.path.join(self.packages_dir, "package_*.json")):
+            try:
+                with open(package_file, 'r', encoding='utf-8') as f:
+                    publishing = json.load(f).get("publishing") or {}
+            except (OSError, ValueError):
+                continue
+            # Either one hashtag list, or one per platform ({platform: {"hashtags": [...]}})
+            if "hashtags" in publishing:
+                self._count_post(table, publishing["hashtags"] or [])
+            for entry in publishing.values():
+                if isinstance(entry, dict):
+                    self._count_post(table, entry.get("hashtags") or [])
+        self._save_table(table)
+        return table
+
+    @staticmethod
+    def _count_post(table: Dict[str, Any], hashtags: Iterable[str]):
+        tags = {}
+        for tag in hashtags:
+            tags.setdefault(normalize_tag(tag), tag if tag.startswith("#") else f"#{tag}")
+        if not tags:
+            return
+        table["posts"] += 1
+        for key, display in tags.items():
+            table["counts"][key] = table["counts"].get(key, 0) + 1
+            table["display"].setdefault(key, display)
+            pairs = table["pairs"].setdefault(key, {})
+            for other in tags:
+                if other != key:
+                    pairs[other] = pairs.get(other, 0) + 1
+
+    def _save_table(self, table: Dict[str, Any]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.table_path)), exist_ok=True)
+        temp_path = f"{self.table_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f)
+        os.replace(temp_path, self.table_path)
+
+    def record_post(self, hashtags: Iterable[str]):
+        """Add a published post's hashtags to the co-occurrence table"""
+        with self._lock:
+            table = self._load_table()
+            self._count_post(table, hashtags)
+            self._save_table(table)
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recount the table from all content packages"""
+        with self._lock:
+            self._table = self._build_table()
+            return {"posts": self._table["posts"], "tags": len(self._table["counts"])}
+
+    def generate(self, parsed: Dict[str, Any], platform: str = "youtube_shorts",
+                 enrich: Optional[bool] = None) -> List[str]:
+        """
+        Hashtags for a parsed script, best first, within the platform's hashtag_limit.
+
+        With enrich (default HASHTAG_ENGINE["llm_enrichment"]), LLM suggestions
+        fill whatever room the local tags leave.
+        """
+        limit = get_setting('PLATFORM_SETTINGS', {}).get(platform, {}).get('hashtag_limit', 10)
+        with self._lock:
+            table = self._load_table()
+
+        scores: Dict[str, float] = {}
+        display: Dict[str, str] = {}
+
+        def offer(tag: str, score: float):
+            key = normalize_tag(tag)
+            if not key:
+                return
+            display.setdefault(key, tag if tag.startswith("#") else f"#{tag}")
+            scores[key] = max(scores.get(key, 0.0), score)
+
+        # The script's own tags were chosen by the writer; keep them first
+        for position, tag in enumerate(parsed.get("hashtags", [])):
+            offer(tag, 4.0 - position * 0.01)
+
+        keywords = extract_keywords(parsed)
+        for position, keyword in enumerate(keywords[:self.max_keyword_tags]):
+            offer(to_hashtag([keyword]), 2.5 - position * 0.1)
+
+        # Trending tags are always candidates, slightly in list order
+        for position, tag in enumerate(self.trending):
+            offer(tag, 1.0 - position * 0.01)
+
+        # Tags that past posts paired with the ones we already have get P(tag | seed) added
+        counts, pairs = table.get("counts", {}), table.get("pairs", {})
+        seeds = [key for key in list(scores) if counts.get(key)]
+        for seed in seeds:
+            for other, together in pairs.get(seed, {}).items():
+                boost = together / counts[seed]
+                if other in scores:
+                    scores[other] += boost * 0.5
+                else:
+                    display.setdefault(other, table.get("display", {}).get(other, f"#{other}"))
+                    scores[other] = boost
+
+        ranked = sorted(scores, key=lambda key: -scores[key])
+        hashtags = [display[key] for key in ranked][:limit]
+
+        if enrich if enrich is not None else self.llm_enrichment:
+            hashtags = self._enrich(parsed, hashtags, limit)
+        return hashtags
+
+    def _enrich(self, parsed: Dict[str, Any], hashtags: List[str], limit: int) -> List[str]:
+        """Keep the strongest local tags and let the LLM suggest the rest"""
+        from config.ai_provider import generate_hashtags
+
+        keep = hashtags[:max(1, limit // 2)]
+        suggestions = generate_hashtags(parsed.get("topic") or parsed.get("spoken_text", "")[:300])
+        if suggestions.startswith("Error:"):
+            return hashtags
+        seen = {normalize_tag(tag) for tag in keep}
+        for tag in _TAG.findall(suggestions) + hashtags[len(keep):]:
+            if len(keep) >= limit:
+                break
+            if normalize_tag(tag) not in seen:
+                seen.add(normalize_tag(tag))
+                keep.append(tag)
+        return keep
+
+# Global instance for easy importing
+hashtag_engine = HashtagEngine()
+
+# Export for use in other modules
+__all__ = ['HashtagEngine', 'hashtag_engine', 'extract_keywords', 'to_hashtag']
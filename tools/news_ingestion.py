@@ -0,0 +1,255 @@
+"""
+News Ingestion for Cat News Network
+Fetches RSS/Atom feeds concurrently with conditional GETs and stream-parses
+new stories into ContentManager news items
+"""
+
+import os
+import json
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import get_setting
+from utils import tracing
+from utils.content_manager import content_manager as default_content_manager
+from utils.dedup_index import get_dedup_index, story_text
+
+# Item IDs remembered per feed, so overlapping feed windows don't re-save stories
+SEEN_IDS_PER_FEED = 500
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _text(element: Optional[ET.Element]) -> str:
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+def _item_from_element(element: ET.Element) -> Dict[str, str]:
+    """Flatten an RSS <item> or Atom <entry> into a story dict"""
+    fields = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "link":
+            # Atom links carry the URL in href; prefer rel="alternate"
+            href = child.get("href")
+            if href and (child.get("rel", "alternate") == "alternate" or "link" not in fields):
+                fields["link"] = href
+            elif not href and "link" not in fields:
+                fields["link"] = _text(child)
+        elif name not in fields:
+            fields[name] = _text(child)
+
+    return {
+        "id": fields.get("guid") or fields.get("id") or fields.get("link") or fields.get("title", ""),
+        "title": fields.get("title", ""),
+        "link": fields.get("link", ""),
+        "summary": fields.get("description") or fields.get("summary") or fields.get("content", ""),
+        "published": fields.get("pubDate") or fields.get("published") or fields.get("updated", "")
+    }
+
+def iter_feed_items(stream, max_items: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream-parse an RSS or Atom document, yielding items as their closing tag arrives.
+
+    Elements are cleared once read, so memory stays flat however large the feed is.
+    """
+    count = 0
+    for _, element in ET.iterparse(stream, events=("end",)):
+        if _local_name(element.tag) not in ("item", "entry"):
+            continue
+        item = _item_from_element(element)
+        element.clear()
+        if item["title"]:
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+
+class NewsIngestor:
+    """Concurrent feed fetcher that saves unseen stories as news items"""
+
+    def __init__(self, feeds: Optional[List[Dict[str, Any]]] = None, content_manager=None,
+                 session: Optional[requests.Session] = None, dedup_index=None):
+        """
+        Args:
+            feeds: Feed configs ({"name", "url", "enabled"}); defaults to NEWS_FEEDS
+            content_manager: Where new stories are saved
+            session: Shared HTTP session (a pooled one is created by default)
+            dedup_index: Near-duplicate index; defaults to the shared one when NEWS_INGESTION["dedup"] is set
+        """
+        settings = get_setting('NEWS_INGESTION', {})
+        self.feeds = [feed for feed in (feeds or get_setting('NEWS_FEEDS', [])) if feed.get("enabled", True)]
+        self.content_manager = content_manager or default_content_manager
+        self.max_workers = settings.get('max_workers', 4)
+        self.timeout = settings.get('timeout', 15)
+        self.max_items_per_feed = settings.get('max_items_per_feed', 25)
+        self.state_path = settings.get('state_path', 'content/cache/feed_state.json')
+        if dedup_index is None and settings.get('dedup', True):
+            dedup_index = get_dedup_index()
+        self.dedup_index = dedup_index
+
+        if session is None:
+            # One keep-alive pool shared by all fetch threads
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "CatNewsNetwork/1.0 (+feed ingestion)"
+        self.session = session
+
+        self._state_lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def fetch_feed(self, feed: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch one feed with If-None-Match / If-Modified-Since.
+
+        Returns:
+            {"feed", "status" ("not_modified", "ok" or "error"), "items", "etag", "last_modified", "error"}
+        """
+        name = feed["name"]
+        with self._state_lock:
+            feed_state = dict(self.state.get(name, {}))
+
+        headers = {}
+        if feed_state.get("etag"):
+            headers["If-None-Match"] = feed_state["etag"]
+        if feed_state.get("last_modified"):
+            headers["If-Modified-Since"] = feed_state["last_modified"]
+
+        result = {"feed": name, "status": "error", "items": [], "etag": None, "last_modified": None, "error": None}
+        with tracing.span("feed.fetch", feed=name, conditional=bool(headers)) as span:
+            try:
+                with self.session.get(feed["url"], headers=headers, timeout=self.timeout, stream=True) as response:
+                    span.set(http_status=response.status_code)
+                    if response.status_code == 304:
+                        result["status"] = "not_modified"
+                    else:
+                        response.raise_for_status()
+                        response.raw.decode_content = True
+                        result["items"] = list(iter_feed_items(response.raw, self.max_items_per_feed))
+                        result["etag"] = response.headers.get("ETag")
+                        result["last_modified"] = response.headers.get("Last-Modified")
+                        result["status"] = "ok"
+            except (requests.RequestException, ET.ParseError) as e:
+                result["error"] = str(e)
+                span.fail(e)
+            span.set(status=result["status"], items=len(result["items"]))
+        return result
+
+    def ingest(self) -> Dict[str, Any]:
+        """
+        Fetch every feed concurrently and save stories not seen before.
+
+        Returns:
+            {"feeds": {name: {"status", "items", "new", "merged", "error"}},
+             "saved": [news item paths], "merged": [(duplicate title, news item path it was merged into)]}
+        """
+        report = {"feeds": {}, "saved": [], "merged": []}
+        if not self.feeds:
+            return report
+
+        with tracing.span("news.ingest", feeds=len(self.feeds)), \
+                ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.feeds)))) as executor:
+            futures = [executor.submit(tracing.propagate(self.fetch_feed), feed) for feed in self.feeds]
+            for future in as_completed(futures):
+                result = future.result()
+                report["feeds"][result["feed"]] = {
+                    "status": result["status"],
+                    "items": len(result["items"]),
+                    "new": 0,
+                    "merged": 0,
+                    "error": result["error"]
+                }
+                if result["status"] == "ok":
+                    saved, merged = self._save_new_items(result)
+                    report["feeds"][result["feed"]].update(new=len(saved), merged=len(merged))
+                    report["saved"].extend(saved)
+                    report["merged"].extend(merged)
+
+        with self._state_lock:
+            self._save_state()
+        return report
+
+    def _save_new_items(self, result: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Save unseen items of a fetched feed and remember its validators.
+
+        Items that are near-duplicates of an indexed news item are merged into it
+        (recorded under its "also_reported_by") instead of becoming new stories;
+        ones matching a story we already scripted are dropped.
+        """
+        name = result["feed"]
+        with self._state_lock:
+            feed_state = self.state.setdefault(name, {})
+            seen = feed_state.get("seen_ids", [])
+        seen_set = set(seen)
+
+        saved, merged = [], []
+        # Feeds list newest first; save oldest first so news item timestamps follow publication order
+        for item in reversed(result["items"]):
+            if item["id"] in seen_set:
+                continue
+            seen_set.add(item["id"])
+            seen.append(item["id"])
+            story = {
+                "topic": item["title"],
+                "summary": item["summary"],
+                "link": item["link"],
+                "published": item["published"],
+                "feed": name,
+                "guid": item["id"]
+            }
+            if self.dedup_index is not None:
+                duplicate = self.dedup_index.find_duplicate(story_text(story["topic"], story["summary"]))
+                if duplicate is not None and duplicate["kind"] == "script":
+                    continue
+                if duplicate is not None and os.path.exists(duplicate["ref"]):
+                    self.content_manager.merge_news_item_source(duplicate["ref"], {
+                        "source": f"feed:{name}", "topic": story["topic"], "link": story["link"],
+                        "similarity": duplicate["similarity"]
+                    })
+                    merged.append((story["topic"], duplicate["ref"]))
+                    continue
+
+            path = self.content_manager.save_news_item(
+                topic=story["topic"],
+                source=f"feed:{name}",
+                metadata={key: value for key, value in story.items() if key != "topic"}
+            )
+            saved.append(path)
+            if self.dedup_index is not None:
+                self.dedup_index.add(story_text(story["topic"], story["summary"]), "news", path, commit=False)
+
+        if self.dedup_index is not None:
+            self.dedup_index.commit()
+        with self._state_lock:
+            feed_state["seen_ids"] = seen[-SEEN_IDS_PER_FEED:]
+            feed_state["etag"] = result["etag"]
+            feed_state["last_modified"] = result["last_modified"]
+        return saved, merged
+
+def ingest_news(feeds: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Run one ingestion pass over the configured feeds"""
+    return NewsIngestor(feeds).ingest()
+
+# Export for use in other modules
+__all__ = ['NewsIngestor', 'ingest_news', 'iter_feed_items']
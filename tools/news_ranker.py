@@ -0,0 +1,199 @@
+"""
+News Ranking for Cat News Network
+Scores candidate news items in one vectorized TF-IDF pass (category fit, novelty
+against recent scripts, recency) so only the top-K ever reach LLM scripting
+"""
+
+import re
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import get_setting
+from utils.dedup_index import STOPWORDS, script_topic
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Elements in one (references x nonzeros) product block; bounds peak memory (~16 MB of float32)
+BLOCK_ELEMENTS = 1 << 22
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+def parse_published(news_item: Dict[str, Any]) -> Optional[float]:
+    """Publication time of a news item as a Unix timestamp (feed date, else when it was saved)"""
+    published = news_item.get("metadata", {}).get("published")
+    if published:
+        for parse in (parsedate_to_datetime, datetime.fromisoformat):
+            try:
+                return parse(published.replace("Z", "+00:00")).timestamp()
+            except (TypeError, ValueError):
+                continue
+    try:
+        return datetime.strptime(news_item.get("timestamp", ""), "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+class _SparseRows:
+    """Row-normalised TF-IDF rows in CSR form (indptr, indices, data) over a shared vocabulary"""
+
+    def __init__(self, documents: List[List[str]], vocabulary: Dict[str, int], idf: np.ndarray):
+        indptr, indices, counts = [0], [], []
+        for tokens in documents:
+            row = {}
+            for token in tokens:
+                column = vocabulary.get(token)
+                if column is not None:
+                    row[column] = row.get(column, 0) + 1
+            indices.extend(row)
+            counts.extend(row.values())
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float32) * idf[self.indices]
+        row_of = np.repeat(np.arange(len(documents)), np.diff(self.indptr))
+        norms = np.sqrt(np.bincount(row_of, weights=data * data, minlength=len(documents))).astype(np.float32)
+        self.data = data / np.where(norms > 0, norms, 1)[row_of]
+        self.shape = (len(documents), len(vocabulary))
+
+    def dense(self) -> np.ndarray:
+        matrix = np.zeros(self.shape, dtype=np.float32)
+        row_of = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        matrix[row_of, self.indices] = self.data
+        return matrix
+
+    def best_match(self, reference: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Highest cosine similarity of each row against a dense reference matrix, and which reference row"""
+        best = np.zeros(self.shape[0], dtype=np.float32)
+        which = np.zeros(self.shape[0], dtype=np.int64)
+        if reference.shape[0] == 0 or self.indices.size == 0:
+            return best, which
+
+        # Blocks of whole rows keep the (references x nonzeros) product bounded
+        average_nnz = max(1, self.indices.size // self.shape[0])
+        rows_per_block = max(1, BLOCK_ELEMENTS // (reference.shape[0] * average_nnz))
+        for start in range(0, self.shape[0], rows_per_block):
+            stop = min(start + rows_per_block, self.shape[0])
+            lo, hi = self.indptr[start], self.indptr[stop]
+            if lo == hi:
+                continue
+            # Each nonzero contributes data * reference[:, column]; summing them per row gives the dot products
+            products = reference[:, self.indices[lo:hi]] * self.data[lo:hi]
+            offsets = self.indptr[start:stop] - lo
+            nonempty = np.diff(self.indptr[start:stop + 1]) > 0
+            sums = np.zeros((reference.shape[0], stop - start), dtype=np.float32)
+            sums[:, nonempty] = np.add.reduceat(products, offsets[nonempty], axis=1)
+            best[start:stop] = sums.max(axis=0)
+            which[start:stop] = sums.argmax(axis=0)
+        return best, which
+
+class NewsRanker:
+    """
+    Batch scorer for candidate news items.
+
+    score = category_weight * category_fit + novelty_weight * novelty + recency_weight * recency
+
+    category_fit is the best TF-IDF cosine against NEWS_CATEGORIES (expanded with
+    NEWS_RANKING["category_keywords"]), novelty is one minus the best cosine
+    against recent scripts, and recency halves every half_life_hours.
+    """
+
+    def __init__(self, categories: Optional[List[str]] = None, settings: Optional[Dict[str, Any]] = None):
+        self.settings = settings or get_setting('NEWS_RANKING', {})
+        self.categories = categories or get_setting('NEWS_CATEGORIES', [])
+        keywords = self.settings.get('category_keywords', {})
+        self.category_texts = [f"{category} {' '.join(keywords.get(category, []))}" for category in self.categories]
+        weights = self.settings.get('weights', {})
+        self.weights = (weights.get('category', 0.5), weights.get('novelty', 0.3), weights.get('recency', 0.2))
+        self.half_life_hours = self.settings.get('half_life_hours', 12)
+
+    def score(self, candidates: List[Dict[str, Any]], recent_scripts: List[str],
+              now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Score every candidate in one pass.
+
+        Args:
+            candidates: News items ({"topic", "metadata": {"summary", "published"}, "timestamp", ...})
+            recent_scripts: Text of recently written scripts (topics are enough)
+
+        Returns:
+            One {"category_fit", "category", "novelty", "recency", "score"} dict per candidate, in input order
+        """
+        if not candidates:
+            return []
+        now = now or time.time()
+
+        candidate_tokens = [tokenize(f"{item.get('topic', '')} {item.get('metadata', {}).get('summary', '')}")
+                            for item in candidates]
+        category_tokens = [tokenize(text) for text in self.category_texts]
+        script_tokens = [tokenize(text) for text in recent_scripts]
+
+        # Vocabulary and smoothed IDF over everything being compared
+        documents = candidate_tokens + category_tokens + script_tokens
+        vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        for tokens in documents:
+            for token in set(tokens):
+                column = vocabulary.setdefault(token, len(vocabulary))
+                if column == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[column] += 1
+        df = np.asarray(document_frequency, dtype=np.float32)
+        idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+
+        candidate_rows = _SparseRows(candidate_tokens, vocabulary, idf)
+        category_matrix = _SparseRows(category_tokens, vocabulary, idf).dense()
+        script_matrix = _SparseRows(script_tokens, vocabulary, idf).dense()
+
+        category_fit, best_category = candidate_rows.best_match(category_matrix)
+        novelty = 1.0 - candidate_rows.best_match(script_matrix)[0]
+
+        published = np.array([parse_published(item) or now for item in candidates], dtype=np.float64)
+        age_hours = np.clip((now - published) / 3600.0, 0, None)
+        recency = np.exp2(-age_hours / self.half_life_hours).astype(np.float32)
+
+        category_weight, novelty_weight, recency_weight = self.weights
+        scores = category_weight * category_fit + novelty_weight * novelty + recency_weight * recency
+
+        return [
+            {
+                "score": float(scores[i]),
+                "category_fit": float(category_fit[i]),
+                "category": self.categories[best_category[i]] if self.categories else None,
+                "novelty": float(novelty[i]),
+                "recency": float(recency[i])
+            }
+            for i in range(len(candidates))
+        ]
+
+    def rank(self, candidates: List[Dict[str, Any]], recent_scripts: List[str], top_k: Optional[int] = None,
+             now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Top-K candidates, best first, each with its scores under "ranking\""""
+        top_k = top_k if top_k is not None else self.settings.get('top_k', 24)
+        scored = self.score(candidates, recent_scripts, now)
+        order = sorted(range(len(candidates)), key=lambda i: scored[i]["score"], reverse=True)[:top_k]
+        return [dict(candidates[i], ranking=scored[i]) for i in order]
+
+def recent_script_topics(content_manager, limit: Optional[int] = None) -> List[str]:
+    """Topics of the most recent scripts, for novelty scoring"""
+    limit = limit if limit is not None else get_setting('NEWS_RANKING', {}).get('recent_scripts', 200)
+    topics = []
+    for file_info in content_manager.get_latest_files("scripts", limit=limit):
+        topic = script_topic(file_info["filepath"])
+        if not topic:
+            # Scripts saved without a topic line: their opening is the closest stand-in
+            with open(file_info["filepath"], 'r', encoding='utf-8') as f:
+                topic = f.read(500)
+        topics.append(topic)
+    return topics
+
+def rank_pending_news(content_manager, top_k: Optional[int] = None,
+                      source_prefix: Optional[str] = "feed:") -> List[Dict[str, Any]]:
+    """Rank pending news items (ingested ones by default) and return the top-K for scripting"""
+    candidates = content_manager.get_pending_news_items(source_prefix=source_prefix)
+    return NewsRanker().rank(candidates, recent_script_topics(content_manager), top_k)
+
+# Export for use in other modules
+__all__ = ['NewsRanker', 'rank_pending_news', 'recent_script_topics', 'parse_published']
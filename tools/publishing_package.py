@@ -0,0 +1,170 @@
+"""
+Publishing Package Generator for Cat News Network
+Produces every platform's title, caption and hashtags from one JSON-mode LLM
+call per script, validated against PLATFORM_SETTINGS and cached by script hash
+"""
+
+import os
+import re
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+from config.ai_provider import ai_provider
+from config.settings import get_setting
+from utils import cost_ledger, tracing
+from tools.hashtag_engine import hashtag_engine, normalize_tag
+
+# Bump when the prompt or validation changes so cached packages are regenerated
+PACKAGE_VERSION = "2"
+
+_TAG = re.compile(r"#?(\w+)")
+
+CALL_TO_ACTION = "What do you think? Let me know in the comments! 👇\n\nFollow for more content like this! 🔥"
+
+def _clip(text: str, limit: int) -> str:
+    """Trim to limit characters, at a word boundary where possible"""
+    text = " ".join(text.split()) if "\n" not in text else text.strip()
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1].rsplit(" ", 1)[0] if " " in text[:limit - 1] else text[:limit - 1]
+    return cut.rstrip(" ,.;:-") + "…"
+
+class PublishingPackageGenerator:
+    """
+    One LLM round trip per video for all publishing metadata.
+
+    The response is validated locally: titles and captions are clipped to the
+    platform limits, hashtags are normalised, de-duplicated and capped at
+    hashtag_limit (topped up from the local hashtag engine), and any platform
+    the model left out is filled in locally. Results are cached per script hash.
+    """
+
+    def __init__(self, cache_dir: str = "content/cache/publishing", platforms: Optional[Dict[str, Any]] = None):
+        self.cache_dir = cache_dir
+        self.platforms = platforms or get_setting('PLATFORM_SETTINGS', {})
+
+    def _cache_path(self, parsed: Dict[str, Any]) -> str:
+        key = json.dumps([PACKAGE_VERSION, parsed.get("source_hash"), self.platforms], sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _build_prompt(self, parsed: Dict[str, Any]) -> str:
+        limits = "\n".join(
+            f'- "{name}": title at most {settings.get("title_max_length", 100)} characters, '
+            f'caption at most {settings.get("caption_max_length", 2200)} characters, '
+            f'exactly {settings.get("hashtag_limit", 10)} hashtags'
+            for name, settings in self.platforms.items()
+        )
+        return f"""
+You write social media publishing metadata for "Cat News Network", where cat anchors report real human news.
+
+Story: {parsed.get("topic") or parsed.get("title") or ""}
+Script (spoken lines): {_clip(parsed.get("spoken_text", ""), 600)}
+
+Write a title, a caption and hashtags for each platform below, within its limits:
+{limits}
+
+Titles hook viewers in the first words. Captions summarise the story in the cat anchor's voice and end with a
+question for the comments. Hashtags mix story-specific tags with cat/news tags, each starting with #.
+
+Respond with JSON only, shaped as:
+{{"platforms": {{"<platform>": {{"title": "...", "caption": "...", "hashtags": ["#Tag", "..."]}}}}}}
+"""
+
+    @staticmethod
+    def _local_entry(parsed: Dict[str, Any]) -> Dict[str, str]:
+        """Title and caption made without the LLM, used for anything the model left out"""
+        spoken = " ".join(parsed.get("spoken_lines", [])[:2])
+        return {
+            "title": parsed.get("title") or parsed.get("topic") or spoken[:80] or "Cat News Network",
+            "caption": f"{spoken}\n\n{CALL_TO_ACTION}" if spoken else CALL_TO_ACTION
+        }
+
+    def validate(self, parsed: Dict[str, Any], response: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bring a model response within PLATFORM_SETTINGS limits, filling gaps locally"""
+        platforms = (response or {}).get("platforms")
+        if not isinstance(platforms, dict):
+            platforms = {}
+
+        package = {}
+        for name, settings in self.platforms.items():
+            entry = platforms.get(name) if isinstance(platforms.get(name), dict) else {}
+            local = None
+            filled = []
+            result = {}
+            for field, default_limit in (("title", 100), ("caption", 2200)):
+                value = entry.get(field)
+                if not isinstance(value, str) or not value.strip():
+                    local = local or self._local_entry(parsed)
+                    value = local[field]
+                    filled.append(field)
+                result[field] = _clip(value, settings.get(f"{field}_max_length", default_limit))
+            result["hashtags"] = self._validate_hashtags(parsed, name, entry.get("hashtags"),
+                                                         settings.get("hashtag_limit", 10))
+            result["source"] = "local" if not entry else ("mixed" if filled else "llm")
+            package[name] = result
+        return package
+
+    def _validate_hashtags(self, parsed: Dict[str, Any], platform: str, hashtags: Any, limit: int) -> List[str]:
+        if isinstance(hashtags, str):
+            hashtags = hashtags.replace(",", " ").split()
+        tags, seen = [], set()
+        for raw in hashtags if isinstance(hashtags, list) else []:
+            match = _TAG.search(str(raw).replace(" ", ""))
+            if not match:
+                continue
+            tag = f"#{match.group(1)}"
+            if normalize_tag(tag) not in seen:
+                seen.add(normalize_tag(tag))
+                tags.append(tag)
+        # Too few from the model: top up with locally ranked tags
+        if len(tags) < limit:
+            for tag in hashtag_engine.generate(parsed, platform):
+                if len(tags) >= limit:
+                    break
+                if normalize_tag(tag) not in seen:
+                    seen.add(normalize_tag(tag))
+                    tags.append(tag)
+        return tags[:limit]
+
+    @tracing.traced("publishing.generate")
+    def generate(self, parsed: Dict[str, Any], force: bool = False) -> Dict[str, Any]:
+        """
+        Publishing metadata for every platform in PLATFORM_SETTINGS.
+
+        Returns:
+            {platform: {"title", "caption", "hashtags", "source" ("llm", "mixed" or "local")}}
+        """
+        cache_path = self._cache_path(parsed)
+        if not force and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    package = json.load(f)
+                tracing.annotate(cached=True)
+                return package
+            except (OSError, ValueError):
+                pass
+
+        tracing.annotate(cached=False)
+        try:
+            response = ai_provider.generate_json(self._build_prompt(parsed), max_tokens=1500)
+        except cost_ledger.BudgetExceeded as e:
+            # Filled in locally (free) and left uncached, so it is regenerated once there is budget
+            print(f"💸 {e}")
+            tracing.annotate(over_budget=True)
+            response = None
+        package = self.validate(parsed, response)
+
+        # Only cache what the model produced; a failed call is retried next time
+        if response is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(package, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, cache_path)
+        return package
+
+# Global instance for easy importing
+publishing_package_generator = PublishingPackageGenerator()
+
+# Export for use in other modules
+__all__ = ['PublishingPackageGenerator', 'publishing_package_generator']
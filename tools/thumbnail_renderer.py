@@ -0,0 +1,180 @@
+"""
+Thumbnail Renderer for Cat News Network
+Renders headline thumbnails from scripts onto the studio background, keeping
+fonts and pre-scaled backgrounds cached per process and fanning batches out
+across a process pool
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from config.settings import get_setting
+from utils import profiling
+from utils.content_manager import content_manager as default_content_manager
+
+def thumbnail_settings() -> Dict[str, Any]:
+    return get_setting('THUMBNAILS', {})
+
+# Per-process caches: fonts and backgrounds are loaded/scaled once, then every render reuses them
+
+@lru_cache(maxsize=64)
+def _font(paths: Tuple[str, ...], size: int) -> ImageFont.ImageFont:
+    for path in paths:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    # No TrueType font installed: Pillow's bundled font still scales (Pillow >= 10.1)
+    return ImageFont.load_default(size=size)
+
+@lru_cache(maxsize=16)
+def _background(path: str, size: Tuple[int, int]) -> Image.Image:
+    """Background cropped to cover size, with a dark gradient at the bottom for legible text"""
+    width, height = size
+    with Image.open(path) as source:
+        image = source.convert("RGB")
+    scale = max(width / image.width, height / image.height)
+    image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+    left, top = (image.width - width) // 2, (image.height - height) // 2
+    image = image.crop((left, top, left + width, top + height))
+
+    # Gradient mask: transparent over the top half, up to ~80% black at the bottom edge
+    gradient = Image.linear_gradient("L").resize((width, height))
+    mask = gradient.point(lambda value: max(0, (value - 128) * 2) * 0.8)
+    image.paste(Image.new("RGB", size, (0, 0, 0)), (0, 0), mask)
+    return image
+
+def _wrap(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        candidate = f"{current} {word}".strip()
+        if current and draw.textlength(candidate, font=font) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+def _fit_headline(draw: ImageDraw.ImageDraw, headline: str, fonts: Tuple[str, ...], box: Tuple[int, int],
+                  max_lines: int) -> Tuple[Any, List[str]]:
+    """Largest font size whose wrapped headline fits the box in at most max_lines lines"""
+    box_width, box_height = box
+    low, high = 24, max(24, box_height // 2)
+    best = (_font(fonts, low), _wrap(draw, headline, _font(fonts, low), box_width)[:max_lines])
+    while low <= high:
+        size = (low + high) // 2
+        font = _font(fonts, size)
+        lines = _wrap(draw, headline, font, box_width)
+        if len(lines) <= max_lines and len(lines) * size * 1.2 <= box_height:
+            best = (font, lines)
+            low = size + 1
+        else:
+            high = size - 1
+    return best
+
+@profiling.profiled("thumbnail.render")
+def render_thumbnail(headline: str, variant: str = "vertical", settings: Optional[Dict[str, Any]] = None) -> bytes:
+    """Render one headline thumbnail and return it as JPEG bytes"""
+    settings = settings or thumbnail_settings()
+    width, height = settings["variants"][variant]
+    fonts = tuple(settings["fonts"])
+
+    image = _background(settings["background"], (width, height)).copy()
+    draw = ImageDraw.Draw(image)
+    margin = width // 16
+
+    # Badge in the top-left corner
+    badge_font = _font(fonts, max(20, width // 20))
+    badge = settings.get("badge")
+    if badge:
+        left, top, right, bottom = draw.textbbox((0, 0), badge, font=badge_font)
+        pad = badge_font.size // 3
+        draw.rectangle((margin, margin, margin + right - left + 2 * pad, margin + bottom - top + 2 * pad),
+                       fill=(200, 16, 46))
+        draw.text((margin + pad - left, margin + pad - top), badge, font=badge_font, fill="white")
+
+    # Headline in the lower part, over the gradient
+    box = (width - 2 * margin, int(height * (0.3 if height > width else 0.4)))
+    font, lines = _fit_headline(draw, headline.upper(), fonts, box, settings.get("max_lines", 4))
+    line_height = int(font.size * 1.2)
+    y = height - margin - line_height * len(lines)
+    for line in lines:
+        draw.text((margin, y), line, font=font, fill="white", stroke_width=max(2, font.size // 18),
+                  stroke_fill="black")
+        y += line_height
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=settings.get("quality", 85), optimize=False)
+    return buffer.getvalue()
+
+def headline_for_script(parsed: Dict[str, Any]) -> str:
+    """Title, topic, or first spoken line of a parsed script"""
+    spoken = parsed.get("spoken_lines") or [""]
+    return parsed.get("title") or parsed.get("topic") or spoken[0] or "Breaking Cat News"
+
+def _warm_worker(settings: Dict[str, Any]):
+    """Process pool initializer: load fonts and scale backgrounds before the first job"""
+    # Undecorated, so --profile thumbnail.render only counts real renders
+    render = getattr(render_thumbnail, "__wrapped__", render_thumbnail)
+    for variant in settings["variants"]:
+        render("Breaking Cat News", variant, settings)
+
+def _render_job(job: Tuple[str, str, Dict[str, Any]]) -> bytes:
+    headline, variant, settings = job
+    return render_thumbnail(headline, variant, settings)
+
+class ThumbnailRenderer:
+    """Renders script thumbnails and saves them through ContentManager"""
+
+    def __init__(self, content_manager=None, settings: Optional[Dict[str, Any]] = None):
+        self.content_manager = content_manager or default_content_manager
+        self.settings = settings or thumbnail_settings()
+
+    def _saved_settings(self, headline: str, variant: str) -> Dict[str, Any]:
+        return {"headline": headline, "size": list(self.settings["variants"][variant]),
+                "background": self.settings["background"]}
+
+    def render_for_script(self, script_filepath: str, variants: Optional[List[str]] = None) -> List[str]:
+        """Render and save each variant for one script (in this process); returns the thumbnail paths"""
+        headline = headline_for_script(self.content_manager.load_parsed_script(script_filepath))
+        return [
+            self.content_manager.save_thumbnail(render_thumbnail(headline, variant, self.settings),
+                                                script_filepath, variant, self._saved_settings(headline, variant))
+            for variant in variants or list(self.settings["variants"])
+        ]
+
+    def render_batch(self, script_filepaths: List[str], variants: Optional[List[str]] = None,
+                     max_workers: Optional[int] = None) -> List[str]:
+        """
+        Render thumbnails for many scripts across a process pool.
+
+        Workers only render (CPU-bound); parsing and saving happen here so all
+        writes go through this process's ContentManager.
+        """
+        variants = variants or list(self.settings["variants"])
+        jobs = []
+        for script_filepath in script_filepaths:
+            headline = headline_for_script(self.content_manager.load_parsed_script(script_filepath))
+            jobs.extend((script_filepath, headline, variant) for variant in variants)
+        if not jobs:
+            return []
+
+        max_workers = max_workers or self.settings.get("max_workers", 4)
+        paths = []
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)), initializer=_warm_worker,
+                                 initargs=(self.settings,)) as pool:
+            results = pool.map(_render_job, [(headline, variant, self.settings) for _, headline, variant in jobs],
+                               chunksize=max(1, len(jobs) // (max_workers * 4)))
+            for (script_filepath, headline, variant), image_data in zip(jobs, results):
+                paths.append(self.content_manager.save_thumbnail(image_data, script_filepath, variant,
+                                                                 self._saved_settings(headline, variant)))
+        return paths
+
+# Global instance for easy importing
+thumbnail_renderer = ThumbnailRenderer()
+
+# Export for use in other modules
+__all__ = ['ThumbnailRenderer', 'thumbnail_renderer', 'render_thumbnail', 'headline_for_script']
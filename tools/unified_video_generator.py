@@ -9,6 +9,7 @@ import time
 import requests
 from typing import Dict, Any, List, Optional, Literal
 from config.settings import get_setting
+from utils import cost_ledger, profiling, tracing
 import google.generativeai as genai
 from google.ai.generativelanguage_v1beta.types import CreateFileRequest
 
@@ -33,7 +34,9 @@ class UnifiedVideoGenerator:
     def _setup_minimax(self):
         """Setup MiniMax API configuration"""
         self.api_key = get_setting("MINIMAX_API_KEY")
-        self.base_url = "https://api.minimax.chat/v1/video_generation"
+        provider = get_setting("VIDEO_PROVIDERS", {}).get("minimax", {})
+        self.base_url = f"{provider.get('base_url', 'https://api.minimax.chat').rstrip('/')}/v1/video_generation"
+        self.poll_seconds = provider.get("poll_seconds", 10)
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -43,7 +46,12 @@ class UnifiedVideoGenerator:
         """Setup Google Veo 3 API configuration"""
         self.api_key = get_setting("GOOGLE_API_KEY")
         if self.api_key:
-            genai.configure(api_key=self.api_key)
+            base_url = get_setting("VIDEO_PROVIDERS", {}).get("google_veo3", {}).get("base_url")
+            if base_url:
+                # A non-default endpoint (e.g. the provider fixture server) is only reachable over REST
+                genai.configure(api_key=self.api_key, transport="rest", client_options={"api_endpoint": base_url})
+            else:
+                genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
         else:
             self.model = None
@@ -51,10 +59,15 @@ class UnifiedVideoGenerator:
     def generate_video_from_prompt(self, prompt: str, duration: int = 5) -> Dict[str, Any]:
         """Generate video from text prompt using the selected provider"""
         
-        if self.provider == "minimax":
-            return self._generate_minimax_video(prompt, duration)
-        elif self.provider == "veo3":
-            return self._generate_veo3_video(prompt, duration)
+        with tracing.span("video.generate", provider=self.provider, duration=duration) as span:
+            if self.provider == "minimax":
+                result = cost_ledger.charge_render("minimax", duration,
+                                                   lambda: self._generate_minimax_video(prompt, duration))
+            elif self.provider == "veo3":
+                result = cost_ledger.charge_render("veo3", duration,
+                                                   lambda: self._generate_veo3_video(prompt, duration))
+            span.set(status=result.get("status"), mock=result.get("mock_video", False))
+            return result
     
     def _generate_minimax_video(self, prompt: str, duration: int = 5) -> Dict[str, Any]:
         """Generate video using MiniMax API"""
@@ -79,12 +92,14 @@ class UnifiedVideoGenerator:
         try:
             print(f"🎬 [MiniMax] Sending request for: {prompt[:50]}...")
             
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            with tracing.span("video.submit", provider="minimax") as span:
+                response = requests.post(
+                    self.base_url,
+                    headers=self.headers,
+                    json=payload,
+                    timeout=30
+                )
+                span.set(http_status=response.status_code)
             
             if response.status_code == 200:
                 result = response.json()
@@ -137,10 +152,11 @@ class UnifiedVideoGenerator:
             """
             
             # Generate video using Veo 3 through Gemini API
-            response = self.model.generate_content([
-                "Please generate a video based on this prompt:",
-                enhanced_prompt
-            ])
+            with tracing.span("video.submit", provider="veo3"):
+                response = self.model.generate_content([
+                    "Please generate a video based on this prompt:",
+                    enhanced_prompt
+                ])
             
             # Note: The actual Veo 3 API integration would be different
             # This is a placeholder for the correct implementation
@@ -170,6 +186,14 @@ class UnifiedVideoGenerator:
     
     def _wait_for_minimax_completion(self, task_id: str, prompt: str) -> Dict[str, Any]:
         """Wait for MiniMax video generation to complete"""
+        with tracing.span("video.poll", provider="minimax", task_id=task_id) as span:
+            result = self._poll_minimax(task_id, prompt, span)
+            span.set(status=result.get("status"))
+            return result
+    
+    @profiling.profiled("video.poll")
+    def _poll_minimax(self, task_id: str, prompt: str, span) -> Dict[str, Any]:
+        polls = 0
         status_url = f"{self.base_url}/status/{task_id}"
         max_wait_time = 300  # 5 minutes
         start_time = time.time()
@@ -179,6 +203,8 @@ class UnifiedVideoGenerator:
         while time.time() - start_time < max_wait_time:
             try:
                 response = requests.get(status_url, headers=self.headers)
+                polls += 1
+                span.set(polls=polls)
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -202,14 +228,14 @@ class UnifiedVideoGenerator:
                         }
                     
                     print(f"🔄 [MiniMax] Status: {status}...")
-                    time.sleep(10)
+                    time.sleep(self.poll_seconds)
                 else:
                     print(f"❌ [MiniMax] Status check failed: {response.status_code}")
-                    time.sleep(10)
+                    time.sleep(self.poll_seconds)
                     
             except Exception as e:
                 print(f"❌ [MiniMax] Error checking status: {str(e)}")
-                time.sleep(10)
+                time.sleep(self.poll_seconds)
         
         return {
             "status": "timeout",
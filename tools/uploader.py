@@ -0,0 +1,264 @@
+"""
+Video Uploader for Cat News Network
+Publishes queued content packages in resumable chunks, with bounded parallelism,
+per-platform concurrency and daily quotas, and retries that resume from the last
+byte the platform confirmed
+"""
+
+import re
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import get_setting
+from utils import tracing
+from utils.upload_queue import UploadQueue
+
+_RANGE = re.compile(r"bytes=0-(\d+)")
+
+# Statuses worth retrying after a pause; other 4xx responses are permanent
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 30
+
+class UploadError(Exception):
+    """An upload could not proceed (retryable says whether trying again may help)"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class SessionExpired(UploadError):
+    """The platform no longer knows the upload session; a new one starts from byte 0"""
+
+class ResumableUploader:
+    """
+    Uploads queued videos with the resumable-session protocol.
+
+    POST {endpoint} opens a session (Location header) for X-Upload-Content-Length
+    bytes; each PUT to the session sends "Content-Range: bytes start-end/total"
+    and gets 308 with "Range: bytes=0-N" until the last chunk returns 200/201
+    with the platform's {"id"}. "Content-Range: bytes */total" with no body asks
+    how much the platform has, which is how every retry and restart resumes.
+    """
+
+    def __init__(self, queue: Optional[UploadQueue] = None, settings: Optional[Dict[str, Any]] = None,
+                 session: Optional[requests.Session] = None):
+        self.settings = settings or get_setting('UPLOADS', {})
+        self.queue = queue or UploadQueue(self.settings.get('db_path', 'content/cache/upload_queue.sqlite'))
+        self.platforms = self.settings.get('platforms', {})
+        self.chunk_size = self.settings.get('chunk_size', 8 * 1024 * 1024)
+        self.max_workers = self.settings.get('max_workers', 4)
+        self.chunk_retries = self.settings.get('chunk_retries', 5)
+        self.backoff_seconds = self.settings.get('backoff_seconds', 1.0)
+        self.timeout = self.settings.get('timeout', 60)
+
+        if session is None:
+            # One keep-alive pool shared by all upload threads
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(self.platforms) or 1, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "CatNewsNetwork/1.0 (+uploader)"
+        self.session = session
+
+        self._slots = {name: threading.Semaphore(config.get('max_concurrent', 1))
+                       for name, config in self.platforms.items()}
+        self.stop_event = threading.Event()
+
+    # Protocol
+
+    def _open_session(self, upload: Dict[str, Any]) -> str:
+        endpoint = self.platforms[upload["platform"]]["endpoint"]
+        response = self.session.post(
+            endpoint,
+            json={"package_id": upload["package_id"], "metadata": upload["metadata"]},
+            headers={"X-Upload-Content-Length": str(upload["size"]), "X-Upload-Content-Type": "video/mp4"},
+            timeout=self.timeout
+        )
+        self._check(response)
+        location = response.headers.get("Location")
+        if not location:
+            raise UploadError("upload session response has no Location header", retryable=False)
+        return urljoin(endpoint, location)
+
+    def _check(self, response: requests.Response):
+        if response.status_code in (404, 410):
+            raise SessionExpired(f"upload session expired ({response.status_code})")
+        if response.status_code in RETRYABLE_STATUSES:
+            raise UploadError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise UploadError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+
+    def _result(self, response: requests.Response) -> Dict[str, Any]:
+        """{"offset"} from a 308, or {"complete": True, "remote_id"} once the upload is complete"""
+        self._check(response)
+        if response.status_code == 308:
+            match = _RANGE.match(response.headers.get("Range", ""))
+            return {"offset": int(match.group(1)) + 1 if match else 0}
+        try:
+            remote_id = response.json().get("id")
+        except ValueError:
+            remote_id = None
+        return {"complete": True, "remote_id": remote_id}
+
+    def _query_offset(self, session_url: str, size: int) -> Dict[str, Any]:
+        response = self.session.put(session_url, data=b"",
+                                    headers={"Content-Range": f"bytes */{size}"}, timeout=self.timeout)
+        return self._result(response)
+
+    def _put_chunk(self, session_url: str, data: bytes, offset: int, size: int) -> Dict[str, Any]:
+        with tracing.span("upload.chunk", offset=offset, bytes=len(data)) as span:
+            response = self.session.put(
+                session_url, data=data,
+                headers={"Content-Range": f"bytes {offset}-{offset + len(data) - 1}/{size}",
+                         "Content-Type": "video/mp4"},
+                timeout=self.timeout
+            )
+            span.set(http_status=response.status_code)
+            return self._result(response)
+
+    # Upload loop
+
+    def upload(self, upload: Dict[str, Any],
+               progress: Optional[Callable[[Dict[str, Any], int], None]] = None) -> str:
+        """
+        Upload one queued video, resuming from its stored session and offset.
+
+        Returns "complete", "failed", "stopped" (stop_event was set; the upload
+        goes back to the queue and resumes from its offset next time) or "skipped"
+        (another run claimed it first).
+        """
+        upload_id, size = upload["id"], upload["size"]
+        session_url, offset = upload["session_url"], upload["offset"]
+        if not self.queue.start(upload_id):
+            return "skipped"
+        if size == 0:
+            self.queue.fail(upload_id, "video file is empty")
+            return "failed"
+        failures = 0
+        # A stored session may hold more than the stored offset (a chunk cut off by a crash)
+        resync = session_url is not None
+
+        with open(upload["video_path"], 'rb') as video:
+            while True:
+                if self.stop_event.is_set():
+                    self.queue.requeue(upload_id)
+                    return "stopped"
+                try:
+                    if session_url is None:
+                        session_url, offset = self._open_session(upload), 0
+                        self.queue.set_session(upload_id, session_url, 0)
+                    elif resync:
+                        # Ask the platform what it actually has before sending more
+                        result = self._query_offset(session_url, size)
+                        if result.get("complete"):
+                            self.queue.complete(upload_id, result["remote_id"])
+                            return "complete"
+                        offset = result["offset"]
+                        resync = False
+
+                    video.seek(offset)
+                    result = self._put_chunk(session_url, video.read(self.chunk_size), offset, size)
+                    if result.get("complete"):
+                        self.queue.complete(upload_id, result["remote_id"])
+                        if progress:
+                            progress(upload, size)
+                        return "complete"
+                    offset = result["offset"]
+                    self.queue.set_offset(upload_id, offset)
+                    failures = 0
+                    if progress:
+                        progress(upload, offset)
+                except SessionExpired:
+                    session_url, offset, resync = None, 0, False
+                    self.queue.set_session(upload_id, None, 0)
+                    failures += 1
+                except (UploadError, requests.RequestException) as e:
+                    if isinstance(e, UploadError) and not e.retryable:
+                        self.queue.fail(upload_id, str(e))
+                        return "failed"
+                    failures += 1
+                    resync = session_url is not None
+                    if failures > self.chunk_retries:
+                        self.queue.fail(upload_id, str(e))
+                        return "failed"
+                    # Exponential backoff with jitter; the stop event cuts the wait short
+                    delay = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2 ** (failures - 1))
+                    self.stop_event.wait(delay * random.uniform(0.5, 1.0))
+                    continue
+                if failures > self.chunk_retries:
+                    self.queue.fail(upload_id, "upload session kept expiring")
+                    return "failed"
+
+    def _run_one(self, upload: Dict[str, Any], progress) -> str:
+        with self._slots[upload["platform"]], \
+                tracing.span("upload", platform=upload["platform"], package_id=upload["package_id"],
+                             size=upload["size"], resumed_from=upload["offset"]) as span:
+            try:
+                status = self.upload(upload, progress)
+            except OSError as e:
+                # The video file went missing or unreadable; nothing to retry
+                self.queue.fail(upload["id"], str(e))
+                span.fail(e)
+                status = "failed"
+            span.set(status=status)
+            return status
+
+    def run(self, platforms: Optional[List[str]] = None, max_workers: Optional[int] = None,
+            progress: Optional[Callable[[Dict[str, Any], int], None]] = None) -> Dict[str, Any]:
+        """
+        Upload everything queued for the given platforms (default: all configured), within quota.
+
+        Returns:
+            {"results": {upload_id: "complete"|"failed"|"stopped"|"skipped"}, "deferred": {platform: uploads over quota}}
+        """
+        platforms = [name for name in (platforms or list(self.platforms)) if name in self.platforms]
+        report = {"results": {}, "deferred": {}}
+
+        # Each platform takes what its rolling 24h quota allows; the rest waits for a later run
+        per_platform = []
+        for name in platforms:
+            queued = self.queue.queued(name)
+            quota = self.platforms[name].get('daily_quota')
+            allowed = len(queued) if quota is None else max(0, quota - self.queue.completed_since(name))
+            per_platform.append(queued[:allowed])
+            if len(queued) > allowed:
+                report["deferred"][name] = len(queued) - allowed
+
+        # Interleave platforms so one long queue doesn't hold every worker
+        jobs = [upload for batch in zip_longest(*per_platform) for upload in batch if upload is not None]
+        if not jobs:
+            return report
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers or self.max_workers, len(jobs)))) as executor:
+            futures = {executor.submit(tracing.propagate(self._run_one), upload, progress): upload for upload in jobs}
+            try:
+                for future in as_completed(futures):
+                    report["results"][futures[future]["id"]] = future.result()
+            except KeyboardInterrupt:
+                # Let in-flight chunks finish so the pool can shut down; the rest stays queued
+                self.stop()
+                raise
+        return report
+
+    def stop(self):
+        """Finish in-flight chunks, then leave every remaining upload queued for the next run"""
+        self.stop_event.set()
+
+def enqueue_packages(packages: List[Dict[str, Any]], platforms: Optional[List[str]] = None,
+                     queue: Optional[UploadQueue] = None) -> List[int]:
+    """Queue content packages (with videos) for upload to the given platforms (default: all configured)"""
+    settings = get_setting('UPLOADS', {})
+    queue = queue or UploadQueue(settings.get('db_path', 'content/cache/upload_queue.sqlite'))
+    platforms = platforms or list(settings.get('platforms', {}))
+    ids = []
+    for package in packages:
+        ids.extend(queue.enqueue(package, platforms))
+    return ids
+
+# Export for use in other modules
+__all__ = ['ResumableUploader', 'UploadError', 'enqueue_packages']
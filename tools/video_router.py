@@ -0,0 +1,51 @@
+"""
+Video Router for Cat News Network
+Sends each render to the first video provider, in COST_LEDGER "video_routing"
+order, whose remaining daily budget covers it
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+from config.settings import get_setting
+from utils.cost_ledger import get_cost_ledger
+
+class VideoRouter:
+    """Video generator that picks the provider per render from the cost ledger's headroom"""
+
+    def __init__(self, providers: Optional[List[str]] = None, generators: Optional[Dict[str, Any]] = None):
+        self.providers = providers or get_setting('COST_LEDGER', {}).get('video_routing', ["minimax", "veo3"])
+        self._generators = dict(generators or {})
+        self._lock = threading.Lock()
+
+    def generator(self, provider: str):
+        """The provider's generator, created on first use (so Veo 3's SDK only loads if it is routed to)"""
+        with self._lock:
+            if provider not in self._generators:
+                if provider == "minimax":
+                    from tools.ai_video_generator import MiniMaxVideoGenerator
+                    self._generators[provider] = MiniMaxVideoGenerator()
+                else:
+                    from tools.unified_video_generator import UnifiedVideoGenerator
+                    self._generators[provider] = UnifiedVideoGenerator(provider)
+            return self._generators[provider]
+
+    def choose(self, duration: int) -> str:
+        """First provider whose headroom covers this render; the preferred one when none does"""
+        ledger = get_cost_ledger()
+        for provider in self.providers:
+            if ledger.headroom(provider) >= ledger.estimate(provider, render_seconds=duration):
+                return provider
+        return self.providers[0]
+
+    def generate_video_from_prompt(self, prompt: str, duration: int = 5) -> Dict[str, Any]:
+        """Render on the chosen provider, moving down the routing order if its budget ran out meanwhile"""
+        chosen = self.choose(duration)
+        for provider in [chosen] + [name for name in self.providers if name != chosen]:
+            result = self.generator(provider).generate_video_from_prompt(prompt, duration=duration)
+            if result.get("status") != "over_budget":
+                break
+        result.setdefault("provider", provider)
+        return result
+
+# Export for use in other modules
+__all__ = ['VideoRouter']
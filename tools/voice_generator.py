@@ -0,0 +1,170 @@
+"""
+Voice Generator for Cat News Network
+Shared ElevenLabs text-to-speech layer with a content-addressed result cache
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional
+from elevenlabs import ElevenLabs
+from config.settings import ELEVENLABS_VOICE_ID, ELEVENLABS_MODEL_ID, get_setting
+from utils import cost_ledger, tracing
+from utils.audio_probe import join_mp3
+from utils.text_segmentation import split_sentences
+from utils.tts_cache import TTSCache, make_tts_key, normalize_tts_text
+
+class VoiceGenerator:
+    """ElevenLabs text-to-speech with cached results so identical requests are synthesized once"""
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[TTSCache] = None, use_cache: Optional[bool] = None):
+        self.api_key = api_key
+        cache_settings = get_setting('TTS_CACHE', {})
+        self.use_cache = cache_settings.get('enabled', True) if use_cache is None else use_cache
+        self.cache = cache or TTSCache(
+            directory=cache_settings.get('directory', 'content/cache/tts'),
+            max_bytes=cache_settings.get('max_bytes', 200 * 1024 * 1024)
+        )
+        self._client = None
+        
+        parallel_settings = get_setting('TTS_PARALLEL', {})
+        self.max_concurrency = parallel_settings.get('max_concurrency', 3)
+        self.min_sentence_chars = parallel_settings.get('min_sentence_chars', 12)
+        # Shared by every caller of this instance so concurrent requests stay within the API limit
+        self._api_slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    @property
+    def client(self) -> ElevenLabs:
+        """ElevenLabs client, created on first synthesis so cache hits never need it"""
+        if self._client is None:
+            # Read the key here rather than at import so scripts can load .env first
+            self._client = ElevenLabs(api_key=self.api_key or os.getenv('ELEVENLABS_API_KEY'),
+                                      base_url=os.getenv('ELEVENLABS_BASE_URL') or None)
+        return self._client
+
+    def synthesize(self, text: str, voice_id: Optional[str] = None, model_id: Optional[str] = None,
+                   voice_settings: Any = None) -> Iterator[bytes]:
+        """
+        Synthesize speech, streaming from the cache when the same request was made before.
+
+        Args:
+            text: Text to speak
+            voice_id: ElevenLabs voice ID (defaults to ELEVENLABS_VOICE_ID)
+            model_id: ElevenLabs model ID (defaults to ELEVENLABS_MODEL_ID)
+            voice_settings: Optional ElevenLabs VoiceSettings
+
+        Returns:
+            Iterator over MP3 audio chunks
+        """
+        voice_id = voice_id or ELEVENLABS_VOICE_ID
+        model_id = model_id or ELEVENLABS_MODEL_ID
+        text = normalize_tts_text(text)
+
+        if not self.use_cache:
+            return self._convert(text, voice_id, model_id, voice_settings)
+
+        key = make_tts_key(text, voice_id, model_id, voice_settings)
+        cached = self.cache.stream(key)
+        if cached is not None:
+            return cached
+
+        return self.cache.store_stream(key, self._convert(text, voice_id, model_id, voice_settings))
+
+    def _convert(self, text: str, voice_id: str, model_id: str, voice_settings: Any) -> Iterator[bytes]:
+        """Call the ElevenLabs API, holding a concurrency slot until the audio is fully received"""
+        kwargs = {
+            "voice_id": voice_id,
+            "text": text,
+            "model_id": model_id
+        }
+        if voice_settings is not None:
+            kwargs["voice_settings"] = voice_settings
+
+        started = time.perf_counter()
+        # Generators run in their consumer's context: parent the span there, but never make it current
+        span = tracing.start_span("tts.convert", provider="elevenlabs", model=model_id, chars=len(text))
+        received = 0
+        try:
+            # Billed by character: reserve against the budget before taking an API slot
+            with cost_ledger.track("elevenlabs", "tts", characters=len(text)), self._api_slots:
+                span.set(slot_wait_ms=round((time.perf_counter() - started) * 1000, 3))
+                for chunk in self.client.text_to_speech.convert(**kwargs):
+                    received += len(chunk)
+                    yield chunk
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            span.set(bytes=received)
+            span.end()
+
+    def synthesize_sentences(self, text: str, voice_id: Optional[str] = None, model_id: Optional[str] = None,
+                             voice_settings: Any = None, cache_sentences: bool = True,
+                             max_workers: Optional[int] = None) -> bytes:
+        """
+        Synthesize text sentence by sentence in parallel and join the MP3 frames.
+
+        Latency approaches that of the longest sentence instead of the whole
+        script. With cache_sentences, an edited script only re-synthesizes the
+        sentences that changed.
+
+        Args:
+            text: Cleaned text to speak
+            voice_id: ElevenLabs voice ID (defaults to ELEVENLABS_VOICE_ID)
+            model_id: ElevenLabs model ID (defaults to ELEVENLABS_MODEL_ID)
+            voice_settings: Optional ElevenLabs VoiceSettings
+            cache_sentences: Cache each sentence clip individually
+            max_workers: Parallel requests (defaults to the configured API concurrency)
+
+        Returns:
+            The joined MP3 audio as bytes
+        """
+        sentences = split_sentences(text, self.min_sentence_chars)
+        if len(sentences) <= 1:
+            return self.synthesize_to_bytes(text, voice_id, model_id, voice_settings)
+
+        use_cache = self.use_cache
+        def _synthesize_one(sentence: str) -> bytes:
+            if cache_sentences and use_cache:
+                return self.synthesize_to_bytes(sentence, voice_id, model_id, voice_settings)
+            return b''.join(self._convert(sentence, voice_id or ELEVENLABS_VOICE_ID,
+                                          model_id or ELEVENLABS_MODEL_ID, voice_settings))
+
+        workers = min(max_workers or self.max_concurrency, len(sentences))
+        with tracing.span("tts.synthesize_sentences", sentences=len(sentences), workers=workers) as span:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                clips = list(executor.map(tracing.propagate(_synthesize_one), sentences))
+            audio = join_mp3(clips)
+            span.set(bytes=len(audio))
+        return audio
+
+    def synthesize_to_bytes(self, text: str, voice_id: Optional[str] = None, model_id: Optional[str] = None,
+                            voice_settings: Any = None) -> bytes:
+        """Synthesize speech and return the full MP3 as bytes"""
+        return b''.join(self.synthesize(text, voice_id, model_id, voice_settings))
+
+    def synthesize_to_file(self, text: str, output_path: str, voice_id: Optional[str] = None,
+                           model_id: Optional[str] = None, voice_settings: Any = None,
+                           parallel: bool = False) -> str:
+        """Synthesize speech and write it to output_path (sentence-parallel if requested)"""
+        if parallel:
+            audio = self.synthesize_sentences(text, voice_id, model_id, voice_settings)
+            with open(output_path, 'wb') as f:
+                f.write(audio)
+            return output_path
+
+        with open(output_path, 'wb') as f:
+            for chunk in self.synthesize(text, voice_id, model_id, voice_settings):
+                f.write(chunk)
+
+        return output_path
+
+    def is_cached(self, text: str, voice_id: Optional[str] = None, model_id: Optional[str] = None,
+                  voice_settings: Any = None) -> bool:
+        """Check whether a request would be served from the cache"""
+        key = make_tts_key(text, voice_id or ELEVENLABS_VOICE_ID, model_id or ELEVENLABS_MODEL_ID, voice_settings)
+        return self.cache.contains(key)
+
+# Global instance for easy access
+voice_generator = VoiceGenerator()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Audio Probe for AI Cat News Network
+Reads MP3 durations from frame headers and Xing/VBRI tags without decoding,
+and joins MP3 clips at frame level without re-encoding
+"""
+import os
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+
+# Bitrate tables in kbps, indexed by [version_family][layer][bitrate_index]
+# version_family: 1 = MPEG-1, 2 = MPEG-2 / MPEG-2.5
+_BITRATES = {
+    1: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    2: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates in Hz, indexed by version bits then sample rate index
+_SAMPLE_RATES = {
+    0b11: [44100, 48000, 32000],  # MPEG-1
+    0b10: [22050, 24000, 16000],  # MPEG-2
+    0b00: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+# Bytes read from the start of a file when looking for a Xing/VBRI tag
+_HEAD_READ_SIZE = 64 * 1024
+
+def parse_frame_header(header: bytes) -> Optional[Dict[str, Any]]:
+    """Parse a 4-byte MPEG audio frame header, returning None if it is not valid"""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (header[1] >> 3) & 0b11
+    layer_bits = (header[1] >> 1) & 0b11
+    bitrate_index = (header[2] >> 4) & 0x0F
+    sample_rate_index = (header[2] >> 2) & 0b11
+    padding = (header[2] >> 1) & 0b1
+    channel_mode = (header[3] >> 6) & 0b11
+
+    # Reserved or free-format values cannot be walked without decoding
+    if version_bits == 0b01 or layer_bits == 0b00:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    family = 1 if version_bits == 0b11 else 2
+    bitrate = _BITRATES[family][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or family == 1:
+        samples_per_frame = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples_per_frame = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    return {
+        "version_bits": version_bits,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples_per_frame": samples_per_frame,
+        "frame_length": frame_length,
+        "mono": channel_mode == 0b11,
+    }
+
+def id3v2_size(data: bytes) -> int:
+    """Return the total size of a leading ID3v2 tag (0 if there is none)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+def audio_end(data: bytes) -> int:
+    """Return the offset where audio frames end (excludes a trailing ID3v1 tag)"""
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        return len(data) - 128
+    return len(data)
+
+def find_first_frame(data: bytes, start: int = 0) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """Find the first frame header at or after start that is followed by another valid frame"""
+    end = len(data)
+    position = data.find(b"\xFF", start)
+
+    while 0 <= position < end - 4:
+        header = parse_frame_header(data[position:position + 4])
+        if header:
+            following = position + header["frame_length"]
+            # Require a second header to avoid locking onto a stray 0xFF in tag data
+            if following >= end - 4 or parse_frame_header(data[following:following + 4]):
+                return position, header
+        position = data.find(b"\xFF", position + 1)
+
+    return None
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (offset, header) for every MPEG audio frame in data, skipping tags"""
+    first = find_first_frame(data, id3v2_size(data))
+    if not first:
+        return
+
+    position, header = first
+    end = audio_end(data)
+
+    while header and position + header["frame_length"] <= end:
+        yield position, header
+        position += header["frame_length"]
+        header = parse_frame_header(data[position:position + 4])
+        if not header and position < end - 4:
+            # Resync after garbage between frames rather than giving up
+            resync = find_first_frame(data, position + 1)
+            if resync:
+                position, header = resync
+
+def _side_info_size(header: Dict[str, Any]) -> int:
+    """Size of the Layer III side information that precedes a Xing tag"""
+    if header["version_bits"] == 0b11:
+        return 17 if header["mono"] else 32
+    return 9 if header["mono"] else 17
+
+def read_vbr_tag(data: bytes, offset: int, header: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Read a Xing/Info or VBRI tag from the frame at offset, if present"""
+    xing_offset = offset + 4 + _side_info_size(header)
+    tag_id = data[xing_offset:xing_offset + 4]
+
+    if tag_id in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing_offset + 4:xing_offset + 8], "big")
+        cursor = xing_offset + 8
+        frames = None
+        byte_count = None
+        if flags & 0x1:
+            frames = int.from_bytes(data[cursor:cursor + 4], "big")
+            cursor += 4
+        if flags & 0x2:
+            byte_count = int.from_bytes(data[cursor:cursor + 4], "big")
+        return {"tag": tag_id.decode("ascii"), "frames": frames, "bytes": byte_count}
+
+    vbri_offset = offset + 4 + 32
+    if data[vbri_offset:vbri_offset + 4] == b"VBRI":
+        return {
+            "tag": "VBRI",
+            "bytes": int.from_bytes(data[vbri_offset + 10:vbri_offset + 14], "big"),
+            "frames": int.from_bytes(data[vbri_offset + 14:vbri_offset + 18], "big"),
+        }
+
+    return None
+
+def _read_head(filepath: str) -> bytes:
+    """Read enough of a file to cover the ID3v2 tag and the first audio frames"""
+    with open(filepath, "rb") as f:
+        data = f.read(_HEAD_READ_SIZE)
+        tag_size = id3v2_size(data)
+        if tag_size:
+            # Embedded cover art can push the first frame past the initial read
+            data += f.read(tag_size)
+    return data
+
+def probe_mp3(source: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+    """
+    Probe an MP3 file or buffer for its duration without decoding audio.
+
+    Args:
+        source: Path to an MP3 file or the raw MP3 bytes
+
+    Returns:
+        Dictionary with duration_seconds, sample_rate, bitrate_kbps, frames and
+        method ("xing", "vbri" or "frame_scan"), or None if no MPEG audio was found
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+        complete = True
+    else:
+        data = _read_head(source)
+        complete = len(data) >= os.path.getsize(source)
+
+    first = find_first_frame(data, id3v2_size(data))
+    if not first:
+        return None
+
+    offset, header = first
+    tag = read_vbr_tag(data, offset, header) if header["layer"] == 3 else None
+
+    if tag and tag.get("frames"):
+        duration = tag["frames"] * header["samples_per_frame"] / header["sample_rate"]
+        audio_bytes = tag.get("bytes")
+        bitrate_kbps = (audio_bytes * 8 / duration / 1000) if audio_bytes and duration else header["bitrate"] / 1000
+        return {
+            "duration_seconds": round(duration, 3),
+            "sample_rate": header["sample_rate"],
+            "bitrate_kbps": round(bitrate_kbps, 1),
+            "frames": tag["frames"],
+            "method": "vbri" if tag["tag"] == "VBRI" else "xing",
+        }
+
+    # No tag: walk every frame header (still no decoding) to count samples
+    if not complete:
+        with open(source, "rb") as f:
+            data = f.read()
+
+    frames = 0
+    samples = 0
+    audio_bytes = 0
+    for _, frame in iter_frames(data):
+        frames += 1
+        samples += frame["samples_per_frame"]
+        audio_bytes += frame["frame_length"]
+
+    if not frames:
+        return None
+
+    duration = samples / header["sample_rate"]
+    return {
+        "duration_seconds": round(duration, 3),
+        "sample_rate": header["sample_rate"],
+        "bitrate_kbps": round(audio_bytes * 8 / duration / 1000, 1) if duration else 0.0,
+        "frames": frames,
+        "method": "frame_scan",
+    }
+
+def get_mp3_duration(source: Union[str, bytes]) -> Optional[float]:
+    """Get MP3 duration in seconds, or None if it cannot be determined"""
+    try:
+        info = probe_mp3(source)
+    except (OSError, ValueError):
+        return None
+    return info["duration_seconds"] if info else None
+
+def extract_audio_frames(data: bytes) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+    """
+    Return the raw MPEG audio frames of a clip with ID3 tags and any Xing/VBRI
+    header frame removed, plus the header of the first audio frame.
+    """
+    frames = []
+    first_header = None
+
+    for index, (offset, header) in enumerate(iter_frames(data)):
+        # The tag frame holds no audio; it would describe the wrong length after joining
+        if index == 0 and header["layer"] == 3 and read_vbr_tag(data, offset, header):
+            continue
+        if first_header is None:
+            first_header = header
+        frames.append(data[offset:offset + header["frame_length"]])
+
+    return b"".join(frames), first_header
+
+def join_mp3(clips: List[bytes]) -> bytes:
+    """
+    Join MP3 clips at frame boundaries without re-encoding.
+
+    All clips must share sample rate and MPEG version (true for clips from the
+    same TTS output format). Raises ValueError otherwise.
+    """
+    joined = []
+    reference = None
+
+    for clip in clips:
+        frames, header = extract_audio_frames(clip)
+        if header is None:
+            continue
+        if reference is None:
+            reference = header
+        elif (header["sample_rate"], header["version_bits"], header["layer"]) != \
+                (reference["sample_rate"], reference["version_bits"], reference["layer"]):
+            raise ValueError(
+                f"Cannot join MP3 clips with different formats: "
+                f"{reference['sample_rate']} Hz vs {header['sample_rate']} Hz"
+            )
+        joined.append(frames)
+
+    return b"".join(joined)
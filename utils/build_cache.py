@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Build Cache for AI Cat News Network
+Make-style memoization of pipeline stages keyed by a fingerprint of their declared inputs
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+# Sentinel for "no cached result" (None is a valid stage result)
+MISS = object()
+
+# Fingerprints remembered per stage name
+MAX_ENTRIES_PER_STAGE = 500
+
+def fingerprint(stage_name: str, declared_inputs: Dict[str, Any], version: str = "1") -> str:
+    """Hash a stage's declared inputs (plus its name and version) into a fingerprint"""
+    payload = json.dumps({"stage": stage_name, "version": version, "inputs": declared_inputs},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def file_digest(filepath: str) -> str:
+    """Hash a file's content so edits to an artifact change downstream fingerprints"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class BuildCache:
+    """
+    Index of stage outputs by fingerprint.
+
+    File artifacts (paths returned by a stage) also get the fingerprint written
+    into their ContentManager metadata; a cached path is only reused while the
+    file exists and its metadata still carries the same fingerprint.
+    """
+
+    def __init__(self, content_manager, index_path: Optional[str] = None):
+        self.content_manager = content_manager
+        self.index_path = index_path or os.path.join(content_manager.base_path, "cache", "build_index.json")
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def lookup(self, stage_name: str, stage_fingerprint: str) -> Any:
+        """Return the stored output for a fingerprint, or MISS"""
+        with self._lock:
+            entry = self._index.get(stage_name, {}).get(stage_fingerprint)
+        if not entry:
+            return MISS
+
+        if "artifact" in entry:
+            artifact = entry["artifact"]
+            if not os.path.exists(artifact):
+                return MISS
+            if self.content_manager.load_metadata(artifact).get("fingerprint") != stage_fingerprint:
+                return MISS
+            return artifact
+
+        return entry.get("result", MISS)
+
+    def record(self, stage_name: str, stage_fingerprint: str, result: Any):
+        """Store a stage output under its fingerprint"""
+        if isinstance(result, str) and os.path.isfile(result):
+            self.content_manager.update_metadata(result, {"fingerprint": stage_fingerprint, "stage": stage_name})
+            entry = {"artifact": result}
+        else:
+            entry = {"result": result}
+
+        with self._lock:
+            entries = self._index.setdefault(stage_name, {})
+            entries[stage_fingerprint] = entry
+            # Keep the index small: oldest fingerprints per stage fall out first
+            while len(entries) > MAX_ENTRIES_PER_STAGE:
+                del entries[next(iter(entries))]
+            self._save()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Provider Cassettes for AI Cat News Network
+Recorded provider HTTP interactions (Groq, ElevenLabs, MiniMax, Google) in one
+compact file, and the request matching used to replay them
+
+A cassette is a zip archive: cassette.json lists the interactions in the order
+they happened, and every request and response body is stored once under
+blobs/<sha256> (deflated), so repeated TTS clips or poll responses cost nothing.
+"""
+import re
+import os
+import json
+import time
+import zipfile
+import hashlib
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+CASSETTE_VERSION = 1
+
+# Query parameters and headers that carry credentials are never written to a cassette
+SECRET_PARAMS = {"key", "api_key", "xi-api-key"}
+# Response headers worth replaying; the rest (dates, rate-limit counters, encodings) are dropped
+KEPT_HEADERS = {"content-type", "location", "range", "retry-after"}
+
+# Path segments that are IDs (task IDs, voice IDs): long tokens containing a digit
+_ID_SEGMENT = re.compile(r"^(?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{16,}$")
+
+def provider_for(path: str) -> str:
+    """Which provider an API path belongs to"""
+    if path.startswith("/openai/"):
+        return "groq"
+    if path.startswith("/v1/text-to-speech"):
+        return "elevenlabs"
+    if path.startswith("/v1/video_generation"):
+        return "minimax"
+    if path.startswith("/v1beta/") or path.startswith("/v1/models"):
+        return "google"
+    return "other"
+
+def clean_query(query: str) -> str:
+    """Query string without credentials, parameters sorted"""
+    return urlencode(sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                            if name.lower() not in SECRET_PARAMS))
+
+def _canonical_body(body: bytes) -> Tuple[bytes, List[str]]:
+    """JSON bodies re-serialized with sorted keys (plus their top-level keys); anything else as is"""
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return body, []
+    if not isinstance(data, dict):
+        return body, []
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8"), sorted(data)
+
+def request_key(method: str, path: str, query: str, body: bytes) -> str:
+    """Exact match: the same call with the same payload"""
+    canonical, _ = _canonical_body(body)
+    digest = hashlib.sha256(canonical).hexdigest()[:32]
+    return f"{method} {path}?{clean_query(query)} {digest}"
+
+def route_key(method: str, path: str, body: bytes) -> str:
+    """
+    Loose match: the same kind of call, whatever the payload.
+
+    IDs in the path are wildcarded and the request's top-level JSON keys are
+    included, so a JSON-mode completion never stands in for a plain one.
+    """
+    _, keys = _canonical_body(body)
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return f"{method} {'/'.join(segments)} {','.join(keys)}"
+
+class Cassette:
+    """Interactions plus their content-addressed bodies; safe to record into from many threads"""
+
+    def __init__(self, interactions: Optional[List[Dict[str, Any]]] = None,
+                 blobs: Optional[Dict[str, bytes]] = None, meta: Optional[Dict[str, Any]] = None):
+        self.interactions = interactions or []
+        self.blobs = blobs or {}
+        self.meta = meta or {"version": CASSETTE_VERSION, "recorded": datetime.now().isoformat(timespec="seconds")}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def _store(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        self.blobs.setdefault(digest, data)
+        return digest
+
+    def record(self, method: str, path: str, query: str, request_body: bytes, status: int,
+               headers: Dict[str, str], response_body: bytes, elapsed_ms: float) -> Dict[str, Any]:
+        """Add one request/response pair (credentials stripped, bodies stored once)"""
+        with self._lock:
+            interaction = {
+                "provider": provider_for(path),
+                "method": method,
+                "path": path,
+                "query": clean_query(query),
+                "key": request_key(method, path, query, request_body),
+                "route": route_key(method, path, request_body),
+                "request": self._store(request_body),
+                "status": status,
+                "headers": {name.lower(): value for name, value in headers.items()
+                            if name.lower() in KEPT_HEADERS},
+                "response": self._store(response_body),
+                "elapsed_ms": round(elapsed_ms, 1),
+                "at_ms": round((time.time() - self._started) * 1000 - elapsed_ms, 1)
+            }
+            self.interactions.append(interaction)
+        return interaction
+
+    def body(self, digest: str) -> bytes:
+        return self.blobs[digest]
+
+    def save(self, path: str):
+        """Write the cassette atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with self._lock, zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("cassette.json", json.dumps({"meta": self.meta, "interactions": self.interactions},
+                                                         indent=1))
+            for digest, data in self.blobs.items():
+                archive.writestr(f"blobs/{digest}", data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read("cassette.json"))
+            blobs = {name.split("/", 1)[1]: archive.read(name)
+                     for name in archive.namelist() if name.startswith("blobs/")}
+        if index.get("meta", {}).get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path}: unsupported cassette version {index.get('meta', {}).get('version')}")
+        return cls(index["interactions"], blobs, index["meta"])
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Interactions, errors, response bytes and recorded time per provider"""
+        providers: Dict[str, Dict[str, Any]] = {}
+        for interaction in self.interactions:
+            entry = providers.setdefault(interaction["provider"], {"interactions": 0, "errors": 0,
+                                                                   "response_bytes": 0, "elapsed_ms": 0.0})
+            entry["interactions"] += 1
+            entry["errors"] += interaction["status"] >= 400
+            entry["response_bytes"] += len(self.blobs.get(interaction["response"], b""))
+            entry["elapsed_ms"] += interaction["elapsed_ms"]
+        return providers
+
+class CassettePlayer:
+    """
+    Serves recorded responses for incoming requests.
+
+    An exact match (same call, same payload) replays that call's recordings in
+    order, so a video task's processing -> completed poll sequence comes back
+    poll for poll; once they run out the last one repeats. Without an exact
+    match, unless strict, the next recording of the same kind of call is served
+    (cycling), so a changed prompt still gets a realistic response.
+    """
+
+    def __init__(self, cassette: Cassette, strict: bool = False):
+        self.cassette = cassette
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._exact: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._routes: Dict[str, Deque[Dict[str, Any]]] = {}
+        for interaction in cassette.interactions:
+            self._exact.setdefault(interaction["key"], deque()).append(interaction)
+            self._routes.setdefault(interaction["route"], deque()).append(interaction)
+        self.stats = {"exact": 0, "route": 0, "missed": 0}
+
+    def match(self, method: str, path: str, query: str, body: bytes) -> Optional[Dict[str, Any]]:
+        """The interaction to replay, or None when nothing fits"""
+        key = request_key(method, path, query, body)
+        with self._lock:
+            recordings = self._exact.get(key)
+            if recordings:
+                interaction = recordings.popleft()
+                self._last[key] = interaction
+                self.stats["exact"] += 1
+                return interaction
+            if key in self._last:
+                self.stats["exact"] += 1
+                return self._last[key]
+            routes = None if self.strict else self._routes.get(route_key(method, path, body))
+            if routes:
+                interaction = routes[0]
+                routes.rotate(-1)
+                self.stats["route"] += 1
+                return interaction
+            self.stats["missed"] += 1
+            return None
+
+# Export for use in other modules
+__all__ = ['Cassette', 'CassettePlayer', 'provider_for', 'request_key', 'route_key']
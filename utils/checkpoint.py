@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Batch Checkpoints for AI Cat News Network
+Records which (topic, idea, stage) units of a batch run are complete and where
+their artifacts are, so a rerun with the same run ID resumes at the missing units
+"""
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created TEXT NOT NULL,
+    params TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    run_id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    idea TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    artifact TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (run_id, topic, idea, stage)
+);
+"""
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _to_artifact(result: Any) -> Any:
+    """JSON-safe form of a unit result (crew outputs are kept as their text)"""
+    try:
+        json.dumps(result)
+        return result
+    except (TypeError, ValueError):
+        return {"raw": str(getattr(result, "raw", result))}
+
+class BatchCheckpoint:
+    """
+    Checkpoint table for one batch run.
+
+    Units are committed as they finish, so a crashed or killed batch (e.g. a
+    worker restarted during a deploy) loses at most the units that were in
+    flight; those stay "running" or "failed" and are redone on resume.
+    """
+
+    def __init__(self, run_id: str, db_path: str = "content/cache/batch_checkpoints.sqlite"):
+        self.run_id = run_id
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def register_run(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the run's parameters on first use and return the stored ones"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, created, params) VALUES (?, ?, ?)",
+                (self.run_id, _now(), json.dumps(params))
+            )
+            self._conn.commit()
+            row = self._conn.execute("SELECT params FROM runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        return json.loads(row[0])
+
+    def get_run_params(self) -> Optional[Dict[str, Any]]:
+        """Parameters the run was started with, or None for a new run"""
+        with self._lock:
+            row = self._conn.execute("SELECT params FROM runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, topic: str, idea: str, stage: str, status: str,
+             artifact: Any = None, error: Optional[str] = None, attempt: bool = False):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO units (run_id, topic, idea, stage, status, artifact, error, attempts, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, topic, idea, stage) DO UPDATE SET
+                    status = excluded.status, artifact = excluded.artifact, error = excluded.error,
+                    attempts = units.attempts + ?, updated = excluded.updated
+                """,
+                (self.run_id, topic, idea, stage, status,
+                 None if artifact is None else json.dumps(artifact), error,
+                 1 if attempt else 0, _now(), 1 if attempt else 0)
+            )
+            self._conn.commit()
+
+    def get(self, topic: str, idea: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Get a unit's row, or None if it was never started"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, artifact, error, attempts, updated FROM units "
+                "WHERE run_id = ? AND topic = ? AND idea = ? AND stage = ?",
+                (self.run_id, topic, idea, stage)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row[0],
+            "artifact": json.loads(row[1]) if row[1] is not None else None,
+            "error": row[2],
+            "attempts": row[3],
+            "updated": row[4]
+        }
+
+    def start(self, topic: str, idea: str, stage: str):
+        self._set(topic, idea, stage, "running", attempt=True)
+
+    def complete(self, topic: str, idea: str, stage: str, artifact: Any):
+        self._set(topic, idea, stage, "complete", artifact=artifact)
+
+    def fail(self, topic: str, idea: str, stage: str, error: str):
+        self._set(topic, idea, stage, "failed", error=error)
+
+    def run_unit(self, topic: str, idea: str, stage: str, func: Callable[[], Any]) -> Any:
+        """
+        Return a completed unit's artifact, or run func and checkpoint its result.
+
+        Results are stored in JSON form; a resumed unit returns that stored form.
+        """
+        unit = self.get(topic, idea, stage)
+        if unit and unit["status"] == "complete":
+            return unit["artifact"]
+
+        self.start(topic, idea, stage)
+        try:
+            result = func()
+        except Exception as e:
+            self.fail(topic, idea, stage, str(e))
+            raise
+        self.complete(topic, idea, stage, _to_artifact(result))
+        return result
+
+    def units(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List the run's units, optionally filtered by status"""
+        query = "SELECT topic, idea, stage, status, artifact, error, attempts, updated FROM units WHERE run_id = ?"
+        params = [self.run_id]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return [{
+            "topic": row[0], "idea": row[1], "stage": row[2], "status": row[3],
+            "artifact": json.loads(row[4]) if row[4] is not None else None,
+            "error": row[5], "attempts": row[6], "updated": row[7]
+        } for row in rows]
+
+    def summary(self) -> Dict[str, int]:
+        """Unit counts by status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM units WHERE run_id = ? GROUP BY status", (self.run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,10 +4,15 @@ Content Manager for AI Cat News Network
 Handles organized content storage and retrieval
 """
 import os
+import glob
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from utils import profiling, tracing
+from utils.audio_probe import probe_mp3, get_mp3_duration
+from utils.script_parser import parse_script, script_hash, PARSER_VERSION
+
 class ContentManager:
     """Manages organized content storage for AI Cat News Network"""
     
@@ -18,6 +23,7 @@ class ContentManager:
         self.scripts_path = os.path.join(base_path, "scripts")
         self.audio_path = os.path.join(base_path, "audio")
         self.video_path = os.path.join(base_path, "video")
+        self.thumbnails_path = os.path.join(base_path, "thumbnails")
         
         # Ensure all directories exist
         self._ensure_directories()
@@ -25,18 +31,34 @@ class ContentManager:
     def _ensure_directories(self):
         """Create all content directories if they don't exist"""
         for path in [self.newsitems_path, self.ideas_path, self.scripts_path, 
-                     self.audio_path, self.video_path]:
+                     self.audio_path, self.video_path, self.thumbnails_path]:
             os.makedirs(path, exist_ok=True)
     
     def _generate_timestamp(self) -> str:
         """Generate timestamp for file naming"""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
     
+    def _unique_filepath(self, filepath: str) -> str:
+        """Reserve a free filename, adding a counter when several items are saved in the same second"""
+        base, ext = os.path.splitext(filepath)
+        candidate = filepath
+        counter = 0
+        while True:
+            try:
+                # Exclusive create so concurrent pipeline workers never pick the same name
+                with open(candidate, 'x'):
+                    return candidate
+            except FileExistsError:
+                counter += 1
+                candidate = f"{base}_{counter}{ext}"
+    
+    @tracing.traced("content.save_news_item")
+    @profiling.profiled("content.save")
     def save_news_item(self, topic: str, source: str = "real_news", metadata: Optional[Dict] = None) -> str:
         """Save a news item/topic for processing"""
         timestamp = self._generate_timestamp()
         filename = f"newsitem_{timestamp}.json"
-        filepath = os.path.join(self.newsitems_path, filename)
+        filepath = self._unique_filepath(os.path.join(self.newsitems_path, filename))
         
         news_data = {
             "timestamp": timestamp,
@@ -50,12 +72,56 @@ class ContentManager:
             json.dump(news_data, f, indent=2, ensure_ascii=False)
         
         return filepath
-    
+
+    @tracing.traced("content.get_pending_news_items")
+    def get_pending_news_items(self, source_prefix: Optional[str] = None) -> list:
+        """Pending news items, oldest first, optionally only from sources starting with source_prefix"""
+        pending = []
+        for file_info in reversed(self.get_latest_files("newsitems", limit=None)):
+            try:
+                with open(file_info["filepath"], 'r', encoding='utf-8') as f:
+                    news_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if news_data.get("status") != "pending":
+                continue
+            if source_prefix and not news_data.get("source", "").startswith(source_prefix):
+                continue
+            news_data["filepath"] = file_info["filepath"]
+            pending.append(news_data)
+        return pending
+
+    @tracing.traced("content.set_news_item_status")
+    def set_news_item_status(self, news_item_filepath: str, status: str, **fields) -> Dict[str, Any]:
+        """Update a news item's status (plus any extra top-level fields)"""
+        with open(news_item_filepath, 'r', encoding='utf-8') as f:
+            news_data = json.load(f)
+        news_data.update(fields, status=status)
+
+        with open(news_item_filepath, 'w', encoding='utf-8') as f:
+            json.dump(news_data, f, indent=2, ensure_ascii=False)
+
+        return news_data
+
+    @tracing.traced("content.merge_news_item_source")
+    def merge_news_item_source(self, news_item_filepath: str, source_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Record another outlet's version of the same story on an existing news item"""
+        with open(news_item_filepath, 'r', encoding='utf-8') as f:
+            news_data = json.load(f)
+        news_data.setdefault("metadata", {}).setdefault("also_reported_by", []).append(source_info)
+
+        with open(news_item_filepath, 'w', encoding='utf-8') as f:
+            json.dump(news_data, f, indent=2, ensure_ascii=False)
+
+        return news_data
+
+    @tracing.traced("content.save_script")
+    @profiling.profiled("content.save")
     def save_script(self, content: str, news_item_id: Optional[str] = None, script_type: str = "cat_news") -> str:
         """Save a generated script"""
         timestamp = self._generate_timestamp()
         filename = f"script_{script_type}_{timestamp}.txt"
-        filepath = os.path.join(self.scripts_path, filename)
+        filepath = self._unique_filepath(os.path.join(self.scripts_path, filename))
         
         # Save script content
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -75,18 +141,62 @@ class ContentManager:
         with open(metadata_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2)
         
+        # Parse once and store the structured form so downstream stages never re-parse
+        self._write_parsed_script(filepath, parse_script(content))
+        
         return filepath
     
-    def save_audio(self, audio_data: bytes, script_filepath: str, voice_settings: Optional[Dict] = None) -> str:
-        """Save generated audio file"""
+    def get_parsed_script_path(self, script_filepath: str) -> str:
+        """Get the path of the structured parse stored alongside a script"""
+        return os.path.splitext(script_filepath)[0] + '_parsed.json'
+    
+    def _write_parsed_script(self, script_filepath: str, parsed: Dict[str, Any]):
+        """Write the structured parse alongside its script"""
+        with open(self.get_parsed_script_path(script_filepath), 'w', encoding='utf-8') as f:
+            json.dump(parsed, f, indent=2, ensure_ascii=False)
+    
+    @tracing.traced("content.load_parsed_script")
+    def load_parsed_script(self, script_filepath: str) -> Dict[str, Any]:
+        """
+        Load the structured form of a script (sections, spoken lines, stage
+        directions, visual cues), re-parsing only if the cached parse is
+        missing, stale, or from an older parser version.
+        """
+        with open(script_filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        parsed_file = self.get_parsed_script_path(script_filepath)
+        if os.path.exists(parsed_file):
+            try:
+                with open(parsed_file, 'r', encoding='utf-8') as f:
+                    parsed = json.load(f)
+                if (parsed.get("parser_version") == PARSER_VERSION and
+                        parsed.get("source_hash") == script_hash(content)):
+                    return parsed
+            except (OSError, ValueError):
+                pass
+        
+        parsed = parse_script(content)
+        self._write_parsed_script(script_filepath, parsed)
+        return parsed
+    
+    @tracing.traced("content.save_audio")
+    @profiling.profiled("content.save")
+    def save_audio(self, audio_data: bytes, script_filepath: str, voice_settings: Optional[Dict] = None,
+                   spoken_text: Optional[str] = None) -> str:
+        """Save generated audio file (spoken_text feeds duration estimator calibration)"""
         timestamp = self._generate_timestamp()
         script_name = os.path.basename(script_filepath).replace('.txt', '')
         filename = f"audio_{script_name}_{timestamp}.mp3"
-        filepath = os.path.join(self.audio_path, filename)
+        filepath = self._unique_filepath(os.path.join(self.audio_path, filename))
         
         # Save audio file
         with open(filepath, 'wb') as f:
             f.write(audio_data)
+        tracing.annotate(bytes=len(audio_data))
+        
+        # Probe duration from the MP3 headers now so later readers never decode the audio
+        audio_info = probe_mp3(audio_data) or {}
         
         # Save metadata
         metadata_file = filepath.replace('.mp3', '_metadata.json')
@@ -95,24 +205,34 @@ class ContentManager:
             "script_filepath": script_filepath,
             "voice_settings": voice_settings or {},
             "audio_filepath": filepath,
-            "file_size_kb": len(audio_data) / 1024
+            "file_size_kb": len(audio_data) / 1024,
+            "duration_seconds": audio_info.get("duration_seconds"),
+            "sample_rate": audio_info.get("sample_rate"),
+            "bitrate_kbps": audio_info.get("bitrate_kbps")
         }
+        if spoken_text is not None:
+            metadata["spoken_text"] = spoken_text
+            metadata["character_count"] = len(spoken_text)
+            metadata["word_count"] = len(spoken_text.split())
         
         with open(metadata_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2)
         
         return filepath
     
+    @tracing.traced("content.save_video")
+    @profiling.profiled("content.save")
     def save_video(self, video_data: bytes, audio_filepath: str, video_settings: Optional[Dict] = None) -> str:
         """Save generated video file"""
         timestamp = self._generate_timestamp()
         audio_name = os.path.basename(audio_filepath).replace('.mp3', '')
         filename = f"video_{audio_name}_{timestamp}.mp4"
-        filepath = os.path.join(self.video_path, filename)
+        filepath = self._unique_filepath(os.path.join(self.video_path, filename))
         
         # Save video file
         with open(filepath, 'wb') as f:
             f.write(video_data)
+        tracing.annotate(bytes=len(video_data))
         
         # Save metadata
         metadata_file = filepath.replace('.mp4', '_metadata.json')
@@ -129,11 +249,41 @@ class ContentManager:
         
         return filepath
     
+    @tracing.traced("content.save_thumbnail")
+    @profiling.profiled("content.save")
+    def save_thumbnail(self, image_data: bytes, script_filepath: str, variant: str = "vertical",
+                       thumbnail_settings: Optional[Dict] = None) -> str:
+        """Save a rendered thumbnail (JPEG) for a script"""
+        timestamp = self._generate_timestamp()
+        script_name = os.path.basename(script_filepath).replace('.txt', '')
+        filename = f"thumb_{script_name}_{variant}_{timestamp}.jpg"
+        filepath = self._unique_filepath(os.path.join(self.thumbnails_path, filename))
+        
+        with open(filepath, 'wb') as f:
+            f.write(image_data)
+        tracing.annotate(bytes=len(image_data))
+        
+        metadata = {
+            "timestamp": timestamp,
+            "script_filepath": script_filepath,
+            "variant": variant,
+            "thumbnail_settings": thumbnail_settings or {},
+            "thumbnail_filepath": filepath,
+            "file_size_kb": len(image_data) / 1024
+        }
+        
+        with open(self.get_metadata_path(filepath), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        
+        return filepath
+    
+    @tracing.traced("content.save_idea")
+    @profiling.profiled("content.save")
     def save_idea(self, idea: str, category: str = "general", metadata: Optional[Dict] = None) -> str:
         """Save a content idea for future use"""
         timestamp = self._generate_timestamp()
         filename = f"idea_{category}_{timestamp}.json"
-        filepath = os.path.join(self.ideas_path, filename)
+        filepath = self._unique_filepath(os.path.join(self.ideas_path, filename))
         
         idea_data = {
             "timestamp": timestamp,
@@ -148,14 +298,56 @@ class ContentManager:
         
         return filepath
     
-    def get_latest_files(self, content_type: str, limit: int = 5) -> list:
-        """Get the latest files of a specific content type"""
+    def get_metadata_path(self, filepath: str) -> str:
+        """Get the metadata sidecar path for a content file"""
+        return os.path.splitext(filepath)[0] + '_metadata.json'
+    
+    @tracing.traced("content.load_metadata")
+    def load_metadata(self, filepath: str) -> Dict[str, Any]:
+        """Load the metadata sidecar for a content file (empty dict if missing)"""
+        metadata_file = self.get_metadata_path(filepath)
+        if not os.path.exists(metadata_file):
+            return {}
+        try:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @tracing.traced("content.update_metadata")
+    def update_metadata(self, filepath: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge updates into the metadata sidecar for a content file"""
+        metadata = self.load_metadata(filepath)
+        metadata.update(updates)
+        
+        with open(self.get_metadata_path(filepath), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        
+        return metadata
+    
+    def get_audio_duration(self, audio_filepath: str) -> Optional[float]:
+        """Get audio duration in seconds from metadata, probing and caching it if missing"""
+        duration = self.load_metadata(audio_filepath).get("duration_seconds")
+        if duration is not None:
+            return duration
+        
+        # Older audio files predate the probe - fill in their metadata once
+        duration = get_mp3_duration(audio_filepath)
+        if duration is not None:
+            self.update_metadata(audio_filepath, {"duration_seconds": duration})
+        
+        return duration
+    
+    @tracing.traced("content.get_latest_files")
+    def get_latest_files(self, content_type: str, limit: Optional[int] = 5) -> list:
+        """Get the latest files of a specific content type (limit=None for all)"""
         type_mapping = {
             "newsitems": (self.newsitems_path, ['.json']),
             "scripts": (self.scripts_path, ['.txt']),
             "audio": (self.audio_path, ['.mp3']),
             "video": (self.video_path, ['.mp4']),
-            "ideas": (self.ideas_path, ['.json'])
+            "ideas": (self.ideas_path, ['.json']),
+            "thumbnails": (self.thumbnails_path, ['.jpg'])
         }
         
         if content_type not in type_mapping:
@@ -167,7 +359,7 @@ class ContentManager:
         for filename in os.listdir(path):
             # Check if file has the right extension and is not a metadata file
             if (any(filename.endswith(ext) for ext in extensions) and 
-                not filename.endswith('_metadata.json')):
+                not filename.endswith(('_metadata.json', '_parsed.json'))):
                 filepath = os.path.join(path, filename)
                 files.append({
                     "filename": filename,
@@ -179,26 +371,68 @@ class ContentManager:
         files.sort(key=lambda x: x["modified"], reverse=True)
         return files[:limit]
     
+    @tracing.traced("content.cleanup")
+    def cleanup(self, keep_latest: int = 3, dry_run: bool = False) -> list:
+        """Remove all but the latest files of each content type, with their sidecars"""
+        removed = []
+        for content_type in ["newsitems", "ideas", "scripts", "audio", "video", "thumbnails"]:
+            old_files = self.get_latest_files(content_type, limit=None)[keep_latest:]
+            for file_info in old_files:
+                filepath = file_info["filepath"]
+                for path in (filepath, self.get_metadata_path(filepath), self.get_parsed_script_path(filepath)):
+                    if os.path.exists(path):
+                        if not dry_run:
+                            os.remove(path)
+                        removed.append(path)
+        return removed
+    
+    @tracing.traced("content.create_content_package")
+    @profiling.profiled("content.save")
     def create_content_package(self, script_filepath: str, audio_filepath: str, 
-                             video_filepath: Optional[str] = None) -> Dict[str, Any]:
-        """Create a complete content package with all assets"""
+                             video_filepath: Optional[str] = None,
+                             extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a complete content package with all assets (extra: e.g. rendered segments)"""
         timestamp = self._generate_timestamp()
+        package_file = self._unique_filepath(os.path.join(self.base_path, f"package_{timestamp}.json"))
+        package_id = "catnews_" + os.path.basename(package_file)[len("package_"):-len(".json")]
         
         package = {
             "timestamp": timestamp,
-            "package_id": f"catnews_{timestamp}",
+            "package_id": package_id,
             "script": script_filepath,
             "audio": audio_filepath,
             "video": video_filepath,
             "status": "complete" if video_filepath else "partial"
         }
+        if extra:
+            package.update(extra)
         
         # Save package metadata
-        package_file = os.path.join(self.base_path, f"package_{timestamp}.json")
+        package["package_filepath"] = package_file
         with open(package_file, 'w') as f:
             json.dump(package, f, indent=2)
         
         return package
+    
+    @tracing.traced("content.get_content_packages")
+    def get_content_packages(self, limit: Optional[int] = 5, with_video: bool = False) -> list:
+        """Get the latest content packages, newest first (with_video: only those whose video file exists)"""
+        package_files = sorted(glob.glob(os.path.join(self.base_path, "package_*.json")),
+                               key=os.path.getmtime, reverse=True)
+        packages = []
+        for package_file in package_files:
+            try:
+                with open(package_file, 'r', encoding='utf-8') as f:
+                    package = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if with_video and not (package.get("video") and os.path.exists(package["video"])):
+                continue
+            package.setdefault("package_filepath", package_file)
+            packages.append(package)
+            if limit is not None and len(packages) >= limit:
+                break
+        return packages
 
 # Global instance for easy importing
 content_manager = ContentManager()
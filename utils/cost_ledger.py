@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Cost Ledger for AI Cat News Network
+Every provider call (Groq, ElevenLabs, MiniMax, Veo 3) with its estimated and
+actual cost, tokens, characters and render seconds, in SQLite, plus the daily
+budgets that calls are checked against before they are submitted
+
+    with cost_ledger.track("groq", "chat", prompt_tokens=300, completion_tokens=800) as call:
+        response = ...
+        call.complete(prompt_tokens=212, completion_tokens=640)
+
+    python -m utils.cost_ledger report [--days 7]
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils import tracing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    estimated_usd REAL NOT NULL,
+    actual_usd REAL,
+    tokens INTEGER NOT NULL DEFAULT 0,
+    characters INTEGER NOT NULL DEFAULT 0,
+    render_seconds REAL NOT NULL DEFAULT 0,
+    trace_id TEXT,
+    error TEXT,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_day ON calls (day, provider, status);
+"""
+
+# Price keys, per unit of what a call used
+UNITS = {
+    "prompt_tokens": ("per_1k_prompt_tokens", 1000),
+    "completion_tokens": ("per_1k_completion_tokens", 1000),
+    "characters": ("per_1k_characters", 1000),
+    "render_seconds": ("per_video_second", 1)
+}
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _today() -> str:
+    return date.today().isoformat()
+
+class BudgetExceeded(RuntimeError):
+    """A call was refused because today's budget can't cover its estimated cost"""
+
+class Call:
+    """One tracked provider call; settle it with complete() or fail()"""
+
+    def __init__(self, ledger: Optional["CostLedger"], call_id: Optional[int], provider: str,
+                 estimate_units: Dict[str, float]):
+        self.ledger = ledger
+        self.call_id = call_id
+        self.provider = provider
+        self.estimate_units = estimate_units
+        self.settled = False
+
+    def complete(self, **units):
+        """The call succeeded; units are what it actually used (the estimate's units when omitted)"""
+        if not self.settled and self.ledger is not None:
+            self.ledger.settle(self.call_id, "complete", units or self.estimate_units)
+        self.settled = True
+
+    def fail(self, error: Any = None, **units):
+        """The call failed; nothing is charged unless units say otherwise"""
+        if not self.settled and self.ledger is not None:
+            message = None if error is None else error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+            self.ledger.settle(self.call_id, "failed", units, message)
+        self.settled = True
+
+class CostLedger:
+    """
+    Provider call ledger with daily budgets.
+
+    A call is reserved at its estimated cost before it is submitted and settled
+    at its actual cost afterwards; reservations count against the budget while
+    the call is in flight. A call the remaining budget can't cover waits while
+    other calls are in flight (they may cost less than estimated, or fail), so
+    how much work runs in parallel follows the headroom; with nothing in flight
+    it is refused. Reservations a crashed process never settled stop counting
+    after reservation_ttl_seconds.
+    """
+
+    def __init__(self, db_path: str = "content/cache/cost_ledger.sqlite", prices: Optional[Dict[str, Dict]] = None,
+                 budgets: Optional[Dict[str, Any]] = None, wait_seconds: float = 600,
+                 reservation_ttl_seconds: float = 3600):
+        self.db_path = db_path
+        self.prices = prices or {}
+        self.budgets = budgets or {}
+        self.wait_seconds = wait_seconds
+        self.reservation_ttl_seconds = reservation_ttl_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._settled = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def estimate(self, provider: str, **units) -> float:
+        """Cost in USD of the given units (prompt_tokens, completion_tokens, characters, render_seconds)"""
+        prices = self.prices.get(provider, {})
+        return sum(prices.get(key, 0.0) * (units.get(unit) or 0) / per for unit, (key, per) in UNITS.items())
+
+    def _spent(self, day: str, provider: Optional[str] = None) -> float:
+        """Settled cost plus the estimates of live reservations (caller holds the lock)"""
+        fresh = (datetime.now() - timedelta(seconds=self.reservation_ttl_seconds)).isoformat(timespec="seconds")
+        query = ("SELECT COALESCE(SUM(CASE WHEN status = 'reserved' THEN estimated_usd ELSE actual_usd END), 0) "
+                 "FROM calls WHERE day = ? AND (status IN ('complete', 'failed') OR "
+                 "(status = 'reserved' AND updated >= ?))")
+        params = [day, fresh]
+        if provider:
+            query += " AND provider = ?"
+            params.append(provider)
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def _headroom(self, provider: str, day: str) -> Tuple[float, Optional[str]]:
+        """USD left and the budget that binds: the provider's own (its name) or the overall one (None)"""
+        limits = [(float("inf"), provider)]
+        if self.budgets.get("daily_usd") is not None:
+            limits.append((self.budgets["daily_usd"] - self._spent(day), None))
+        provider_limit = self.budgets.get("providers", {}).get(provider)
+        if provider_limit is not None:
+            limits.append((provider_limit - self._spent(day, provider), provider))
+        return min(limits, key=lambda limit: limit[0])
+
+    def headroom(self, provider: str) -> float:
+        """USD left today for this provider (the tighter of its own and the overall daily budget)"""
+        with self._lock:
+            return self._headroom(provider, _today())[0]
+
+    def _in_flight(self, provider: Optional[str]) -> int:
+        fresh = (datetime.now() - timedelta(seconds=self.reservation_ttl_seconds)).isoformat(timespec="seconds")
+        query = "SELECT COUNT(*) FROM calls WHERE status = 'reserved' AND updated >= ?"
+        params = [fresh]
+        if provider:
+            query += " AND provider = ?"
+            params.append(provider)
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def reserve(self, provider: str, operation: str, estimated_usd: float, wait: Optional[float] = None) -> int:
+        """
+        Reserve a call's estimated cost; returns the call ID to settle.
+
+        Raises:
+            BudgetExceeded: the budget can't cover it and no call in flight settled within wait seconds
+        """
+        deadline = time.time() + (self.wait_seconds if wait is None else wait)
+        trace = tracing.current_span()
+        trace_id = trace.trace_id if trace else None
+        with self._lock:
+            while True:
+                day = _today()
+                # IMMEDIATE: the budget check and the insert are atomic across processes sharing the ledger
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    headroom, binding = self._headroom(provider, day)
+                    if estimated_usd <= headroom + 1e-9:
+                        cursor = self._conn.execute(
+                            "INSERT INTO calls (day, provider, operation, status, estimated_usd, trace_id, created, "
+                            "updated) VALUES (?, ?, ?, 'reserved', ?, ?, ?, ?)",
+                            (day, provider, operation, estimated_usd, trace_id, _now(), _now())
+                        )
+                        self._conn.execute("COMMIT")
+                        return cursor.lastrowid
+                    # Only calls in flight against the binding budget can give headroom back
+                    remaining = deadline - time.time()
+                    if remaining > 0 and self._in_flight(binding):
+                        self._conn.execute("ROLLBACK")
+                        # Woken by settles in this process; the timeout picks up other processes' settles
+                        self._settled.wait(min(1.0, remaining))
+                        continue
+                    message = (f"{provider} budget exhausted: ${max(0.0, headroom):.2f} left today, "
+                               f"{operation} needs ~${estimated_usd:.2f}")
+                    self._conn.execute(
+                        "INSERT INTO calls (day, provider, operation, status, estimated_usd, actual_usd, trace_id, "
+                        "error, created, updated) VALUES (?, ?, ?, 'rejected', ?, 0, ?, ?, ?, ?)",
+                        (day, provider, operation, estimated_usd, trace_id, message, _now(), _now())
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    raise
+                raise BudgetExceeded(message)
+
+    def settle(self, call_id: int, status: str, units: Dict[str, float], error: Optional[str] = None):
+        """Record what a reserved call actually used and cost"""
+        with self._lock:
+            provider = self._conn.execute("SELECT provider FROM calls WHERE id = ?", (call_id,)).fetchone()[0]
+            self._conn.execute(
+                "UPDATE calls SET status = ?, actual_usd = ?, tokens = ?, characters = ?, render_seconds = ?, "
+                "error = ?, updated = ? WHERE id = ?",
+                (status, self.estimate(provider, **units),
+                 int((units.get("prompt_tokens") or 0) + (units.get("completion_tokens") or 0)),
+                 int(units.get("characters") or 0), float(units.get("render_seconds") or 0), error, _now(), call_id)
+            )
+            self._settled.notify_all()
+
+    @contextmanager
+    def track(self, provider: str, operation: str, wait: Optional[float] = None, **units) -> Iterator[Call]:
+        """
+        Reserve a call's estimated cost for the block and settle it on the way out.
+
+        An exception fails the call (uncharged) and is re-raised; a block that
+        doesn't settle the call completes it at the estimated units.
+        """
+        call = Call(self, self.reserve(provider, operation, self.estimate(provider, **units), wait), provider, units)
+        try:
+            yield call
+        except BaseException as e:
+            call.fail(e)
+            raise
+        finally:
+            call.complete()
+
+    def report(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Per day and provider: calls, rejections, estimated and actual USD, tokens, characters, render seconds"""
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, provider, SUM(status IN ('complete', 'failed')), SUM(status = 'failed'), "
+                "SUM(status = 'rejected'), SUM(CASE WHEN status = 'rejected' THEN 0 ELSE estimated_usd END), "
+                "COALESCE(SUM(actual_usd), 0), SUM(tokens), SUM(characters), SUM(render_seconds) "
+                "FROM calls WHERE day >= ? GROUP BY day, provider ORDER BY day, provider", (since,)
+            ).fetchall()
+        keys = ("day", "provider", "calls", "failed", "rejected", "estimated_usd", "actual_usd", "tokens",
+                "characters", "render_seconds")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """Today's calls, cost and usage per provider"""
+        return {row["provider"]: row for row in self.report(days=1)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class _NoopLedger:
+    """Stand-in when the ledger is off: tracks nothing and never refuses a call"""
+
+    def estimate(self, provider: str, **units) -> float:
+        return 0.0
+
+    def headroom(self, provider: str) -> float:
+        return float("inf")
+
+    @contextmanager
+    def track(self, provider: str, operation: str, wait: Optional[float] = None, **units) -> Iterator[Call]:
+        yield Call(None, None, provider, units)
+
+_default_ledger = None
+_default_lock = threading.Lock()
+
+def get_cost_ledger():
+    """Shared ledger configured by COST_LEDGER settings (a no-op one when disabled or CATNEWS_COSTS=0)"""
+    global _default_ledger
+    with _default_lock:
+        if _default_ledger is None:
+            from config.settings import get_setting
+            settings = get_setting('COST_LEDGER', {})
+            enabled = settings.get('enabled', True)
+            override = os.getenv("CATNEWS_COSTS")
+            if override is not None:
+                enabled = override.strip().lower() not in ("0", "false", "no", "off", "")
+            _default_ledger = CostLedger(
+                db_path=settings.get('db_path', 'content/cache/cost_ledger.sqlite'),
+                prices=settings.get('prices', {}),
+                budgets=settings.get('budgets', {}),
+                wait_seconds=settings.get('wait_seconds', 600),
+                reservation_ttl_seconds=settings.get('reservation_ttl_seconds', 3600)
+            ) if enabled else _NoopLedger()
+        return _default_ledger
+
+def track(provider: str, operation: str, wait: Optional[float] = None, **units):
+    """get_cost_ledger().track(...)"""
+    return get_cost_ledger().track(provider, operation, wait, **units)
+
+def charge_render(provider: str, duration: float, render: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run a video render under the ledger: reserved at the requested duration, settled
+    at the rendered one. Over budget, returns an "over_budget" result instead of rendering.
+    """
+    try:
+        with track(provider, "video", render_seconds=duration) as call:
+            result = render()
+            if result.get("status") in ("success", "completed"):
+                call.complete(render_seconds=result.get("duration") or duration)
+            else:
+                call.fail(result.get("message") or result.get("status"))
+            return result
+    except BudgetExceeded as e:
+        print(f"💸 {e}")
+        return {"status": "over_budget", "message": str(e), "provider": provider}
+
+def print_report(ledger: CostLedger, days: int = 7):
+    rows = ledger.report(days)
+    print(f"\n{'Day':<11} {'Provider':<11} {'Calls':>6} {'Failed':>7} {'Refused':>8} {'Est. $':>8} {'Actual $':>9} "
+          f"{'Tokens':>9} {'Chars':>8} {'Render s':>9}")
+    print("-" * 92)
+    for row in rows:
+        print(f"{row['day']:<11} {row['provider']:<11} {row['calls']:>6} {row['failed']:>7} {row['rejected']:>8} "
+              f"{row['estimated_usd']:>8.2f} {row['actual_usd']:>9.2f} {row['tokens']:>9} {row['characters']:>8} "
+              f"{row['render_seconds']:>9.0f}")
+    if not rows:
+        print("(no provider calls recorded)")
+
+    today = [row for row in rows if row["day"] == _today()]
+    print(f"\n💵 Today: ${sum(row['actual_usd'] for row in today):.2f} spent")
+    if ledger.budgets.get("daily_usd") is not None:
+        print(f"   All providers: ${ledger.budgets['daily_usd']:.2f} budget")
+    providers = sorted(set(ledger.budgets.get("providers", {})) | {row["provider"] for row in today})
+    for provider in providers:
+        headroom = ledger.headroom(provider)
+        print(f"   {provider:<11} {'unlimited' if headroom == float('inf') else f'${headroom:.2f} left'}")
+
+# Export for use in other modules
+__all__ = ['CostLedger', 'BudgetExceeded', 'get_cost_ledger', 'track', 'charge_render']
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Provider cost ledger")
+    parser.add_argument("action", choices=["report"])
+    parser.add_argument("--days", type=int, default=7, help="Days to show, today included")
+    args = parser.parse_args(argv)
+
+    ledger = get_cost_ledger()
+    if not isinstance(ledger, CostLedger):
+        print("❌ The cost ledger is disabled (COST_LEDGER enabled / CATNEWS_COSTS)")
+        return 1
+    print("🐱 AI Cat News Network - Cost Ledger")
+    print("=" * 50)
+    print_report(ledger, args.days)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Story Index for AI Cat News Network
+MinHash signatures over headline/summary shingles with banded LSH buckets in
+SQLite, so the same story from several outlets (or a story we already scripted)
+is recognised in well under a millisecond, however large the index grows
+"""
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    text TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    added TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    story_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (bucket);
+CREATE UNIQUE INDEX IF NOT EXISTS stories_by_ref ON stories (kind, ref);
+CREATE TABLE IF NOT EXISTS params (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Words that carry no story identity; dropping them keeps short headlines comparable
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or over says
+than that the their this to up was were will with after new""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def shingles(text: str) -> set:
+    """Content words plus adjacent word pairs of a headline/summary"""
+    words = [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+class DedupIndex:
+    """
+    Persistent MinHash/LSH index of news items and scripts.
+
+    A signature of num_perm minimums is split into `bands` bands; two stories
+    become candidates when any band matches exactly, and a candidate counts as a
+    duplicate when the estimated Jaccard similarity reaches `threshold`. The
+    candidate lookup is one indexed query, so cost per item stays flat as the
+    index grows.
+    """
+
+    def __init__(self, db_path: str = "content/cache/dedup_index.sqlite", num_perm: int = 128,
+                 bands: int = 32, threshold: float = 0.5, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._salt = seed.to_bytes(8, "little")
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._check_params({"num_perm": num_perm, "bands": bands, "seed": seed})
+
+    def _check_params(self, params: Dict[str, Any]):
+        """Signatures are only comparable under the same hash family and banding"""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO params (name, value) VALUES ('minhash', ?)",
+                               (json.dumps(params, sort_keys=True),))
+            self._conn.commit()
+            stored = json.loads(self._conn.execute("SELECT value FROM params WHERE name = 'minhash'").fetchone()[0])
+        if stored != params:
+            raise ValueError(f"{self.db_path} was built with {stored}; delete it to rebuild with {params}")
+
+    def signature(self, text: str) -> List[int]:
+        """
+        MinHash signature of the text's shingles.
+
+        Each shingle gets one SHAKE-128 digest read as num_perm independent
+        32-bit hashes; the signature is their elementwise minimum. This keeps
+        per-item cost to one digest per shingle instead of num_perm hashes.
+        Text with no content words (empty or only stopwords) has no signature:
+        an all-zero one would land in every such item's buckets and match them all.
+        """
+        size = 4 * self.num_perm
+        digests = [array("I", hashlib.shake_128(self._salt + shingle.encode("utf-8")).digest(size))
+                   for shingle in shingles(text)]
+        if not digests:
+            return []
+        return list(map(min, *digests)) if len(digests) > 1 else digests[0].tolist()
+
+    def _bucket_keys(self, signature: List[int]) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            rows = array("I", signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            digest = hashlib.blake2b(rows, digest_size=8, person=band.to_bytes(2, "little")).digest()
+            # SQLite integers are signed 64-bit
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+    def find_duplicate(self, text: str, kinds: Optional[Iterable[str]] = None,
+                       signature: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Most similar indexed story at or above the threshold, or None
+        (always None for text without a signature).
+
+        Returns:
+            {"id", "kind", "ref", "text", "similarity"}
+        """
+        signature = signature or self.signature(text)
+        if not signature:
+            return None
+        keys = self._bucket_keys(signature)
+        query = ("SELECT DISTINCT s.id, s.kind, s.ref, s.text, s.signature FROM buckets b "
+                 "JOIN stories s ON s.id = b.story_id "
+                 f"WHERE b.bucket IN ({','.join('?' * len(keys))})")
+        with self._lock:
+            candidates = self._conn.execute(query, keys).fetchall()
+
+        kinds = set(kinds) if kinds else None
+        best = None
+        for story_id, kind, ref, story_text, blob in candidates:
+            if kinds is not None and kind not in kinds:
+                continue
+            score = self.similarity(signature, array("I", blob).tolist())
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {"id": story_id, "kind": kind, "ref": ref, "text": story_text, "similarity": score}
+        return best
+
+    def add(self, text: str, kind: str, ref: str, signature: Optional[List[int]] = None,
+            commit: bool = True) -> Optional[int]:
+        """
+        Index a story (re-adding the same kind/ref replaces it); returns its ID,
+        or None for text without a signature, which is not indexed.
+
+        Bulk callers pass commit=False and call commit() once at the end.
+        """
+        signature = signature or self.signature(text)
+        if not signature:
+            return None
+        blob = array("I", signature).tobytes()
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM stories WHERE kind = ? AND ref = ?", (kind, ref)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM buckets WHERE story_id = ?", (row[0],))
+                self._conn.execute("DELETE FROM stories WHERE id = ?", (row[0],))
+            cursor = self._conn.execute(
+                "INSERT INTO stories (kind, ref, text, signature, added) VALUES (?, ?, ?, ?, ?)",
+                (kind, ref, text, blob, datetime.now().isoformat(timespec="seconds"))
+            )
+            story_id = cursor.lastrowid
+            self._conn.executemany("INSERT INTO buckets (bucket, story_id) VALUES (?, ?)",
+                                   [(key, story_id) for key in self._bucket_keys(signature)])
+            if commit:
+                self._conn.commit()
+        return story_id
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def check_and_add(self, text: str, kind: str, ref: str, against: Optional[Iterable[str]] = None,
+                      commit: bool = True) -> Optional[Dict[str, Any]]:
+        """Return the duplicate of text if there is one; otherwise index it and return None"""
+        signature = self.signature(text)
+        duplicate = self.find_duplicate(text, kinds=against, signature=signature)
+        if duplicate is None:
+            self.add(text, kind, ref, signature=signature, commit=commit)
+        return duplicate
+
+    def backfill(self, content_manager) -> Dict[str, int]:
+        """Index existing news items and scripts that aren't indexed yet"""
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT kind || ':' || ref FROM stories")}
+        added = {"news": 0, "script": 0}
+
+        for file_info in content_manager.get_latest_files("newsitems", limit=None):
+            ref = file_info["filepath"]
+            if f"news:{ref}" in known:
+                continue
+            try:
+                with open(ref, 'r', encoding='utf-8') as f:
+                    news_data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if self.add(story_text(news_data.get("topic", ""), news_data.get("metadata", {}).get("summary", "")),
+                        "news", ref, commit=False) is not None:
+                added["news"] += 1
+
+        for file_info in content_manager.get_latest_files("scripts", limit=None):
+            ref = file_info["filepath"]
+            if f"script:{ref}" in known:
+                continue
+            topic = content_manager.load_metadata(ref).get("topic") or script_topic(ref)
+            if topic and self.add(topic, "script", ref, commit=False) is not None:
+                added["script"] += 1
+
+        self.commit()
+        return added
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, COUNT(*) FROM stories GROUP BY kind").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def story_text(title: str, summary: str = "") -> str:
+    """Text a news story is fingerprinted by (headline plus summary)"""
+    return f"{title} {summary}".strip()
+
+def script_topic(script_filepath: str) -> str:
+    """The "Topic: ..." line scripts are saved with, if present"""
+    try:
+        with open(script_filepath, 'r', encoding='utf-8') as f:
+            first_line = f.readline().strip()
+    except OSError:
+        return ""
+    return first_line[len("Topic:"):].strip() if first_line.startswith("Topic:") else ""
+
+def fresh_topics(topics: List[str], index: "DedupIndex") -> List[str]:
+    """Topics that aren't near-duplicates of an already scripted story (all of them if none are)"""
+    fresh = [topic for topic in dict.fromkeys(topics) if index.find_duplicate(topic, kinds=("script",)) is None]
+    return fresh or list(dict.fromkeys(topics))
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_dedup_index() -> DedupIndex:
+    """Shared index configured by DEDUP_INDEX settings"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            from config.settings import get_setting
+            settings = get_setting('DEDUP_INDEX', {})
+            _default_index = DedupIndex(
+                db_path=settings.get('db_path', 'content/cache/dedup_index.sqlite'),
+                num_perm=settings.get('num_perm', 128),
+                bands=settings.get('bands', 32),
+                threshold=settings.get('threshold', 0.5)
+            )
+        return _default_index
+
+# Export for use in other modules
+__all__ = ['DedupIndex', 'get_dedup_index', 'fresh_topics', 'shingles', 'story_text', 'script_topic']
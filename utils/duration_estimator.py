@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Duration Estimator for AI Cat News Network
+Predicts voice-over length before synthesis, calibrated from past audio metadata
+"""
+import os
+import re
+import json
+import threading
+from typing import Dict, Any, List, Optional
+
+from utils.text_segmentation import split_sentences
+
+# Features: [bias, characters, words, pauses]; pauses are commas, dashes, ellipses and sentence ends
+FEATURE_NAMES = ["bias", "characters", "words", "pauses"]
+
+# Prior used until a voice has its own measurements: ~15 characters per second of speech
+PRIOR_WEIGHTS = [0.3, 1 / 15, 0.0, 0.15]
+
+# Pulls the fit toward the prior when only a few samples exist
+RIDGE_STRENGTH = 2.0
+
+_PAUSE_PATTERN = re.compile(r'[,;:.!?…—]|--|\.\.\.')
+
+def text_features(text: str) -> List[float]:
+    """Compute the estimator features for a piece of text"""
+    text = " ".join(text.split())
+    return [1.0, float(len(text)), float(len(text.split())), float(len(_PAUSE_PATTERN.findall(text)))]
+
+def _features_from_counts(character_count: int) -> List[float]:
+    """Approximate features when only a character count was recorded"""
+    return [1.0, float(character_count), character_count / 5.5, character_count / 40]
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve a small dense linear system with Gaussian elimination and partial pivoting"""
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("Singular system")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, size):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, size + 1):
+                rows[r][c] -= factor * rows[col][c]
+
+    solution = [0.0] * size
+    for r in range(size - 1, -1, -1):
+        total = rows[r][size] - sum(rows[r][c] * solution[c] for c in range(r + 1, size))
+        solution[r] = total / rows[r][r]
+    return solution
+
+class DurationEstimator:
+    """Per-voice, per-model linear model of speech duration, fitted incrementally"""
+
+    def __init__(self, state_path: str = "content/cache/duration_model.json"):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self.models = {}          # "voice_id|model_id" -> sufficient statistics
+        self.seen_audio = set()   # Audio files already folded into the fit
+        self._load()
+
+    def _load(self):
+        """Load fitted statistics from disk"""
+        if not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.models = state.get("models", {})
+        self.seen_audio = set(state.get("seen_audio", []))
+
+    def save(self):
+        """Persist fitted statistics"""
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump({"models": self.models, "seen_audio": sorted(self.seen_audio)}, f, indent=2)
+
+    @staticmethod
+    def _model_key(voice_id: Optional[str], model_id: Optional[str]) -> str:
+        return f"{voice_id or 'default'}|{model_id or 'default'}"
+
+    def _empty_model(self) -> Dict[str, Any]:
+        size = len(FEATURE_NAMES)
+        return {
+            "samples": 0,
+            "xtx": [[0.0] * size for _ in range(size)],
+            "xty": [0.0] * size,
+            "weights": list(PRIOR_WEIGHTS)
+        }
+
+    def _observe_features(self, features: List[float], duration: float, voice_id: Optional[str], model_id: Optional[str]):
+        """Fold one measurement into the model's normal equations and refit"""
+        key = self._model_key(voice_id, model_id)
+        model = self.models.setdefault(key, self._empty_model())
+        size = len(features)
+
+        for i in range(size):
+            model["xty"][i] += features[i] * duration
+            for j in range(size):
+                model["xtx"][i][j] += features[i] * features[j]
+        model["samples"] += 1
+
+        # Ridge regression toward the prior, scaled per feature so long texts do not swamp it
+        scale = [max(model["xtx"][i][i] / model["samples"], 1e-9) for i in range(size)]
+        matrix = [[model["xtx"][i][j] + (RIDGE_STRENGTH * scale[i] if i == j else 0.0) for j in range(size)]
+                  for i in range(size)]
+        vector = [model["xty"][i] + RIDGE_STRENGTH * scale[i] * PRIOR_WEIGHTS[i] for i in range(size)]
+        try:
+            model["weights"] = _solve(matrix, vector)
+        except ValueError:
+            pass
+
+    def observe(self, text: str, duration: float, voice_id: Optional[str] = None, model_id: Optional[str] = None):
+        """Record a measured duration for a synthesized text"""
+        with self._lock:
+            self._observe_features(text_features(text), duration, voice_id, model_id)
+
+    def calibrate_from_metadata(self, content_manager) -> int:
+        """
+        Fit from audio metadata not yet seen (character counts and probed durations).
+
+        Returns:
+            Number of new samples folded into the models
+        """
+        added = 0
+        with self._lock:
+            for filename in os.listdir(content_manager.audio_path):
+                if not filename.endswith('_metadata.json'):
+                    continue
+                metadata_file = os.path.join(content_manager.audio_path, filename)
+                if metadata_file in self.seen_audio:
+                    continue
+                self.seen_audio.add(metadata_file)
+
+                try:
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        metadata = json.load(f)
+                except (OSError, ValueError):
+                    continue
+
+                duration = metadata.get("duration_seconds")
+                voice_settings = metadata.get("voice_settings") or {}
+                spoken_text = metadata.get("spoken_text") or voice_settings.get("spoken_text")
+                character_count = metadata.get("character_count") or voice_settings.get("text_length")
+                if not duration or not (spoken_text or character_count):
+                    continue
+
+                features = text_features(spoken_text) if spoken_text else _features_from_counts(character_count)
+                self._observe_features(features, duration, voice_settings.get("voice_id"), voice_settings.get("model_id"))
+                added += 1
+
+            if added or not os.path.exists(self.state_path):
+                self.save()
+
+        return added
+
+    def estimate(self, text: str, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> float:
+        """Predict spoken duration in seconds"""
+        model = self.models.get(self._model_key(voice_id, model_id))
+        weights = model["weights"] if model else PRIOR_WEIGHTS
+        features = text_features(text)
+        return max(0.0, sum(w * x for w, x in zip(weights, features)))
+
+    def fit_to_duration(self, text: str, target_seconds: float, voice_id: Optional[str] = None,
+                        model_id: Optional[str] = None) -> str:
+        """
+        Trim or extend text by whole sentences so its predicted duration is closest to the target.
+
+        Sentences are taken in order; if even the first sentence overruns, it is
+        cut at a word boundary. Text shorter than the target is returned whole.
+        """
+        sentences = split_sentences(text, min_chars=0)
+        if not sentences:
+            return ""
+
+        best = None
+        best_error = None
+        for count in range(1, len(sentences) + 1):
+            candidate = " ".join(sentences[:count])
+            predicted = self.estimate(candidate, voice_id, model_id)
+            error = abs(predicted - target_seconds)
+            if best_error is None or error < best_error:
+                best, best_error = candidate, error
+            if predicted >= target_seconds:
+                break
+
+        if self.estimate(best, voice_id, model_id) <= target_seconds * 1.15:
+            return best
+
+        # A single sentence overruns - cut it at the last word that still fits
+        words = best.split()
+        while len(words) > 1 and self.estimate(" ".join(words) + "...", voice_id, model_id) > target_seconds:
+            words.pop()
+        return " ".join(words).rstrip(",;:") + "..."
+
+    def get_model_info(self, voice_id: Optional[str] = None, model_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the fitted weights and sample count for a voice/model"""
+        model = self.models.get(self._model_key(voice_id, model_id))
+        return {
+            "samples": model["samples"] if model else 0,
+            "weights": dict(zip(FEATURE_NAMES, model["weights"] if model else PRIOR_WEIGHTS))
+        }
+
+# Global instance for easy importing
+duration_estimator = DurationEstimator()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+On-demand Profiling for AI Cat News Network
+Profiles chosen pipeline stages (script parsing, ContentManager saves, thumbnail
+rendering, video polling) with cProfile or a stack sampler, one file per call,
+grouped by episode, plus a summary that merges them across a batch
+
+    @profiling.profiled("content.save")
+    def save_script(...): ...
+
+    CATNEWS_PROFILE=content.save,video.poll python catnews.py batch ...
+    python -m utils.profiling summarize [--stage video.] [--top 20]
+
+The switch is read when a stage's module is imported: a stage that is not
+selected keeps its undecorated function, so profiling off costs nothing.
+"""
+import os
+import sys
+import glob
+import pstats
+import cProfile
+import argparse
+import functools
+import itertools
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import get_setting
+from utils import tracing
+
+ENGINES = ("cprofile", "sample")
+
+_session_lock = threading.Lock()
+_session_dir: Optional[str] = None
+_sequence = itertools.count(1)
+_active = threading.local()
+_cprofile_lock = threading.Lock()
+
+def _settings() -> Dict[str, Any]:
+    return get_setting('PROFILING', {})
+
+def profiled_stages() -> List[str]:
+    """PROFILING["stages"], overridden by CATNEWS_PROFILE (comma-separated, "all" or "1" for every stage)"""
+    override = os.getenv("CATNEWS_PROFILE")
+    if override is None:
+        return list(_settings().get('stages', []))
+    stages = [stage.strip() for stage in override.split(",") if stage.strip()]
+    if any(stage.lower() in ("0", "false", "no", "off") for stage in stages):
+        return []
+    return ["all" if stage.lower() in ("1", "true", "yes", "on") else stage for stage in stages]
+
+def stage_enabled(stage: str) -> bool:
+    """Whether a stage is selected; "content" selects content.save and any other content.* stage"""
+    return any(selected == "all" or stage == selected or stage.startswith(selected.rstrip(".") + ".")
+               for selected in profiled_stages())
+
+def profile_engine() -> str:
+    engine = os.getenv("CATNEWS_PROFILE_ENGINE") or _settings().get('engine', 'cprofile')
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown profiling engine '{engine}' (expected one of {', '.join(ENGINES)})")
+    return engine
+
+def profile_directory() -> str:
+    return _settings().get('directory', 'content/cache/profiles')
+
+def _session() -> str:
+    """This batch's profile directory, shared with child processes through CATNEWS_PROFILE_SESSION"""
+    global _session_dir
+    if _session_dir is None:
+        with _session_lock:
+            if _session_dir is None:
+                session = os.getenv("CATNEWS_PROFILE_SESSION") or datetime.now().strftime("%Y%m%d_%H%M%S")
+                os.environ["CATNEWS_PROFILE_SESSION"] = session
+                _session_dir = os.path.join(profile_directory(), session)
+    return _session_dir
+
+def _output_path(stage: str, extension: str) -> str:
+    """<session>/<trace>/<stage>.<pid>-<n><extension>; the trace ID groups one episode's calls"""
+    current = tracing.current_span()
+    episode = current.trace_id if current is not None else "untraced"
+    directory = os.path.join(_session(), episode)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{stage}.{os.getpid()}-{next(_sequence)}{extension}")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+class _Sampler:
+    """Samples one thread's stack on a background thread, counting collapsed stacks below a stop frame"""
+
+    def __init__(self, thread_id: int, stop_frame, interval: float):
+        self.thread_id = thread_id
+        self.stop_frame = stop_frame
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="catnews-profile-sampler", daemon=True)
+
+    def start(self) -> "_Sampler":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.stop_frame:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                collapsed = ";".join(reversed(stack))
+                self.counts[collapsed] = self.counts.get(collapsed, 0) + 1
+
+    def stop(self) -> Dict[str, int]:
+        self._stopped.set()
+        self._thread.join()
+        return self.counts
+
+def _run_sampled(stage: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+    interval = _settings().get('sample_interval_ms', 5) / 1000
+    sampler = _Sampler(threading.get_ident(), sys._getframe(), interval).start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        counts = sampler.stop()
+        with open(_output_path(stage, ".collapsed"), 'w', encoding='utf-8') as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in counts.items())
+
+def _run_cprofiled(stage: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+    # Since Python 3.12 only one cProfile profiler may be active in the process at a time,
+    # so a stage running concurrently with a profiled one (render or pipeline pools) is sampled
+    if not _cprofile_lock.acquire(blocking=False):
+        return _run_sampled(stage, func, args, kwargs)
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler outside this module (e.g. python -m cProfile) is active
+            return _run_sampled(stage, func, args, kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profiler.dump_stats(_output_path(stage, ".prof"))
+    finally:
+        _cprofile_lock.release()
+
+def _run_profiled(stage: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+    # A stage called inside another profiled stage on this thread is already in that profile
+    if getattr(_active, "stage", None) is not None:
+        return func(*args, **kwargs)
+    _active.stage = stage
+    try:
+        if profile_engine() == "sample":
+            return _run_sampled(stage, func, args, kwargs)
+        return _run_cprofiled(stage, func, args, kwargs)
+    finally:
+        _active.stage = None
+
+def profiled(stage: str) -> Callable:
+    """
+    Profile every call of the decorated function as the named stage.
+
+    Resolved at decoration time: when the stage is not selected, the function
+    is returned as is.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not stage_enabled(stage):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return _run_profiled(stage, func, args, kwargs)
+        return wrapper
+    return decorator
+
+# Summary
+
+def _stage_of(path: str) -> str:
+    """Stage name from <stage>.<pid>-<n>.<ext>"""
+    return os.path.basename(path).rsplit(".", 2)[0]
+
+def find_profiles(session_dir: str, stage: Optional[str] = None) -> Dict[str, List[str]]:
+    """Profile files in a session, by stage (optionally only stages starting with stage)"""
+    profiles: Dict[str, List[str]] = {}
+    for path in sorted(glob.glob(os.path.join(session_dir, "*", "*.prof")) +
+                       glob.glob(os.path.join(session_dir, "*", "*.collapsed"))):
+        name = _stage_of(path)
+        if stage is None or name.startswith(stage):
+            profiles.setdefault(name, []).append(path)
+    return profiles
+
+def merge_collapsed(paths: List[str]) -> Dict[str, int]:
+    """Sum the sample counts of collapsed-stack files"""
+    counts: Dict[str, int] = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack and count.isdigit():
+                    counts[stack] = counts.get(stack, 0) + int(count)
+    return counts
+
+def _function_label(key: Tuple[str, int, str]) -> str:
+    filename, line, name = key
+    return name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+
+def print_prof_summary(stats: pstats.Stats, top: int, sort: str):
+    """Top functions of merged cProfile stats by cumulative or own time"""
+    column = 3 if sort == "cumulative" else 2
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][column])[:top]
+    print(f"   {'Calls':>8} {'Own s':>9} {'Cum s':>9}  Function")
+    for key, (_, calls, own, cumulative, _) in rows:
+        print(f"   {calls:>8} {own:>9.3f} {cumulative:>9.3f}  {_function_label(key)}")
+
+def print_collapsed_summary(counts: Dict[str, int], top: int):
+    """Functions with the most samples on top of the stack (own) and anywhere on it (cumulative)"""
+    own: Dict[str, int] = {}
+    cumulative: Dict[str, int] = {}
+    for stack, count in counts.items():
+        frames = stack.split(";")
+        own[frames[-1]] = own.get(frames[-1], 0) + count
+        for frame in set(frames):
+            cumulative[frame] = cumulative.get(frame, 0) + count
+    total = sum(counts.values()) or 1
+    print(f"   {'Own %':>7} {'Cum %':>7}  Function")
+    for frame, count in sorted(own.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {count / total * 100:>7.1f} {cumulative[frame] / total * 100:>7.1f}  {frame}")
+
+def summarize(session_dir: str, stage: Optional[str] = None, top: int = 15, sort: str = "cumulative",
+              output: Optional[str] = None) -> int:
+    profiles = find_profiles(session_dir, stage)
+    if not profiles:
+        print(f"❌ No profiles in {session_dir}")
+        return 1
+    episodes = {os.path.basename(os.path.dirname(path)) for paths in profiles.values() for path in paths}
+    print(f"📈 {sum(len(paths) for paths in profiles.values())} profiled calls in {len(episodes)} episodes "
+          f"({session_dir})")
+
+    for name, paths in sorted(profiles.items()):
+        prof_paths = [path for path in paths if path.endswith(".prof")]
+        collapsed_paths = [path for path in paths if path.endswith(".collapsed")]
+        if prof_paths:
+            stats = pstats.Stats(*prof_paths)
+            print(f"\n⏱️  {name}: {len(prof_paths)} calls, {stats.total_tt:.3f}s profiled")
+            print_prof_summary(stats, top, sort)
+            if output:
+                stats.dump_stats(f"{output}.{name}.prof")
+        if collapsed_paths:
+            counts = merge_collapsed(collapsed_paths)
+            print(f"\n🔬 {name}: {len(collapsed_paths)} calls, {sum(counts.values())} samples")
+            if counts:
+                print_collapsed_summary(counts, top)
+            else:
+                print("   Calls were shorter than the sample interval")
+            if output:
+                with open(f"{output}.{name}.collapsed", 'w', encoding='utf-8') as f:
+                    f.writelines(f"{stack} {count}\n" for stack, count in sorted(counts.items()))
+    if output:
+        print(f"\n💾 Merged profiles written to {output}.<stage>.prof / .collapsed")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge and summarize stage profiles")
+    parser.add_argument("action", choices=["summarize"])
+    parser.add_argument("--session", help="Session directory name (default: the latest)")
+    parser.add_argument("--dir", help="Profiles directory (default PROFILING directory)")
+    parser.add_argument("--stage", help="Only stages whose name starts with this")
+    parser.add_argument("--top", type=int, default=15, help="Functions to show per stage")
+    parser.add_argument("--sort", choices=["cumulative", "own"], default="cumulative")
+    parser.add_argument("--output", help="Also write merged profiles to OUTPUT.<stage>.prof / .collapsed")
+    args = parser.parse_args(argv)
+
+    directory = args.dir or profile_directory()
+    sessions = sorted((os.path.join(directory, name) for name in os.listdir(directory)
+                       if os.path.isdir(os.path.join(directory, name))),
+                      key=os.path.getmtime) if os.path.isdir(directory) else []
+    if not sessions:
+        print(f"❌ No profiling sessions in {directory} (run with CATNEWS_PROFILE=<stages>)")
+        return 1
+    session_dir = os.path.join(directory, args.session) if args.session else sessions[-1]
+    print("🐱 AI Cat News Network - Profile Summary")
+    print("=" * 50)
+    return summarize(session_dir, args.stage, args.top, args.sort, args.output)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Script Parser for AI Cat News Network
+Single-pass parser that turns any of our script formats into a structured form
+(timed sections, spoken lines, stage directions, visual cues)
+"""
+import re
+import hashlib
+from typing import Dict, Any, Optional
+
+from utils import profiling
+
+# Bump when parsing rules change so cached parses are rebuilt
+PARSER_VERSION = 1
+
+# Section headers whose body describes visuals rather than dialogue
+VISUAL_SECTIONS = {"STUDIO SETUP", "CAMERA SETUP", "ACTION TIMELINE", "VISUAL STYLE", "VISUALS", "SCENE"}
+
+# Section headers whose body is dialogue even though it is quoted on its own line
+SPOKEN_SECTIONS = {"AUDIO SYNC", "DIALOGUE", "VOICE"}
+
+# Uppercase "KEY: value" lines that carry production metadata, not dialogue
+METADATA_KEYS = {"VOICE TIMING", "VIDEO STYLE", "CAT BEHAVIOR", "DURATION", "QUALITY", "MOOD", "TARGET"}
+
+_BOLD_HEADER = re.compile(r'^\*\*(?P<label>[^*]+?):?\*\*:?\s*(?P<rest>.*)$')
+_BRACKET_TIMING = re.compile(r'^\[(?P<start>\d+(?:\.\d+)?)\s*-\s*(?P<end>\d+(?:\.\d+)?)\s*s?\]\s*(?P<rest>.*)$')
+_LABEL_PREFIX = re.compile(r'^(?P<label>[A-Z][A-Z0-9 /&-]{1,30}):\s*(?P<rest>.*)$')
+_TIMELINE_ENTRY = re.compile(r'^(?P<start>\d+(?:\.\d+)?)\s*-\s*(?P<end>\d+(?:\.\d+)?)\s*s:\s*(?P<rest>.+)$')
+_SECONDS_RANGE = re.compile(r'\(?\s*(?P<start>\d+(?:\.\d+)?)\s*-\s*(?P<end>\d+(?:\.\d+)?)\s*(?:s|sec|seconds)\b\s*\)?')
+_INLINE_DIRECTION = re.compile(r'\*(?!\*)([^*]+)\*|\(([^)]*)\)')
+_INLINE_VISUAL = re.compile(r'\[([^\]]*)\]')
+
+def script_hash(text: str) -> str:
+    """Hash of the raw script text, used to validate cached parses"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _new_section(label: Optional[str], start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, Any]:
+    return {
+        "label": label,
+        "start": start,
+        "end": end,
+        "spoken_lines": [],
+        "stage_directions": [],
+        "visual_cues": []
+    }
+
+def _strip_quotes(text: str) -> str:
+    return text.strip().strip('"').strip('\u201c\u201d').strip("'").strip()
+
+def _section_timing(label_text: str, previous_end: float):
+    """
+    Read "(3-4 seconds)" style timing from a header.
+
+    A range starting where the previous section ended is a timeline position;
+    anything else (e.g. "**MAIN** (12-14 seconds)") is a duration appended to it.
+    """
+    match = _SECONDS_RANGE.search(label_text)
+    if not match:
+        return None, None, label_text.strip()
+
+    start, end = float(match.group("start")), float(match.group("end"))
+    label = (label_text[:match.start()] + label_text[match.end():]).strip()
+    if abs(start - previous_end) < 0.5:
+        return start, end, label
+    return previous_end, previous_end + end, label
+
+@profiling.profiled("script.parse")
+def parse_script(text: str) -> Dict[str, Any]:
+    """
+    Parse a script into its structured form in a single pass over the lines.
+
+    Returns:
+        Dictionary with topic, title, sections (label/start/end plus the section's
+        spoken lines, stage directions and visual cues), flattened spoken_lines,
+        spoken_text, stage_directions, visual_cues, metadata and hashtags.
+    """
+    parsed = {
+        "parser_version": PARSER_VERSION,
+        "source_hash": script_hash(text),
+        "topic": None,
+        "title": None,
+        "sections": [],
+        "spoken_lines": [],
+        "spoken_text": "",
+        "stage_directions": [],
+        "visual_cues": [],
+        "metadata": {},
+        "hashtags": []
+    }
+
+    section = _new_section(None)
+    sections = [section]
+    previous_end = 0.0
+    in_footer = False
+
+    def start_section(label, start=None, end=None):
+        nonlocal section, previous_end
+        section = _new_section(label, start, end)
+        sections.append(section)
+        if end is not None:
+            previous_end = end
+
+    def add_spoken(line: str):
+        # Inline *actions* / (actions) become stage directions, [cues] become visual cues
+        for match in _INLINE_DIRECTION.finditer(line):
+            direction = (match.group(1) or match.group(2) or "").strip()
+            if direction:
+                section["stage_directions"].append(direction)
+        for match in _INLINE_VISUAL.finditer(line):
+            cue = match.group(1).strip()
+            if cue:
+                section["visual_cues"].append({"text": cue, "start": section["start"], "end": section["end"]})
+        spoken = _INLINE_VISUAL.sub("", _INLINE_DIRECTION.sub("", line))
+        spoken = _strip_quotes(" ".join(spoken.split()))
+        if spoken:
+            section["spoken_lines"].append(spoken)
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if line.startswith("---"):
+            in_footer = True
+            continue
+
+        if line.startswith("Topic:") and parsed["topic"] is None:
+            parsed["topic"] = line.split(":", 1)[1].strip()
+            continue
+
+        if line.startswith("#"):
+            parsed["hashtags"].extend(tag for tag in line.split() if tag.startswith("#") and len(tag) > 1)
+            continue
+
+        header = _BOLD_HEADER.match(line)
+        if header:
+            label_text, rest = header.group("label").strip(), header.group("rest").strip()
+            label_key = label_text.rstrip(":").upper()
+            if label_key in METADATA_KEYS:
+                parsed["metadata"][label_key] = rest
+                continue
+            start, end, label = _section_timing(label_text, previous_end)
+            if start is None and rest:
+                start, end, rest = _section_timing(rest, previous_end)
+            label = label.rstrip(":").strip()
+            if parsed["title"] is None and not rest and start is None and len(sections) == 1 \
+                    and label.upper() not in VISUAL_SECTIONS | SPOKEN_SECTIONS:
+                parsed["title"] = label
+                continue
+            start_section(label.upper(), start, end)
+            if rest:
+                add_spoken(rest)
+            continue
+
+        timed = _BRACKET_TIMING.match(line)
+        if timed:
+            rest = timed.group("rest")
+            label = None
+            labelled = _LABEL_PREFIX.match(rest)
+            if labelled:
+                label, rest = labelled.group("label").strip(), labelled.group("rest")
+            start_section(label, float(timed.group("start")), float(timed.group("end")))
+            if rest:
+                add_spoken(rest)
+            continue
+
+        labelled = _LABEL_PREFIX.match(line)
+        if labelled:
+            label = labelled.group("label").strip()
+            rest = labelled.group("rest").strip()
+            if in_footer or label in METADATA_KEYS:
+                parsed["metadata"][label] = rest
+                continue
+            start_section(label)
+            if rest:
+                add_spoken(rest)
+            continue
+
+        if in_footer:
+            continue
+
+        label = section["label"] or ""
+        if label in VISUAL_SECTIONS or label.startswith("ACTION TIMELINE"):
+            entry = _TIMELINE_ENTRY.match(line)
+            if entry:
+                section["visual_cues"].append({
+                    "text": entry.group("rest").strip(),
+                    "start": float(entry.group("start")),
+                    "end": float(entry.group("end"))
+                })
+            else:
+                section["visual_cues"].append({"text": line, "start": section["start"], "end": section["end"]})
+            continue
+
+        if line.startswith("[") and line.endswith("]"):
+            section["visual_cues"].append({"text": line[1:-1].strip(), "start": section["start"], "end": section["end"]})
+            continue
+
+        if (line.startswith("(") and line.endswith(")")) or \
+                (line.startswith("*") and line.endswith("*") and not line.startswith("**")):
+            section["stage_directions"].append(line.strip("()*").strip())
+            continue
+
+        add_spoken(line)
+
+    # Drop the implicit leading section when nothing landed in it
+    if not any(sections[0][key] for key in ("spoken_lines", "stage_directions", "visual_cues")):
+        sections = sections[1:]
+
+    for entry in sections:
+        parsed["spoken_lines"].extend(entry["spoken_lines"])
+        parsed["stage_directions"].extend(entry["stage_directions"])
+        parsed["visual_cues"].extend(entry["visual_cues"])
+
+    parsed["sections"] = sections
+    parsed["spoken_text"] = " ".join(parsed["spoken_lines"])
+    return parsed
+
+def spoken_text_for_section(parsed: Dict[str, Any], label: str) -> str:
+    """Get the spoken text of the first section with the given label"""
+    for section in parsed["sections"]:
+        if (section["label"] or "").upper() == label.upper():
+            return " ".join(section["spoken_lines"])
+    return ""
+
+def story_summary(parsed: Dict[str, Any], max_chars: int = 200) -> str:
+    """Short description of the story for video prompts, cut at a word boundary"""
+    summary = parsed.get("topic") or parsed.get("spoken_text") or parsed.get("title") or ""
+    if len(summary) <= max_chars:
+        return summary
+    return summary[:max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "..."
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Text Segmentation for AI Cat News Network
+Sentence splitting shared by voice synthesis and duration estimation
+"""
+import re
+from typing import List
+
+# Sentence end: terminal punctuation plus any closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?\u2026])["\'\u201d\u2019)\]]*\s+')
+
+# Abbreviations that end in a period but do not end a sentence
+_ABBREVIATIONS = ("Mr.", "Mrs.", "Ms.", "Dr.", "St.", "vs.", "e.g.", "i.e.", "etc.", "U.S.")
+
+def split_sentences(text: str, min_chars: int = 12) -> List[str]:
+    """
+    Split text at sentence boundaries for chunked synthesis.
+
+    Fragments shorter than min_chars (e.g. "Meow.") are merged into the
+    preceding sentence so every chunk carries enough context for natural prosody.
+    """
+    text = " ".join(text.split())
+    if not text:
+        return []
+
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        candidate = text[start:match.start()].rstrip()
+        if candidate.endswith(_ABBREVIATIONS):
+            continue
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    if start < len(text):
+        sentences.append(text[start:].strip())
+
+    chunks = []
+    for sentence in sentences:
+        if chunks and len(sentence) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        elif chunks and len(chunks[-1]) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {sentence}"
+        else:
+            chunks.append(sentence)
+
+    return chunks
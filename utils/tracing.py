@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Pipeline Tracing for AI Cat News Network
+Nested timing spans around external calls, ContentManager I/O and pipeline
+stages, written to a rotating JSONL file, plus a per-stage latency report
+
+    with tracing.span("llm.generate", provider="groq") as s:
+        ...
+        s.set(total_tokens=150)
+
+    python -m utils.tracing report [--last N] [--path FILE]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.settings import get_setting
+
+_current: ContextVar[Optional["Span"]] = ContextVar("catnews_current_span", default=None)
+_INHERIT = object()
+
+_logger_lock = threading.Lock()
+_logger: Optional[logging.Logger] = None
+
+def _settings() -> Dict[str, Any]:
+    return get_setting('TRACING', {})
+
+def tracing_enabled() -> bool:
+    """TRACING["enabled"] (off by default), overridden by CATNEWS_TRACE=0/1"""
+    override = os.getenv("CATNEWS_TRACE")
+    if override is not None:
+        return override.strip().lower() not in ("0", "false", "no", "off", "")
+    return _settings().get('enabled', False)
+
+def trace_path() -> str:
+    return _settings().get('path', 'content/cache/traces/spans.jsonl')
+
+def _span_logger() -> logging.Logger:
+    """Logger writing one JSON span per line, rotated by size (thread-safe via logging's handler lock)"""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                settings = _settings()
+                path = trace_path()
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                handler = RotatingFileHandler(path, maxBytes=settings.get('max_bytes', 20 * 1024 * 1024),
+                                              backupCount=settings.get('backup_count', 5), encoding='utf-8')
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("catnews.tracing")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+class Span:
+    """One timed operation; the root span's ID is the trace ID of everything under it"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "attributes", "error", "_started", "_ended")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.start = time.time()
+        self.attributes = attributes
+        self.error = None
+        self._started = time.perf_counter()
+        self._ended = False
+
+    def set(self, **attributes) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+    def fail(self, error: Any) -> "Span":
+        """Mark the span as failed (for errors that are handled rather than raised)"""
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+        return self
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+            "thread": threading.current_thread().name
+        }
+        _span_logger().info(json.dumps(record, default=str, ensure_ascii=False))
+
+class _NoopSpan:
+    """Stand-in when tracing is off: accepts the same calls and records nothing"""
+
+    name = trace_id = span_id = parent_id = error = None
+
+    def set(self, **attributes) -> "_NoopSpan":
+        return self
+
+    def fail(self, error: Any) -> "_NoopSpan":
+        return self
+
+    def end(self):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+def start_span(name: str, parent: Any = _INHERIT, **attributes) -> Span:
+    """
+    Start a span without making it current; call end() when done.
+
+    For work that outlives a `with` block or spans threads (generators, pipeline
+    runs). parent defaults to the current span; pass None for a new trace.
+    """
+    if not tracing_enabled():
+        return NOOP_SPAN
+    if parent is _INHERIT:
+        parent = _current.get()
+    return Span(name, parent if isinstance(parent, Span) else None, attributes)
+
+@contextmanager
+def span(name: str, parent: Any = _INHERIT, **attributes) -> Iterator[Span]:
+    """Time a block as a child of the current span (or of parent); exceptions are recorded and re-raised"""
+    active = start_span(name, parent, **attributes)
+    if active is NOOP_SPAN:
+        yield active
+        return
+    token = _current.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.fail(e)
+        raise
+    finally:
+        _current.reset(token)
+        active.end()
+
+def traced(name: Optional[str] = None, **attributes) -> Callable:
+    """Decorator form of span(); the name defaults to the function's qualified name"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def annotate(**attributes):
+    """Add attributes to the current span, if any"""
+    active = _current.get()
+    if active is not None:
+        active.set(**attributes)
+
+def propagate(func: Callable) -> Callable:
+    """Bind func to the current span so work it runs on pool threads nests under it"""
+    parent = _current.get()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return wrapper
+
+# Report
+
+def load_spans(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """All spans in the trace file and its rotated backups, oldest first"""
+    path = path or trace_path()
+    files = [f"{path}.{i}" for i in range(_settings().get('backup_count', 5), 0, -1)] + [path]
+    spans = []
+    for filepath in files:
+        if not os.path.exists(filepath):
+            continue
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue    # A line cut off by a crash
+    return spans
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def span_stats(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Count, p50, p95, max and total duration (ms) and error count per span name"""
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for record in spans:
+        durations.setdefault(record["name"], []).append(record["duration_ms"])
+        if record.get("error"):
+            errors[record["name"]] = errors.get(record["name"], 0) + 1
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {"count": len(values), "p50_ms": _percentile(values, 0.5), "p95_ms": _percentile(values, 0.95),
+                       "max_ms": values[-1], "total_ms": sum(values), "errors": errors.get(name, 0)}
+    return stats
+
+def critical_path(root: Dict[str, Any], children: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    The chain of spans that bounded root's duration, in time order.
+
+    Working back from the end: the child that finished last is on the path,
+    then whichever sibling finished last before that child started, and so on;
+    each child on the path is expanded the same way.
+    """
+    path = []
+    cutoff = root["start"] + root["duration_ms"] / 1000
+    kids = children.get(root["span_id"], [])
+    while True:
+        # A little slack for clock rounding between a child's end and its parent's
+        candidates = [kid for kid in kids if kid["start"] + kid["duration_ms"] / 1000 <= cutoff + 0.001]
+        if not candidates:
+            break
+        last = max(candidates, key=lambda kid: kid["start"] + kid["duration_ms"] / 1000)
+        path[:0] = [last] + critical_path(last, children)
+        cutoff = last["start"]
+        kids = [kid for kid in candidates if kid is not last]
+    return path
+
+def print_report(spans: List[Dict[str, Any]], last: int = 5):
+    """Latency per span name, then the critical path of the last episodes (root spans)"""
+    stats = span_stats(spans)
+    width = max([len(name) for name in stats] + [10])
+    print(f"\n{'Span':<{width}} {'Count':>6} {'p50 ms':>10} {'p95 ms':>10} {'Max ms':>10} {'Total s':>9} {'Errors':>7}")
+    print("-" * (width + 58))
+    for name, stat in sorted(stats.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{name:<{width}} {stat['count']:>6} {stat['p50_ms']:>10.1f} {stat['p95_ms']:>10.1f} "
+              f"{stat['max_ms']:>10.1f} {stat['total_ms'] / 1000:>9.2f} {stat['errors']:>7}")
+
+    parents = {record["span_id"]: record.get("parent_id") for record in spans}
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    for record in spans:
+        if record.get("parent_id"):
+            children.setdefault(record["parent_id"], []).append(record)
+    roots = [record for record in spans if not record.get("parent_id") and children.get(record["span_id"])]
+    for root in sorted(roots, key=lambda record: record["start"])[-last:] if last else []:
+        label = root["attributes"].get("topic") or root["attributes"].get("idea") or root["trace_id"]
+        print(f"\n🧭 {root['name']} '{label}': {root['duration_ms'] / 1000:.2f}s"
+              + (f" ❌ {root['error']}" if root.get("error") else ""))
+        for record in critical_path(root, children):
+            depth = 0
+            parent_id = record["parent_id"]
+            while parent_id and parent_id != root["span_id"]:
+                depth += 1
+                parent_id = parents.get(parent_id)
+            share = record["duration_ms"] / root["duration_ms"] * 100 if root["duration_ms"] else 0
+            print(f"   {'  ' * depth}{record['name']:<{max(1, 36 - 2 * depth)}} {record['duration_ms']:>10.1f} ms "
+                  f"{share:>5.1f}%")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline trace report")
+    parser.add_argument("action", choices=["report"])
+    parser.add_argument("--path", help="Trace file (default TRACING path)")
+    parser.add_argument("--last", type=int, default=5, help="Episodes to show critical paths for")
+    parser.add_argument("--name", help="Only spans whose name starts with this")
+    args = parser.parse_args(argv)
+
+    spans = load_spans(args.path)
+    if not spans:
+        print(f"❌ No spans recorded in {args.path or trace_path()}")
+        return 1
+    print("🐱 AI Cat News Network - Trace Report")
+    print("=" * 50)
+    print(f"📈 {len(spans)} spans in {len({record['trace_id'] for record in spans})} traces")
+    if args.name:
+        spans = [record for record in spans if record["name"].startswith(args.name)]
+    print_report(spans, args.last)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
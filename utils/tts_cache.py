@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+TTS Cache for AI Cat News Network
+Content-addressed store of synthesized voice clips with byte-budget eviction
+"""
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+# Chunk size used when streaming cached clips back from disk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def normalize_tts_text(text: str) -> str:
+    """Normalize text so trivially different spellings share one cache entry"""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+def _settings_to_dict(voice_settings: Any) -> Dict[str, Any]:
+    """Convert an ElevenLabs VoiceSettings object (or plain dict) to a dict"""
+    if voice_settings is None:
+        return {}
+    if isinstance(voice_settings, dict):
+        return voice_settings
+    if hasattr(voice_settings, "model_dump"):
+        return voice_settings.model_dump(exclude_none=True)
+    if hasattr(voice_settings, "dict"):
+        return voice_settings.dict(exclude_none=True)
+    return dict(vars(voice_settings))
+
+def make_tts_key(text: str, voice_id: str, model_id: str, voice_settings: Any = None) -> str:
+    """Build the cache key for (normalized text, voice_id, model_id, VoiceSettings)"""
+    payload = json.dumps({
+        "text": normalize_tts_text(text),
+        "voice_id": voice_id,
+        "model_id": model_id,
+        "voice_settings": _settings_to_dict(voice_settings)
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class TTSCache:
+    """Disk cache of synthesized audio, keyed by text, voice and settings"""
+
+    def __init__(self, directory: str = "content/cache/tts", max_bytes: int = 200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Computed lazily on first write
+        os.makedirs(directory, exist_ok=True)
+
+    def _path_for(self, key: str) -> str:
+        """Get the on-disk path for a cache key (sharded by key prefix)"""
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def contains(self, key: str) -> bool:
+        """Check whether a clip is cached"""
+        return os.path.exists(self._path_for(key))
+
+    def stream(self, key: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        """Stream a cached clip from disk, or return None on a miss"""
+        path = self._path_for(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        # Touch on hit so eviction drops the least recently used clips first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        def _chunks():
+            with f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+
+        return _chunks()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a cached clip fully into memory, or return None on a miss"""
+        chunks = self.stream(key)
+        return b"".join(chunks) if chunks is not None else None
+
+    def put(self, key: str, audio_data: bytes):
+        """Store a clip in the cache"""
+        for _ in self.store_stream(key, [audio_data]):
+            pass
+
+    def store_stream(self, key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass chunks through to the caller while writing them to the cache.
+
+        The entry is committed only once the stream is fully consumed, so an
+        interrupted synthesis never leaves a truncated clip behind.
+        """
+        path = self._path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        size = 0
+
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self._record_write(size)
+
+    def _scan(self) -> list:
+        """List cached clips as (mtime, size, path)"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if not filename.endswith(".mp3"):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _record_write(self, size: int):
+        """Account for a new clip and evict old ones if over budget"""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(entry[1] for entry in self._scan())
+            else:
+                self._total_bytes += size
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used clips until the cache fits its byte budget"""
+        # Rescan so clips written by other processes are accounted for
+        entries = sorted(self._scan())
+        total = sum(entry[1] for entry in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                total -= size
+
+        self._total_bytes = total
+
+    def trim(self, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """Evict least recently used clips down to max_bytes (default: the cache budget)"""
+        with self._lock:
+            budget = self.max_bytes
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            try:
+                self._evict()
+            finally:
+                self.max_bytes = budget
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size information"""
+        entries = self._scan()
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "total_bytes": sum(entry[1] for entry in entries),
+            "max_bytes": self.max_bytes
+        }
+
+    def clear(self):
+        """Remove every cached clip"""
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._total_bytes = 0
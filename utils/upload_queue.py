@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Upload Queue for AI Cat News Network
+Per-platform queue of packaged videos waiting to be published, with the resumable
+session and confirmed byte offset of each upload, so uploads survive restarts
+"""
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    package_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    video_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    status TEXT NOT NULL,
+    session_url TEXT,
+    offset INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    remote_id TEXT,
+    created TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    completed TEXT,
+    owner_pid INTEGER,
+    UNIQUE (package_id, platform)
+);
+CREATE INDEX IF NOT EXISTS uploads_status ON uploads (platform, status, id);
+"""
+
+COLUMNS = ("id", "package_id", "platform", "video_path", "size", "metadata", "status", "session_url",
+           "offset", "attempts", "error", "remote_id", "created", "updated", "completed", "owner_pid")
+
+# An "uploading" row whose owner hasn't confirmed a chunk for this long is taken over even if
+# its PID is still alive (the PID may belong to an unrelated process by now)
+LEASE_SECONDS = 30 * 60
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; rely on the lease there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _row(row) -> Dict[str, Any]:
+    upload = dict(zip(COLUMNS, row))
+    upload["metadata"] = json.loads(upload["metadata"])
+    return upload
+
+class UploadQueue:
+    """
+    Upload state table.
+
+    Status moves queued -> uploading -> complete, or to failed once an upload
+    runs out of retries. The session URL and the byte offset the platform has
+    confirmed are committed after every chunk. Each "uploading" row records
+    the PID of the process uploading it, and every chunk refreshes its
+    updated time; uploads whose owner crashed (the PID is gone, or nothing
+    was confirmed within the lease) go back to queued on open and continue
+    from that offset. Uploads a running process owns are left alone.
+    """
+
+    def __init__(self, db_path: str = "content/cache/upload_queue.sqlite", lease_seconds: float = LEASE_SECONDS):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # Queues created before uploads had owners
+        if "owner_pid" not in {row[1] for row in self._conn.execute("PRAGMA table_info(uploads)")}:
+            self._conn.execute("ALTER TABLE uploads ADD COLUMN owner_pid INTEGER")
+        self._conn.commit()
+        self.reclaim_orphaned()
+
+    def reclaim_orphaned(self) -> int:
+        """Requeue uploads whose owning process is gone or whose lease ran out; returns how many"""
+        stale_before = (datetime.now() - timedelta(seconds=self.lease_seconds)).isoformat(timespec="seconds")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, owner_pid, updated FROM uploads WHERE status = 'uploading'"
+            ).fetchall()
+            orphaned = [upload_id for upload_id, owner_pid, updated in rows
+                        if owner_pid is None or updated < stale_before or not _process_alive(owner_pid)]
+            self._conn.executemany("UPDATE uploads SET status = 'queued', owner_pid = NULL WHERE id = ?",
+                                   [(upload_id,) for upload_id in orphaned])
+            self._conn.commit()
+        return len(orphaned)
+
+    def enqueue(self, package: Dict[str, Any], platforms: List[str]) -> List[int]:
+        """
+        Queue a content package's video for each platform (already queued pairs are left alone).
+
+        Titles, captions and hashtags come from the package's "publishing" entry when present.
+        """
+        video_path = package["video"]
+        size = os.path.getsize(video_path)
+        publishing = package.get("publishing") or {}
+        ids = []
+        with self._lock:
+            for platform in platforms:
+                metadata = publishing.get(platform) if isinstance(publishing.get(platform), dict) else {}
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO uploads (package_id, platform, video_path, size, metadata, status, "
+                    "created, updated) VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                    (package["package_id"], platform, video_path, size, json.dumps(metadata), _now(), _now())
+                )
+                row = self._conn.execute("SELECT id FROM uploads WHERE package_id = ? AND platform = ?",
+                                         (package["package_id"], platform)).fetchone()
+                ids.append(row[0])
+            self._conn.commit()
+        return ids
+
+    def get(self, upload_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM uploads WHERE id = ?",
+                                     (upload_id,)).fetchone()
+        return _row(row) if row else None
+
+    def queued(self, platform: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Queued uploads for a platform, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM uploads WHERE platform = ? AND status = 'queued' "
+                "ORDER BY id LIMIT ?", (platform, -1 if limit is None else limit)
+            ).fetchall()
+        return [_row(row) for row in rows]
+
+    def completed_since(self, platform: str, hours: float = 24) -> int:
+        """Uploads completed to a platform in the last hours (what counts against its quota)"""
+        since = (datetime.now() - timedelta(hours=hours)).isoformat(timespec="seconds")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM uploads WHERE platform = ? AND status = 'complete' AND completed >= ?",
+                (platform, since)
+            ).fetchone()
+        return row[0]
+
+    def _update(self, upload_id: int, **fields):
+        fields["updated"] = _now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE uploads SET {assignments} WHERE id = ?", (*fields.values(), upload_id))
+            self._conn.commit()
+
+    def start(self, upload_id: int) -> bool:
+        """Claim a queued upload for this process; False if another run already took it"""
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE uploads SET status = 'uploading', attempts = attempts + 1, error = NULL, owner_pid = ?, "
+                "updated = ? WHERE id = ? AND status = 'queued'", (os.getpid(), _now(), upload_id)
+            ).rowcount
+            self._conn.commit()
+        return bool(claimed)
+
+    def set_session(self, upload_id: int, session_url: Optional[str], offset: int = 0):
+        """Record a newly opened (or expired, with None) upload session"""
+        self._update(upload_id, session_url=session_url, offset=offset)
+
+    def set_offset(self, upload_id: int, offset: int):
+        """Record how many bytes the platform has confirmed"""
+        self._update(upload_id, offset=offset)
+
+    def complete(self, upload_id: int, remote_id: Optional[str]):
+        with self._lock:
+            self._conn.execute("UPDATE uploads SET status = 'complete', remote_id = ?, offset = size, "
+                               "completed = ?, updated = ? WHERE id = ?", (remote_id, _now(), _now(), upload_id))
+            self._conn.commit()
+
+    def fail(self, upload_id: int, error: str):
+        """Mark failed; the session and offset are kept so a retry resumes"""
+        self._update(upload_id, status="failed", error=error)
+
+    def requeue(self, upload_id: int):
+        self._update(upload_id, status="queued")
+
+    def retry_failed(self, platforms: Optional[List[str]] = None) -> int:
+        """Put failed uploads (optionally only those for the given platforms) back in the queue; returns how many"""
+        query = "UPDATE uploads SET status = 'queued', updated = ? WHERE status = 'failed'"
+        params = [_now()]
+        if platforms:
+            query += f" AND platform IN ({', '.join('?' for _ in platforms)})"
+            params.extend(platforms)
+        with self._lock:
+            count = self._conn.execute(query, params).rowcount
+            self._conn.commit()
+        return count
+
+    def uploads(self, status: Optional[str] = None, platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List uploads, optionally filtered by status and platform"""
+        query = f"SELECT {', '.join(COLUMNS)} FROM uploads WHERE 1 = 1"
+        params = []
+        for name, value in (("status", status), ("platform", platform)):
+            if value:
+                query += f" AND {name} = ?"
+                params.append(value)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [_row(row) for row in rows]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Upload counts by platform and status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT platform, status, COUNT(*) FROM uploads GROUP BY platform, status"
+            ).fetchall()
+        summary: Dict[str, Dict[str, int]] = {}
+        for platform, status, count in rows:
+            summary.setdefault(platform, {})[status] = count
+        return summary
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Warm Worker for AI Cat News Network
+Long-lived process that keeps provider clients, caches and heavy imports loaded and
+runs studio scripts on request over a localhost socket, plus the thin client for it.
+
+    python -m utils.worker serve                      # start the worker
+    python -m utils.worker run scripts/test_voice.py  # run a script through it
+    python -m utils.worker ping | stop
+
+The client only imports the standard library. When no worker is listening it
+runs the script in a fresh interpreter, so callers can always go through it.
+Every request carries the token the worker wrote to a file only its user can
+read, so other local users can't run scripts with this user's API keys.
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import runpy
+import socket
+import argparse
+import importlib
+import threading
+import secrets
+import socketserver
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, "scripts")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.getenv("CATNEWS_WORKER_PORT", "8765"))
+TOKEN_DIR = os.path.join(PROJECT_ROOT, "content", "cache")
+
+# Imported once at startup so script runs find them already loaded
+PRELOAD_MODULES = [
+    "config.settings",
+    "config.ai_provider",
+    "utils.content_manager",
+    "tools.voice_generator",
+    "tools.ai_video_generator",
+    "workflows.content_workflow",
+    "PIL.Image",
+    "google.generativeai",
+]
+
+def token_path(port: int) -> str:
+    return os.path.join(TOKEN_DIR, f"worker_{port}.token")
+
+def write_token(port: int) -> str:
+    """New random token for a worker, in a file readable by this user only (0600)"""
+    token = secrets.token_hex(32)
+    path = token_path(port)
+    os.makedirs(TOKEN_DIR, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        # O_CREAT's mode doesn't apply to a file left by an earlier worker
+        os.chmod(path, 0o600)
+        f.write(token)
+    return token
+
+def read_token(port: int) -> str:
+    try:
+        with open(token_path(port), 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def _send(wfile, message: Dict[str, Any]):
+    wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+    wfile.flush()
+
+class _SocketOutput:
+    """File-like stdout/stderr that forwards each write to the client"""
+
+    def __init__(self, wfile, stream: str):
+        self.wfile = wfile
+        self.stream = stream
+
+    def write(self, data: str) -> int:
+        if data:
+            _send(self.wfile, {"stream": self.stream, "data": data})
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+class _SocketInput:
+    """File-like stdin that asks the client for each line (so input() prompts still work)"""
+
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+
+    def readline(self, size: int = -1) -> str:
+        _send(self.wfile, {"event": "stdin"})
+        line = self.rfile.readline()
+        if not line:
+            return ""
+        return json.loads(line).get("stdin", "")
+
+    def read(self, size: int = -1) -> str:
+        return self.readline()
+
+    def isatty(self) -> bool:
+        return False
+
+def resolve_script(script: str) -> str:
+    """Map a script name or path to a file under scripts/ (nothing else can be run)"""
+    candidate = script if script.endswith(".py") else f"{script}.py"
+    if not os.path.isabs(candidate):
+        in_scripts = os.path.join(SCRIPTS_DIR, os.path.basename(candidate))
+        candidate = in_scripts if os.path.exists(in_scripts) else os.path.join(PROJECT_ROOT, candidate)
+    candidate = os.path.realpath(candidate)
+    if os.path.dirname(candidate) != os.path.realpath(SCRIPTS_DIR) or not os.path.isfile(candidate):
+        raise ValueError(f"Not a studio script: {script}")
+    return candidate
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, streamed JSON output lines back"""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            _send(self.wfile, {"exit_code": 2, "error": "invalid request"})
+            return
+        if not hmac.compare_digest(str(request.get("token", "")).encode("utf-8"), self.server.token.encode("utf-8")):
+            _send(self.wfile, {"exit_code": 2, "error": f"invalid worker token (see {token_path(self.server.port)})"})
+            return
+
+        command = request.get("command")
+        if command == "ping":
+            _send(self.wfile, {"status": "ok", "pid": os.getpid(), "runs": self.server.runs,
+                               "uptime_seconds": time.time() - self.server.started})
+        elif command == "stop":
+            _send(self.wfile, {"status": "stopping"})
+            # shutdown() waits for serve_forever to return, so it can't run on this thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command == "run":
+            self._run(request.get("script", ""), request.get("args", []))
+        else:
+            _send(self.wfile, {"exit_code": 2, "error": f"unknown command: {command}"})
+
+    def _run(self, script: str, args: List[str]):
+        try:
+            path = resolve_script(script)
+        except ValueError as e:
+            _send(self.wfile, {"exit_code": 2, "error": str(e)})
+            return
+
+        saved_argv, saved_path, saved_stdin = sys.argv, list(sys.path), sys.stdin
+        sys.argv = [path] + list(args)
+        sys.stdin = _SocketInput(self.rfile, self.wfile)
+        start = time.time()
+        exit_code = 0
+        try:
+            with redirect_stdout(_SocketOutput(self.wfile, "stdout")), \
+                    redirect_stderr(_SocketOutput(self.wfile, "stderr")):
+                try:
+                    runpy.run_path(path, run_name="__main__")
+                except SystemExit as e:
+                    exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except Exception as e:
+                    print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+                    exit_code = 1
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        finally:
+            # Scripts append to sys.path on every run; keep the worker's state clean
+            sys.argv, sys.path[:], sys.stdin = saved_argv, saved_path, saved_stdin
+            self.server.runs += 1
+
+        _send(self.wfile, {"exit_code": exit_code, "elapsed_seconds": time.time() - start})
+
+class WorkerServer(socketserver.TCPServer):
+    """
+    Single-threaded server: runs are serialized because scripts share the
+    process-wide stdout, argv and working directory.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, token: Optional[str] = None):
+        super().__init__((host, port), _WorkerHandler)
+        self.port = port
+        self.token = token or write_token(port)
+        self.started = time.time()
+        self.runs = 0
+
+def preload(modules: Optional[List[str]] = None) -> Dict[str, str]:
+    """Import heavy modules up front; a missing optional dependency is reported, not fatal"""
+    status = {}
+    for name in modules or PRELOAD_MODULES:
+        start = time.time()
+        try:
+            importlib.import_module(name)
+            status[name] = f"{(time.time() - start) * 1000:.0f} ms"
+        except Exception as e:
+            status[name] = f"skipped ({type(e).__name__}: {e})"
+    return status
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Run the worker until a stop command arrives"""
+    os.chdir(PROJECT_ROOT)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+    # Imported here so the client side of this module stays standard-library only
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    print("🐱 AI Cat News Network - Warm Worker")
+    print("=" * 50)
+    for name, status in preload().items():
+        print(f"   📦 {name}: {status}")
+
+    with WorkerServer(host, port) as server:
+        print(f"✅ Listening on {host}:{port} (pid {os.getpid()})")
+        try:
+            server.serve_forever(poll_interval=0.2)
+        finally:
+            # Only the worker that wrote the token removes it
+            if read_token(port) == server.token:
+                os.remove(token_path(port))
+    print("👋 Worker stopped")
+
+def _request(message: Dict[str, Any], host: str, port: int, timeout: float = 0.5) -> socket.socket:
+    sock = socket.create_connection((host, port), timeout=timeout)
+    sock.settimeout(None)
+    sock.sendall((json.dumps(dict(message, token=read_token(port))) + "\n").encode("utf-8"))
+    return sock
+
+def ping(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Optional[Dict[str, Any]]:
+    """Worker status, or None if no worker is listening (or it refused our token)"""
+    try:
+        with _request({"command": "ping"}, host, port) as sock:
+            status = json.loads(sock.makefile("rb").readline())
+    except (OSError, ValueError):
+        return None
+    return status if status.get("status") == "ok" else None
+
+def stop(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> bool:
+    try:
+        with _request({"command": "stop"}, host, port) as sock:
+            reply = json.loads(sock.makefile("rb").readline())
+    except (OSError, ValueError):
+        return False
+    return reply.get("status") == "stopping"
+
+def run_script(script: str, args: Optional[List[str]] = None, host: str = DEFAULT_HOST,
+               port: int = DEFAULT_PORT, fallback: bool = True) -> int:
+    """
+    Run a studio script on the worker, streaming its output; without a worker,
+    run it in a fresh interpreter instead (if fallback is set).
+    """
+    args = list(args or [])
+    try:
+        sock = _request({"command": "run", "script": script, "args": args}, host, port)
+    except OSError:
+        if not fallback:
+            print("❌ No catnews worker is running (start one with: python -m utils.worker serve)", file=sys.stderr)
+            return 3
+        try:
+            path = resolve_script(script)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 2
+        return subprocess.call([sys.executable, path] + args, cwd=PROJECT_ROOT)
+
+    with sock:
+        reader = sock.makefile("rb")
+        for line in reader:
+            message = json.loads(line)
+            if "stream" in message:
+                target = sys.stderr if message["stream"] == "stderr" else sys.stdout
+                target.write(message["data"])
+                target.flush()
+            elif message.get("event") == "stdin":
+                sock.sendall((json.dumps({"stdin": sys.stdin.readline()}) + "\n").encode("utf-8"))
+            elif "exit_code" in message:
+                if message.get("error"):
+                    print(f"❌ {message['error']}", file=sys.stderr)
+                return message["exit_code"]
+    return 1
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="catnews warm worker")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="Start the worker")
+    commands.add_parser("ping", help="Check whether a worker is running")
+    commands.add_parser("stop", help="Stop the running worker")
+    run_parser = commands.add_parser("run", help="Run a script through the worker")
+    run_parser.add_argument("script", help="Script under scripts/, e.g. quick_cat_test")
+    run_parser.add_argument("--no-fallback", action="store_true", help="Fail instead of running locally")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.host, args.port)
+        return 0
+    if args.command == "ping":
+        status = ping(args.host, args.port)
+        if status is None:
+            print("⚪ No worker running")
+            return 1
+        print(f"🟢 Worker pid {status['pid']}: {status['runs']} runs, up {status['uptime_seconds']:.0f}s")
+        return 0
+    if args.command == "stop":
+        return 0 if stop(args.host, args.port) else 1
+    return run_script(args.script, args.args, args.host, args.port, fallback=not args.no_fallback)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,85 +1,391 @@
-from crewai import Crew, Process
+import os
+import re
+import functools
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Any, Iterator, List, Optional
 from agents.content_agents import *
 from tasks.content_tasks import *
+from config.ai_provider import generate_content_ideas, write_script
+from config.settings import ELEVENLABS_MODEL_ID, ELEVENLABS_VOICE_ID
+from tools.ai_video_generator import download_video
+from tools.video_router import VideoRouter
+from tools.hashtag_engine import hashtag_engine
+from tools.publishing_package import publishing_package_generator
+from tools.voice_generator import voice_generator
+from utils import tracing
+from utils.checkpoint import BatchCheckpoint
+from utils.content_manager import content_manager as default_content_manager
+from utils.dedup_index import get_dedup_index, story_text
+from utils.script_parser import story_summary
+from workflows.crew_pool import CrewPool
+
+def _sequential_crew(agents: List[Any], tasks: List[Any]):
+    """Build a sequential crew (CrewAI is only imported once a crew is needed)"""
+    from crewai import Crew, Process
+    return Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=True
+    )
+
+def _run_now(stage: str, func: Callable[[], Any]) -> Any:
+    """Stage runner without a checkpoint"""
+    return func()
+
+def split_content_ideas(ideas: Any, topic: str, count: int) -> List[str]:
+    """
+    The numbered ideas in an ideas response, one string each (title, description, hook...).
+
+    Crew output and checkpointed crew output ({"raw": ...}) are read as their
+    text. Missing ideas are padded with generic ones, so there are always count.
+    """
+    text = ideas.get("raw", "") if isinstance(ideas, dict) else str(getattr(ideas, "raw", ideas) or "")
+    blocks = [block.strip() for block in re.split(r"(?m)^\s*\**\s*\d+[.)]\s+", text)[1:] if block.strip()]
+    return blocks[:count] + [f"Video {i+1} about {topic}" for i in range(len(blocks), count)]
+
+def _build_content_ideas_crew():
+    strategist = create_content_strategist()
+    return _sequential_crew([strategist], [create_content_idea_task(strategist)])
+
+def _build_video_from_idea_crew():
+    script_writer = create_script_writer()
+    visual_creator = create_visual_creator()
+    social_media_manager = create_social_media_manager()
+    return _sequential_crew(
+        [script_writer, visual_creator, social_media_manager],
+        [
+            # Task 1: Write script ({content_idea} is filled in at kickoff)
+            create_script_writing_task(script_writer, "{content_idea}"),
+            # Task 2: Create video (placeholder - would take script as input)
+            create_video_creation_task(visual_creator, "Generated script"),
+            # Task 3: Prepare publishing
+            create_publishing_task(social_media_manager, "Generated video")
+        ]
+    )
+
+def _build_quick_script_crew():
+    script_writer = create_script_writer()
+    return _sequential_crew([script_writer], [create_script_writing_task(script_writer, "{content_idea}")])
+
+# Shared warm crews, one set per task shape
+crew_pool = CrewPool()
+crew_pool.register("content_ideas", _build_content_ideas_crew)
+crew_pool.register("video_from_idea", _build_video_from_idea_crew)
+crew_pool.register("quick_script", _build_quick_script_crew)
 
 class ContentCreationWorkflow:
     """
     Complete workflow for content creation from idea to publication.
     """
     
-    def __init__(self):
-        self.content_strategist = create_content_strategist()
-        self.script_writer = create_script_writer()
-        self.visual_creator = create_visual_creator()
-        self.social_media_manager = create_social_media_manager()
+    def __init__(self, crews: Optional[CrewPool] = None):
+        self.crews = crews or crew_pool
+        # Where batch checkpoints live (the crews keep their own output)
+        self.content_manager = default_content_manager
     
     def generate_content_ideas(self, topic: str, count: int = 5):
         """Generate content ideas for a specific topic."""
-        task = create_content_idea_task(self.content_strategist)
-        
-        crew = Crew(
-            agents=[self.content_strategist],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
+        return self.crews.kickoff("content_ideas", {"topic": topic, "count": count})
+    
+    def content_ideas(self, topic: str, count: int) -> str:
+        """The ideas response as text; a provider error is raised so a checkpoint retries it"""
+        ideas = self.generate_content_ideas(topic, count)
+        text = str(getattr(ideas, "raw", ideas) or "")
+        if text.startswith("Error:"):
+            raise RuntimeError(text)
+        return text
+    
+    def create_video_from_idea(self, content_idea: str, news_item: Optional[Dict[str, Any]] = None,
+                               run_stage: Optional[Callable[[str, Callable[[], Any]], Any]] = None):
+        """
+        Complete video creation workflow from idea to video.
         
-        return crew.kickoff()
+        The crew runs as one "video" stage through run_stage(stage, func). The
+        crews keep their own output, so a news_item is only marked scripted
+        (by _process_topic), not linked to a script file.
+        """
+        run_stage = run_stage or _run_now
+        return run_stage("video", lambda: self.crews.kickoff("video_from_idea", {"content_idea": content_idea}))
     
-    def create_video_from_idea(self, content_idea: str):
-        """Complete video creation workflow from idea to video."""
-        # Task 1: Write script
-        script_task = create_script_writing_task(self.script_writer, content_idea)
+    def daily_content_batch(self, topics: Optional[list] = None, videos_per_topic: int = 1, max_workers: int = 1,
+                            on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            run_id: Optional[str] = None, news_items: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Create a batch of content for multiple topics.
+        
+        With max_workers > 1 topics run concurrently (see iter_content_batch);
+        the default stays sequential. Either way a failed topic raises, in the
+        concurrent case once the rest have finished. With a run_id every
+        (topic, idea, stage) unit is checkpointed: calling again with the same
+        run_id (topics may be omitted) skips completed units and resumes at the
+        missing ones.
         
-        # Task 2: Create video (placeholder - would take script as input)
-        video_task = create_video_creation_task(self.visual_creator, "Generated script")
+        news_items maps topics to the saved news items they came from (e.g.
+        ranked feed stories), which are marked scripted once scripted.
+        """
+        if max_workers > 1:
+            results, failed = [], []
+            for topic_result in self.iter_content_batch(topics, videos_per_topic, max_workers, on_progress, run_id,
+                                                        news_items):
+                results.extend(topic_result["results"])
+                if topic_result["status"] == "error":
+                    failed.append(topic_result)
+            if failed:
+                raise RuntimeError(f"{len(failed)} topics failed ({len(results)} videos created): " +
+                                   "; ".join(f"{result['topic']}: {result['error']}" for result in failed))
+            return results
         
-        # Task 3: Prepare publishing
-        publish_task = create_publishing_task(self.social_media_manager, "Generated video")
+        checkpoint, topics, videos_per_topic, news_items = self._open_checkpoint(
+            run_id, topics, videos_per_topic, news_items)
+        results = []
         
-        crew = Crew(
-            agents=[self.script_writer, self.visual_creator, self.social_media_manager],
-            tasks=[script_task, video_task, publish_task],
-            process=Process.sequential,
-            verbose=True
-        )
+        try:
+            for topic in topics:
+                print(f"Processing topic: {topic}")
+                results.extend(self._process_topic(topic, videos_per_topic, checkpoint, news_items.get(topic)))
+        finally:
+            if checkpoint:
+                checkpoint.close()
         
-        return crew.kickoff()
+        return results
     
-    def daily_content_batch(self, topics: list, videos_per_topic: int = 1):
-        """Create a batch of content for multiple topics."""
-        results = []
+    def iter_content_batch(self, topics: Optional[list] = None, videos_per_topic: int = 1, max_workers: int = 4,
+                           on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           run_id: Optional[str] = None,
+                           news_items: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process topics on a bounded pool of workers, yielding each topic's result as it finishes.
+        
+        Workers share the crew pool, where each crew is checked out by one
+        worker at a time. A failing topic is reported in its result and does
+        not stop the rest of the batch; with a run_id, rerunning resumes it.
         
-        for topic in topics:
-            print(f"Processing topic: {topic}")
+        Yields:
+            {"topic", "status" ("success" or "error"), "results", "error", "elapsed_seconds"}
+        """
+        report = on_progress or _print_batch_progress
+        checkpoint, topics, videos_per_topic, news_items = self._open_checkpoint(
+            run_id, topics, videos_per_topic, news_items)
+        total = len(topics)
+        
+        def process_topic(topic: str) -> Dict[str, Any]:
+            start = time.time()
+            report({"event": "started", "topic": topic, "total": total})
             
-            # Generate ideas
-            ideas = self.generate_content_ideas(topic, videos_per_topic)
+            try:
+                results = self._process_topic(topic, videos_per_topic, checkpoint, news_items.get(topic))
+                return {"topic": topic, "status": "success", "results": results,
+                        "error": None, "elapsed_seconds": time.time() - start}
+            except Exception as e:
+                return {"topic": topic, "status": "error", "results": [],
+                        "error": str(e), "elapsed_seconds": time.time() - start}
+        
+        completed = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total or 1))) as executor:
+                futures = [executor.submit(process_topic, topic) for topic in topics]
+                
+                for future in as_completed(futures):
+                    topic_result = future.result()
+                    completed += 1
+                    report({
+                        "event": "finished" if topic_result["status"] == "success" else "failed",
+                        "topic": topic_result["topic"],
+                        "completed": completed,
+                        "total": total,
+                        "elapsed_seconds": topic_result["elapsed_seconds"],
+                        "error": topic_result["error"]
+                    })
+                    yield topic_result
+        finally:
+            if checkpoint:
+                checkpoint.close()
+    
+    def _open_checkpoint(self, run_id: Optional[str], topics: Optional[list], videos_per_topic: int,
+                         news_items: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Open a run's checkpoint; a resumed run keeps the topics (and news items) it was started with"""
+        if run_id is None:
+            if topics is None:
+                raise ValueError("topics are required without a run_id")
+            return None, topics, videos_per_topic, news_items or {}
+        
+        checkpoint = BatchCheckpoint(run_id, os.path.join(self.content_manager.base_path, "cache",
+                                                          "batch_checkpoints.sqlite"))
+        params = checkpoint.get_run_params()
+        if params is None:
+            if topics is None:
+                checkpoint.close()
+                raise ValueError(f"Unknown batch run '{run_id}': topics are required to start it")
+            params = checkpoint.register_run({"topics": list(topics), "videos_per_topic": videos_per_topic,
+                                              "news_items": news_items or {}})
+        return checkpoint, params["topics"], params["videos_per_topic"], params.get("news_items", {})
+    
+    def _process_topic(self, topic: str, videos_per_topic: int, checkpoint: Optional[BatchCheckpoint] = None,
+                       news_item: Optional[Dict[str, Any]] = None) -> list:
+        """Ideas, then one video per idea; with a checkpoint, completed units (ideas and each stage) are skipped"""
+        def unit(idea: str, stage: str, func: Callable[[], Any]) -> Any:
+            with tracing.span(f"unit.{stage}", idea=idea or None):
+                return checkpoint.run_unit(topic, idea, stage, func) if checkpoint else func()
+        
+        with tracing.span("topic", topic=topic, videos=videos_per_topic):
+            # Generate ideas (a resumed run gets back the same ideas)
+            ideas = unit("", "ideas", lambda: self.content_ideas(topic, videos_per_topic))
             
             # For each idea, create a video
-            for i in range(videos_per_topic):
-                video_result = self.create_video_from_idea(f"Video {i+1} about {topic}")
-                results.append(video_result)
+            results = []
+            for idea in split_content_ideas(ideas, topic, videos_per_topic):
+                results.append(self.create_video_from_idea(idea, news_item, functools.partial(unit, idea)))
+                if news_item and len(results) == 1:
+                    # Once per story, as its own unit so a resumed run doesn't index it twice
+                    unit("", "scripted", lambda: self._mark_scripted(news_item, results[0]))
+            return results
+    
+    def _mark_scripted(self, news_item: Dict[str, Any], result: Any) -> str:
+        """Mark a feed item scripted and index it, so later batches don't pick it again"""
+        # Direct mode returns its package (with the script path); crews keep their own output
+        script_path = result.get("script") if isinstance(result, dict) else None
+        fields = {"script": os.path.basename(script_path)} if script_path else {}
+        self.content_manager.set_news_item_status(news_item["filepath"], "scripted", **fields)
         
-        return results
+        ref = script_path or news_item["filepath"]
+        summary = news_item.get("metadata", {}).get("summary", "")
+        get_dedup_index().add(story_text(news_item["topic"], summary), "script", ref)
+        return ref
+
+class DirectContentWorkflow(ContentCreationWorkflow):
+    """
+    Lean workflow that calls the AI provider, TTS layer and video generator directly.
+    
+    Script writing, voice, video and publishing are deterministic stages, so they
+    skip the agent rounds (and their extra LLM calls and logging). CrewAI is only
+    used for ideation, and only when agentic_ideas is set.
+    """
+    
+    def __init__(self, content_manager=None, video_generator=None, voice=None,
+                 render_video: bool = True, agentic_ideas: bool = False, video_duration: int = 10,
+                 crews: Optional[CrewPool] = None):
+        super().__init__(crews)
+        self.content_manager = content_manager or self.content_manager
+        self.video_generator = video_generator or VideoRouter()
+        self.voice = voice or voice_generator
+        self.render_video = render_video
+        self.agentic_ideas = agentic_ideas
+        self.video_duration = video_duration
+    
+    def generate_content_ideas(self, topic: str, count: int = 5):
+        """Generate content ideas (one LLM call unless agentic_ideas is set)."""
+        if self.agentic_ideas:
+            return super().generate_content_ideas(topic, count)
+        return generate_content_ideas(topic, count)
+    
+    def create_video_from_idea(self, content_idea: str, news_item: Optional[Dict[str, Any]] = None,
+                               run_stage: Optional[Callable[[str, Callable[[], Any]], Any]] = None) -> Dict[str, Any]:
+        """
+        Script → voice → video → publishing package, passing real artifacts between stages.
+        
+        Each stage runs through run_stage(stage, func) and returns what the later
+        stages need (the script and audio paths, the render and publishing
+        results), so in a checkpointed batch a resumed idea skips the Groq,
+        ElevenLabs and render calls it already paid for.
+        
+        A news_item the idea came from is linked to the script (batches then
+        mark it scripted and index it).
+        """
+        cm = self.content_manager
+        run_stage = run_stage or _run_now
+        
+        def script_stage() -> str:
+            with tracing.span("stage.script"):
+                script = write_script(content_idea)
+                if script.startswith("Error:"):
+                    raise RuntimeError(script)
+                news_item_id = os.path.splitext(os.path.basename(news_item["filepath"]))[0] if news_item else None
+                return cm.save_script(content=script, news_item_id=news_item_id, script_type="direct")
+        
+        def voice_stage() -> str:
+            with tracing.span("stage.voice"):
+                audio = self.voice.synthesize_sentences(parsed["spoken_text"])
+                return cm.save_audio(
+                    audio_data=audio,
+                    script_filepath=script_path,
+                    voice_settings={"voice_id": ELEVENLABS_VOICE_ID, "model_id": ELEVENLABS_MODEL_ID,
+                                    "mode": "sentence_parallel"},
+                    spoken_text=parsed["spoken_text"]
+                )
+        
+        def render_stage() -> Dict[str, Any]:
+            with tracing.span("stage.video"):
+                prompt = f"Vertical short-form video: {story_summary(parsed, max_chars=150)}"
+                cues = "; ".join(cue["text"] for cue in parsed["visual_cues"][:3])
+                if cues:
+                    prompt = f"{prompt}. Visual cues: {cues}"
+                video = self.video_generator.generate_video_from_prompt(prompt, duration=self.video_duration)
+                # Keep a local copy (what the upload queue sends); the provider's URL expires
+                video_url = video.get("video_url") or ""
+                if video.get("status") in ("success", "completed") and video_url.startswith(("http://", "https://")):
+                    try:
+                        video["video_filepath"] = cm.save_video(
+                            download_video(video_url),
+                            audio_path,
+                            video_settings={"provider": video.get("provider"), "prompt": prompt,
+                                            "duration": self.video_duration, "video_url": video_url}
+                        )
+                    except requests.RequestException as e:
+                        print(f"⚠️ Could not download the rendered video: {e}")
+                return video
+        
+        def publishing_stage() -> Dict[str, Any]:
+            # Every platform's title, caption and hashtags from a single JSON-mode call
+            with tracing.span("stage.publishing"):
+                return publishing_package_generator.generate(parsed)
+        
+        def package_stage() -> Dict[str, Any]:
+            with tracing.span("stage.package"):
+                package = cm.create_content_package(
+                    script_filepath=script_path,
+                    audio_filepath=audio_path,
+                    video_filepath=(video or {}).get("video_filepath"),
+                    extra={
+                        "idea": content_idea,
+                        "mode": "direct",
+                        "video_generation": video,
+                        "publishing": publishing
+                    }
+                )
+                for entry in publishing.values():
+                    hashtag_engine.record_post(entry["hashtags"])
+                return package
+        
+        with tracing.span("episode", idea=content_idea, mode="direct"):
+            script_path = run_stage("script", script_stage)
+            parsed = cm.load_parsed_script(script_path)
+            audio_path = run_stage("voice", voice_stage)
+            # "render", not "video": in crew mode "video" is the whole idea
+            video = run_stage("render", render_stage) if self.render_video else None
+            publishing = run_stage("publishing", publishing_stage)
+            return run_stage("package", package_stage)
+
+def _print_batch_progress(event: Dict[str, Any]):
+    """Default progress reporter for concurrent batches"""
+    if event["event"] == "started":
+        print(f"🚀 Processing topic: {event['topic']}")
+    elif event["event"] == "finished":
+        print(f"✅ [{event['completed']}/{event['total']}] {event['topic']} "
+              f"({event['elapsed_seconds']:.1f}s)")
+    else:
+        print(f"❌ [{event['completed']}/{event['total']}] {event['topic']} failed: {event['error']}")
 
 class QuickVideoWorkflow:
     """
     Simplified workflow for quick video creation.
     """
     
-    def __init__(self):
-        self.script_writer = create_script_writer()
+    def __init__(self, crews: Optional[CrewPool] = None):
+        self.crews = crews or crew_pool
     
     def quick_script(self, idea: str):
         """Quickly generate script for an idea."""
-        task = create_script_writing_task(self.script_writer, idea)
-        
-        crew = Crew(
-            agents=[self.script_writer],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        return crew.kickoff()
+        return self.crews.kickoff("quick_script", {"content_idea": idea})
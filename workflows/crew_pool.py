@@ -0,0 +1,85 @@
+"""
+Crew Pool for Cat News Network
+Keeps warm CrewAI crews per task shape so long-running workers don't rebuild
+agents, tasks and crews on every call
+"""
+
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from utils import tracing
+
+class CrewPool:
+    """
+    Reusable crews keyed by task shape.
+
+    A shape's factory builds a crew whose task descriptions are templates
+    ("{content_idea}"); each call fills them through kickoff(inputs=...).
+    A crew is checked out by one caller at a time, since CrewAI objects hold
+    per-run state and are not safe to share across threads.
+    """
+
+    def __init__(self, max_idle_per_shape: int = 4):
+        self.max_idle_per_shape = max_idle_per_shape
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._idle: Dict[str, queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def register(self, shape: str, factory: Callable[[], Any]):
+        """Register the factory that builds a crew for a task shape"""
+        with self._lock:
+            self._factories[shape] = factory
+            self._idle.setdefault(shape, queue.LifoQueue())
+            self._stats.setdefault(shape, {"built": 0, "reused": 0, "build_seconds": 0.0})
+
+    @contextmanager
+    def checkout(self, shape: str) -> Iterator[Any]:
+        """Borrow a crew for a shape, building one only if none is idle"""
+        if shape not in self._factories:
+            raise KeyError(f"Unknown crew shape: {shape}")
+
+        try:
+            crew = self._idle[shape].get_nowait()
+            with self._lock:
+                self._stats[shape]["reused"] += 1
+        except queue.Empty:
+            start = time.time()
+            crew = self._factories[shape]()
+            with self._lock:
+                self._stats[shape]["built"] += 1
+                self._stats[shape]["build_seconds"] += time.time() - start
+
+        try:
+            yield crew
+        finally:
+            # Crews beyond the idle limit are dropped rather than kept warm
+            if self._idle[shape].qsize() < self.max_idle_per_shape:
+                self._idle[shape].put(crew)
+
+    def kickoff(self, shape: str, inputs: Optional[Dict[str, Any]] = None) -> Any:
+        """Run a pooled crew for a shape with the given template inputs"""
+        with tracing.span("crew.kickoff", shape=shape):
+            with self.checkout(shape) as crew:
+                return crew.kickoff(inputs=inputs or {})
+
+    def warm(self, shape: str):
+        """Build a crew for a shape ahead of the first call"""
+        with self.checkout(shape):
+            pass
+
+    def clear(self):
+        """Drop all idle crews"""
+        for idle in self._idle.values():
+            while True:
+                try:
+                    idle.get_nowait()
+                except queue.Empty:
+                    break
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Crews built and reused per shape"""
+        with self._lock:
+            return {shape: dict(stats, idle=self._idle[shape].qsize()) for shape, stats in self._stats.items()}
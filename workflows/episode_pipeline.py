@@ -0,0 +1,218 @@
+"""
+Episode Pipeline for Cat News Network
+Wires news item → script → voice / publishing metadata → segment renders → package into one DAG,
+passing artifacts through ContentManager instead of "the latest file"
+"""
+
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from config.ai_provider import write_cat_news_script
+from config.settings import ELEVENLABS_MODEL_ID, ELEVENLABS_VOICE_ID, get_setting
+from tools.ai_video_generator import build_video_segments
+from tools.video_router import VideoRouter
+from tools.hashtag_engine import hashtag_engine
+from tools.publishing_package import PACKAGE_VERSION, publishing_package_generator
+from tools.voice_generator import voice_generator
+from utils.build_cache import BuildCache
+from utils.content_manager import content_manager as default_content_manager
+from utils.dedup_index import get_dedup_index, story_text
+from utils.script_parser import spoken_text_for_section, story_summary
+from workflows.pipeline import PipelineExecutor, PipelineRun, Stage
+
+class EpisodePipeline:
+    """Builds and runs the per-episode stage graph on a shared executor"""
+
+    def __init__(self, content_manager=None, executor: Optional[PipelineExecutor] = None,
+                 video_generator=None, voice=None, incremental: bool = True):
+        self.content_manager = content_manager or default_content_manager
+        self.video_generator = video_generator or VideoRouter()
+        self.voice = voice or voice_generator
+
+        if executor is None:
+            settings = get_setting('PIPELINE_SETTINGS', {})
+            executor = PipelineExecutor(
+                pools=settings.get('pools'),
+                queue_size=settings.get('queue_size', 8),
+                max_inflight_runs=settings.get('max_inflight_episodes', 4),
+                build_cache=BuildCache(self.content_manager) if incremental else None
+            )
+        self.executor = executor
+
+    def build_stages(self, topic: str, source: str = "real_news",
+                     news_item: Optional[Dict[str, Any]] = None) -> List[Stage]:
+        """Build the stage graph for one episode (on an already saved news item, when given)"""
+        cm = self.content_manager
+        summary = news_item.get("metadata", {}).get("summary", "") if news_item else ""
+
+        provider = type(self.video_generator).__name__
+
+        def news_stage(inputs: Dict[str, Any]) -> str:
+            if news_item:
+                return news_item["filepath"]
+            return cm.save_news_item(topic=topic, source=source, metadata={"script_type": "cat_news"})
+
+        def news_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            # Topics without a saved news item keep the key they were cached under
+            if news_item:
+                return {"topic": topic, "source": source, "news_item": news_item["filepath"]}
+            return {"topic": topic, "source": source}
+
+        def script_stage(inputs: Dict[str, Any]) -> str:
+            news_item_id = os.path.splitext(os.path.basename(inputs["news"]))[0]
+            script = write_cat_news_script(topic)
+            if script.startswith("Error:"):
+                raise RuntimeError(script)
+            script_path = cm.save_script(
+                content=f"Topic: {topic}\n\n{script}",
+                news_item_id=news_item_id,
+                script_type="cat_news_real"
+            )
+            # Scripted stories leave the pending queue and count as covered for later batches
+            cm.set_news_item_status(inputs["news"], "scripted", script=os.path.basename(script_path))
+            get_dedup_index().add(story_text(topic, summary), "script", script_path)
+            return script_path
+
+        def script_cacheable(script_path: str) -> bool:
+            # Only a real script is remembered; anything else is rewritten on the next run
+            with open(script_path, 'r', encoding='utf-8') as f:
+                return not f.read().split("\n\n", 1)[-1].startswith("Error:")
+
+        def voice_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            # The spoken text, not the script file, so edits to stage directions don't re-voice
+            return {
+                "spoken_text": cm.load_parsed_script(inputs["script"])["spoken_text"],
+                "voice_id": ELEVENLABS_VOICE_ID,
+                "model_id": ELEVENLABS_MODEL_ID,
+                "mode": "sentence_parallel"
+            }
+
+        def voice_stage(inputs: Dict[str, Any]) -> str:
+            script_path = inputs["script"]
+            spoken_text = cm.load_parsed_script(script_path)["spoken_text"]
+            audio = self.voice.synthesize_sentences(spoken_text)
+            return cm.save_audio(
+                audio_data=audio,
+                script_filepath=script_path,
+                voice_settings={"voice_id": ELEVENLABS_VOICE_ID, "model_id": ELEVENLABS_MODEL_ID,
+                                "mode": "sentence_parallel"},
+                spoken_text=spoken_text
+            )
+
+        def segment_prompt(segment: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+            prompt = segment['prompt']
+            if "script" not in inputs:
+                return prompt
+            parsed = cm.load_parsed_script(inputs["script"])
+            if segment.get('section'):
+                # Segments tied to one script section only change when that section does
+                line = spoken_text_for_section(parsed, segment['section'])
+                return f'{prompt}. The anchor says: "{line}"' if line else prompt
+            # Story segments pick up the script's own visual cues
+            cues = "; ".join(cue["text"] for cue in parsed["visual_cues"][:3])
+            prompt = f"{prompt}. Story: {story_summary(parsed, max_chars=150)}"
+            if cues:
+                prompt = f"{prompt}. Visual cues: {cues}"
+            return prompt
+
+        def make_render_stage(segment: Dict[str, Any]):
+            def render_stage(inputs: Dict[str, Any]) -> Dict[str, Any]:
+                prompt = segment_prompt(segment, inputs)
+                result = self.video_generator.generate_video_from_prompt(prompt, duration=segment['duration'])
+                return {
+                    "key": segment['key'],
+                    "description": segment['description'],
+                    "prompt": prompt,
+                    "duration": segment['duration'],
+                    "result": result
+                }
+            return render_stage
+
+        def make_render_inputs(segment: Dict[str, Any]):
+            def render_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+                return {
+                    "prompt": segment_prompt(segment, inputs),
+                    "duration": segment['duration'],
+                    "provider": provider
+                }
+            return render_inputs
+
+        stages = [
+            Stage("news", news_stage, pool="io", declare_inputs=news_inputs),
+            Stage("script", script_stage, depends_on=["news"], pool="llm",
+                  declare_inputs=lambda inputs: {"topic": topic, "news": inputs["news"]},
+                  cacheable=script_cacheable),
+            Stage("voice", voice_stage, depends_on=["script"], pool="tts", declare_inputs=voice_inputs)
+        ]
+
+        segment_stage_names = []
+        for segment in build_video_segments(topic):
+            name = f"segment:{segment['key']}"
+            # Evergreen segments need nothing; story segments render while the voice is synthesized
+            depends_on = [] if segment['evergreen'] else ["script"]
+            stages.append(Stage(
+                name, make_render_stage(segment), depends_on=depends_on, pool="render",
+                declare_inputs=make_render_inputs(segment),
+                # Failed renders are retried on the next run rather than remembered
+                cacheable=lambda result: result["result"].get("status") in ("success", "completed")
+            ))
+            segment_stage_names.append(name)
+
+        def publishing_stage(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return publishing_package_generator.generate(cm.load_parsed_script(inputs["script"]))
+
+        def publishing_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "script_hash": cm.load_parsed_script(inputs["script"])["source_hash"],
+                "platforms": get_setting('PLATFORM_SETTINGS', {}),
+                "version": PACKAGE_VERSION
+            }
+
+        stages.append(Stage(
+            "publishing", publishing_stage, depends_on=["script"], pool="llm", declare_inputs=publishing_inputs,
+            # A package filled in locally after a failed call is retried on the next run
+            cacheable=lambda result: any(entry["source"] != "local" for entry in result.values())
+        ))
+
+        def package_stage(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            segments = [inputs[name] for name in segment_stage_names]
+            package = cm.create_content_package(
+                script_filepath=inputs["script"],
+                audio_filepath=inputs["voice"],
+                extra={
+                    "topic": topic,
+                    "segments": segments,
+                    "segments_status": "complete" if all(
+                        seg["result"].get("status") in ("success", "completed") for seg in segments) else "partial",
+                    "publishing": inputs["publishing"]
+                }
+            )
+            for entry in inputs["publishing"].values():
+                hashtag_engine.record_post(entry["hashtags"])
+            return package
+
+        stages.append(Stage(
+            "package", package_stage, depends_on=["script", "voice", "publishing"] + segment_stage_names, pool="io",
+            declare_inputs=lambda inputs: {"topic": topic, "inputs": inputs}
+        ))
+        return stages
+
+    def run_episode(self, topic: str, source: str = "real_news", force: bool = False,
+                    news_item: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run one episode and return its run summary (force rebuilds every stage)"""
+        run = self.executor.run(self.build_stages(topic, source, news_item), run_id=topic, context={"topic": topic},
+                                force=force)
+        return run.summary()
+
+    def run_batch(self, topics: Iterable[str], source: str = "real_news", force: bool = False,
+                  news_items: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run many episodes with overlapping stages, yielding each summary as it finishes.
+        
+        news_items maps topics to saved news items (e.g. ranked feed stories) to build on
+        instead of saving a new one.
+        """
+        news_items = news_items or {}
+        runs = (PipelineRun(self.build_stages(topic, source, news_items.get(topic)), run_id=topic, context={"topic": topic}, force=force)
+                for topic in topics)
+        for run in self.executor.run_many(runs):
+            yield run.summary()
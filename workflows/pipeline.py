@@ -0,0 +1,301 @@
+"""
+Pipeline Engine for Cat News Network
+In-process DAG executor: stages start as soon as their inputs are ready,
+run on bounded per-resource worker pools, and many episodes overlap.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from utils import tracing
+from utils.build_cache import MISS, fingerprint
+
+class Stage:
+    """One unit of work in a pipeline run"""
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any],
+                 depends_on: Iterable[str] = (), pool: str = "default",
+                 declare_inputs: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 version: str = "1", cacheable: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            name: Unique stage name within a run
+            func: Called with {dependency_name: dependency_result}; returns the stage result
+            depends_on: Names of stages whose results this stage needs
+            pool: Worker pool (resource) the stage runs on, e.g. "llm", "tts", "render"
+            declare_inputs: Called with the same inputs as func; returns everything the
+                result depends on. Stages that declare inputs are memoized by the
+                executor's build cache and skipped while the fingerprint is unchanged
+            version: Bump when func changes in a way the declared inputs don't capture
+            cacheable: Optional check on the result; results failing it are not memoized
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+        self.pool = pool
+        self.declare_inputs = declare_inputs
+        self.version = version
+        self.cacheable = cacheable
+
+class PipelineRun:
+    """State of one DAG instance (e.g. one episode)"""
+
+    def __init__(self, stages: List[Stage], run_id: str, context: Optional[Dict[str, Any]] = None,
+                 force: bool = False):
+        self.run_id = run_id
+        self.context = context or {}
+        self.force = force
+        self.stages = {stage.name: stage for stage in stages}
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, str] = {}
+        self.skipped: List[str] = []
+        self.reused: List[str] = []
+        self.fingerprints: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # Trace root for the run's stage spans (set while the executor runs it)
+        self.span = None
+
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+        self._waiting = {stage.name: set(stage.depends_on) for stage in stages}
+        self._dependents = {name: [] for name in self.stages}
+        for stage in stages:
+            for dep in stage.depends_on:
+                self._dependents[dep].append(stage.name)
+        self._outstanding = len(stages)
+
+        # A cycle would never become ready, so the run would wait on it forever
+        remaining = {name: len(deps) for name, deps in self._waiting.items()}
+        ordered = [name for name, count in remaining.items() if not count]
+        for name in ordered:
+            for dependent in set(self._dependents[name]):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ordered.append(dependent)
+        if len(ordered) < len(remaining):
+            cyclic = sorted(set(remaining) - set(ordered))
+            raise ValueError(f"Stages depend on each other in a cycle: {cyclic}")
+
+    @property
+    def status(self) -> str:
+        if self.finished is None:
+            return "running"
+        return "failed" if self.errors else "success"
+
+    @property
+    def elapsed_seconds(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def _initial_ready(self) -> List[Stage]:
+        ready = [name for name, deps in self._waiting.items() if not deps]
+        for name in ready:
+            del self._waiting[name]
+        return [self.stages[name] for name in ready]
+
+    def _complete(self, name: str, result: Any = None, error: Optional[str] = None) -> List[Stage]:
+        """Record a finished stage and return stages that became ready"""
+        self._outstanding -= 1
+        ready = []
+
+        if error is not None:
+            self.errors[name] = error
+            self._skip_dependents(name)
+        else:
+            self.results[name] = result
+            for dependent in self._dependents[name]:
+                waiting = self._waiting.get(dependent)
+                if waiting is None:
+                    continue
+                waiting.discard(name)
+                if not waiting:
+                    del self._waiting[dependent]
+                    ready.append(self.stages[dependent])
+
+        if self._outstanding == 0:
+            self.finished = time.time()
+        return ready
+
+    def _skip_dependents(self, name: str):
+        """Skip everything downstream of a failed stage"""
+        for dependent in self._dependents[name]:
+            if self._waiting.pop(dependent, None) is not None:
+                self.skipped.append(dependent)
+                self._outstanding -= 1
+                self._skip_dependents(dependent)
+
+    def critical_path(self) -> List[str]:
+        """Longest chain of dependent stages by finish time (what bounded the episode's latency)"""
+        if not self.timings:
+            return []
+        path = []
+        current = max(self.timings, key=lambda name: self.timings[name]["end"])
+        while current:
+            path.append(current)
+            deps = [dep for dep in self.stages[current].depends_on if dep in self.timings]
+            current = max(deps, key=lambda name: self.timings[name]["end"]) if deps else None
+        return list(reversed(path))
+
+    def summary(self) -> Dict[str, Any]:
+        """Serializable summary of the run"""
+        return {
+            "run_id": self.run_id,
+            "status": self.status,
+            "elapsed_seconds": self.elapsed_seconds,
+            "results": self.results,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "reused": self.reused,
+            "fingerprints": self.fingerprints,
+            "timings": self.timings,
+            "critical_path": self.critical_path()
+        }
+
+class PipelineExecutor:
+    """Runs pipeline DAGs on bounded worker pools, overlapping independent stages and runs"""
+
+    def __init__(self, pools: Optional[Dict[str, int]] = None, queue_size: int = 8, max_inflight_runs: int = 4,
+                 build_cache=None):
+        """
+        Args:
+            pools: Worker count per pool name (unknown pools get one worker)
+            queue_size: Capacity of each pool's task queue
+            max_inflight_runs: Runs admitted at once; the run source is only pulled
+                when one finishes, which backpressures upstream stages like ingestion
+            build_cache: Optional BuildCache; stages that declare inputs reuse their
+                stored output while the fingerprint of those inputs is unchanged
+        """
+        self.pool_sizes = dict(pools or {"default": 4})
+        self.queue_size = queue_size
+        self.max_inflight_runs = max_inflight_runs
+        self.build_cache = build_cache
+
+    def run(self, stages: List[Stage], run_id: str = "run", context: Optional[Dict[str, Any]] = None,
+            force: bool = False) -> PipelineRun:
+        """Run a single DAG to completion (force reruns memoized stages)"""
+        return next(self.run_many([PipelineRun(stages, run_id, context, force=force)]))
+
+    def _execute(self, run: PipelineRun, stage: Stage, inputs: Dict[str, Any]) -> Any:
+        """Run a stage, or reuse its memoized output when its fingerprint is unchanged"""
+        if self.build_cache is None or stage.declare_inputs is None:
+            return stage.func(inputs)
+
+        stage_fingerprint = fingerprint(stage.name, stage.declare_inputs(inputs), stage.version)
+        run.fingerprints[stage.name] = stage_fingerprint
+
+        if not run.force:
+            cached = self.build_cache.lookup(stage.name, stage_fingerprint)
+            if cached is not MISS:
+                run.reused.append(stage.name)
+                return cached
+
+        result = stage.func(inputs)
+        if stage.cacheable is None or stage.cacheable(result):
+            self.build_cache.record(stage.name, stage_fingerprint, result)
+        return result
+
+    def run_many(self, runs: Iterable[PipelineRun]) -> Iterator[PipelineRun]:
+        """Run many DAGs with overlap, yielding each run as it finishes"""
+        events = queue.Queue()
+        pool_queues: Dict[str, queue.Queue] = {}
+        workers: List[threading.Thread] = []
+        ready: Dict[str, deque] = {}
+
+        def worker(task_queue: queue.Queue):
+            while True:
+                item = task_queue.get()
+                if item is None:
+                    return
+                run, stage = item
+                inputs = {dep: run.results[dep] for dep in stage.depends_on}
+                start = time.time()
+                try:
+                    with tracing.span(f"stage.{stage.name}", parent=run.span, pool=stage.pool) as span:
+                        result, error = self._execute(run, stage, inputs), None
+                        span.set(reused=stage.name in run.reused)
+                except Exception as e:
+                    result, error = None, f"{type(e).__name__}: {e}"
+                events.put((run, stage, result, error, start, time.time()))
+
+        def pool_for(name: str) -> queue.Queue:
+            if name not in pool_queues:
+                pool_queues[name] = queue.Queue(maxsize=self.queue_size)
+                ready[name] = deque()
+                for _ in range(self.pool_sizes.get(name, 1)):
+                    thread = threading.Thread(target=worker, args=(pool_queues[name],), daemon=True)
+                    thread.start()
+                    workers.append(thread)
+            return pool_queues[name]
+
+        def enqueue(run: PipelineRun, stages: List[Stage]):
+            for stage in stages:
+                pool_for(stage.pool)
+                ready[stage.pool].append((run, stage))
+
+        def dispatch():
+            for name, pending in ready.items():
+                task_queue = pool_queues[name]
+                while pending:
+                    try:
+                        task_queue.put_nowait(pending[0])
+                    except queue.Full:
+                        break
+                    pending.popleft()
+
+        source = iter(runs)
+        exhausted = False
+        inflight = 0
+
+        try:
+            while True:
+                while not exhausted and inflight < self.max_inflight_runs:
+                    try:
+                        run = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    run.started = time.time()
+                    run.span = tracing.start_span("pipeline.run", parent=None, run_id=run.run_id,
+                                                  topic=run.context.get("topic"), stages=len(run.stages))
+                    inflight += 1
+                    if not run.stages:
+                        run.finished = run.started
+                        run.span.end()
+                        inflight -= 1
+                        yield run
+                        continue
+                    enqueue(run, run._initial_ready())
+
+                if exhausted and inflight == 0:
+                    return
+
+                dispatch()
+                run, stage, result, error, start, end = events.get()
+                run.timings[stage.name] = {"start": start, "end": end, "duration": end - start}
+                enqueue(run, run._complete(stage.name, result, error))
+
+                if run.finished is not None:
+                    run.span.set(status=run.status, reused=len(run.reused), skipped=len(run.skipped))
+                    if run.errors:
+                        run.span.fail("; ".join(f"{name}: {error}" for name, error in run.errors.items()))
+                    run.span.end()
+                    inflight -= 1
+                    yield run
+        finally:
+            # Drop queued work (if the consumer stopped early) and release the workers
+            for name, task_queue in pool_queues.items():
+                while True:
+                    try:
+                        task_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                for _ in range(self.pool_sizes.get(name, 1)):
+                    task_queue.put(None)